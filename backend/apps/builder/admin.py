@@ -2,12 +2,35 @@ from django.contrib import admin
 from .models import Title, Tag, Trait, TraitOverride, Faction, HeroTemplate, CardTemplate, CardTrait, AIPlayer, Builder
 
 
+class TitleContentAdminMixin:
+    """Bump the owning title's content version when builder content is edited."""
+
+    def get_content_title(self, obj):
+        return obj.title
+
+    def save_related(self, request, form, formsets, change):
+        # Runs after the object, its m2m fields and inlines are saved.
+        super().save_related(request, form, formsets, change)
+        self.get_content_title(form.instance).bump_content_version()
+
+    def delete_model(self, request, obj):
+        title = self.get_content_title(obj)
+        super().delete_model(request, obj)
+        title.bump_content_version()
+
+    def delete_queryset(self, request, queryset):
+        titles = {self.get_content_title(obj) for obj in queryset}
+        super().delete_queryset(request, queryset)
+        for title in titles:
+            title.bump_content_version()
+
+
 @admin.register(Title)
-class TitleAdmin(admin.ModelAdmin):
+class TitleAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('slug', 'name', 'version', 'is_latest', 'status', 'author', 'published_at', 'created_at')
     list_filter = ('status', 'is_latest', 'created_at', 'published_at')
     search_fields = ('slug', 'name', 'description')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('content_version', 'ruleset_id', 'created_at', 'updated_at')
     ordering = ('-created_at',)
     raw_id_fields = ('author',)
 
@@ -16,7 +39,7 @@ class TitleAdmin(admin.ModelAdmin):
             'fields': ('slug', 'name', 'description', 'author')
         }),
         ('Version Control', {
-            'fields': ('version', 'is_latest')
+            'fields': ('version', 'is_latest', 'content_version', 'ruleset_id')
         }),
         ('Publishing', {
             'fields': ('status', 'published_at')
@@ -31,9 +54,12 @@ class TitleAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_content_title(self, obj):
+        return obj
+
 
 @admin.register(HeroTemplate)
-class HeroTemplateAdmin(admin.ModelAdmin):
+class HeroTemplateAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('__str__', 'name', 'health', 'version', 'is_latest', 'created_at')
     list_filter = ('is_latest', 'title__status', 'created_at')
     search_fields = ('slug', 'name', 'description', 'title__slug', 'title__name')
@@ -62,7 +88,7 @@ class HeroTemplateAdmin(admin.ModelAdmin):
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'slug', 'title', 'created_at')
     list_filter = ('title', 'created_at')
     search_fields = ('name', 'slug', 'description', 'title__name')
@@ -123,7 +149,7 @@ class TraitOverrideAdmin(admin.ModelAdmin):
 
 
 @admin.register(Faction)
-class FactionAdmin(admin.ModelAdmin):
+class FactionAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'slug', 'title', 'created_at')
     list_filter = ('title', 'created_at')
     search_fields = ('name', 'slug', 'description', 'title__name')
@@ -149,7 +175,7 @@ class CardTraitInline(admin.TabularInline):
 
 
 @admin.register(CardTrait)
-class CardTraitAdmin(admin.ModelAdmin):
+class CardTraitAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('card', 'trait_slug', 'get_data_summary', 'created_at')
     list_filter = ('trait_slug', 'created_at', 'card__title')
     search_fields = ('card__name', 'card__slug', 'trait_slug')
@@ -170,6 +196,9 @@ class CardTraitAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_content_title(self, obj):
+        return obj.card.title
+
     def get_data_summary(self, obj):
         """Show a summary of the trait data in list view"""
         if not obj.data:
@@ -182,7 +211,7 @@ class CardTraitAdmin(admin.ModelAdmin):
 
 
 @admin.register(CardTemplate)
-class CardTemplateAdmin(admin.ModelAdmin):
+class CardTemplateAdmin(TitleContentAdminMixin, admin.ModelAdmin):
     list_display = ('__str__', 'name', 'card_type', 'cost', 'attack', 'health', 'faction', 'version', 'is_latest', 'created_at')
     list_filter = ('card_type', 'is_latest', 'cost', 'faction', 'title__status', 'created_at')
     search_fields = ('slug', 'name', 'description', 'title__slug', 'title__name')
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.builder.models import Title
+from apps.gameplay.agents.ruleset import (
+    compute_ruleset_id,
+    refresh_title_ruleset_id,
+    ruleset_code_fingerprint,
+)
+
+
+class Command(BaseCommand):
+    help = "Compare stored title ruleset ids with freshly computed ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--title", help="Only check this title slug.")
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Store the recomputed ruleset id for titles that drifted.",
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.filter(is_latest=True).order_by("slug")
+        if options.get("title"):
+            titles = titles.filter(slug=options["title"])
+            if not titles.exists():
+                raise CommandError(f"Title '{options['title']}' not found.")
+
+        fingerprint = ruleset_code_fingerprint()
+        drifted = []
+        for title in titles:
+            expected = compute_ruleset_id(title)
+            if (
+                title.ruleset_id == expected
+                and title.ruleset_fingerprint == fingerprint
+            ):
+                continue
+            drifted.append(title)
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{title.slug}: stored {title.ruleset_id or '-'} "
+                    f"!= computed {expected}"
+                )
+            )
+            if options["fix"]:
+                refresh_title_ruleset_id(title)
+
+        if drifted and not options["fix"]:
+            raise CommandError(
+                f"{len(drifted)} title(s) have a stale ruleset id; rerun with --fix."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {titles.count()} titles; "
+                f"{len(drifted)} {'fixed' if options['fix'] else 'drifted'}."
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("builder", "0014_alter_cardtrait_trait_slug_alter_traitoverride_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="content_version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
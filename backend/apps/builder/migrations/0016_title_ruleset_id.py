@@ -0,0 +1,23 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("builder", "0015_title_content_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="title",
+            name="ruleset_fingerprint",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="title",
+            name="ruleset_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
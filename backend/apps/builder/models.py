@@ -30,6 +30,14 @@ class Title(TimestampedModel):
 
     config = models.JSONField(default=dict)
 
+    # Revision counter for builder content (cards, heroes, traits, config).
+    # Content-derived caches key on it, so bumping it invalidates them.
+    content_version = models.PositiveIntegerField(default=1)
+    # Stored compute_ruleset_id() digest, refreshed with content_version.
+    # The fingerprint identifies the engine/trait code it was computed under.
+    ruleset_id = models.CharField(max_length=64, blank=True, default="")
+    ruleset_fingerprint = models.CharField(max_length=64, blank=True, default="")
+
     class Meta:
         constraints = [
             # One row per (slug, version)
@@ -72,6 +80,22 @@ class Title(TimestampedModel):
         # Author and builders can view unpublished titles
         return self.can_be_edited_by(user)
 
+    def bump_content_version(self):
+        """
+        Record a builder content change: bump the version content-versioned
+        caches key on and refresh the stored ruleset id.
+        """
+        updated = Title.objects.filter(pk=self.pk).update(
+            content_version=models.F("content_version") + 1
+        )
+        if not updated:
+            return
+        self.refresh_from_db(fields=["content_version"])
+
+        from apps.gameplay.agents.ruleset import refresh_title_ruleset_id
+
+        refresh_title_ruleset_id(self)
+
     @property
     def art_url(self, extension: str = "webp") -> str:
         if settings.USE_R2_FOR_CARDS and settings.CARD_ASSETS_BASE_URL:
@@ -104,6 +104,8 @@ class TitleService:
             result = self.ingest(resource)
             if result:
                 ingested.append(result)
+        if ingested:
+            self.title.bump_content_version()
         return ingested
 
     def ingest(self, resource: Resource) -> IngestedResource | None:
@@ -242,6 +244,8 @@ class TitleService:
         self._delete_unreferenced_tag_resources(resource_slugs["tag"], removed)
         self._delete_unreferenced_faction_resources(resource_slugs["faction"], removed)
 
+        if removed:
+            self.title.bump_content_version()
         return removed
 
     # Handlers
@@ -5,7 +5,8 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from apps.collection.models import Deck, DeckCard
+from apps.collection.models import Deck, DeckCard, DeckRevision
+from apps.collection.validation import validate_deck_for_play
 
 from .models import (
     AIPlayer,
@@ -378,6 +379,55 @@ class TestTitleAPIPermissions(APITestCase):
         deck.refresh_from_db()
         self.assertIsNotNone(deck.archived_at)
 
+    def test_ai_deck_edits_refresh_the_memoized_play_validation(self):
+        hero = HeroTemplate.objects.create(
+            title=self.draft_title,
+            slug="warrior",
+            name="Warrior",
+            health=30,
+            hero_power={"name": "Strike", "cost": 2, "actions": []},
+        )
+        strike = CardTemplate.objects.create(
+            title=self.draft_title,
+            slug="strike",
+            name="Strike",
+            card_type=CardTemplate.CARD_TYPE_SPELL,
+            cost=1,
+        )
+
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(
+            reverse("title-ai-decks", kwargs={"title_slug": self.draft_title.slug}),
+            {
+                "name": "Practice Bot",
+                "hero_id": hero.id,
+                "cards": [{"card_id": strike.id, "count": 2}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        deck = Deck.objects.get(id=response.data["id"])
+        self.assertEqual(deck.current_revision.composition.total_cards, 2)
+        # A verdict memoized before the edit, e.g. against content since fixed.
+        DeckRevision.objects.filter(pk=deck.current_revision_id).update(
+            validated_content_version=self.draft_title.content_version,
+            validation_error="contains an invalid card",
+        )
+
+        response = self.client.patch(
+            reverse(
+                "title-ai-deck-detail",
+                kwargs={"title_slug": self.draft_title.slug, "deck_id": deck.id},
+            ),
+            {"cards": [{"card_id": strike.id, "count": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        deck = Deck.objects.get(id=deck.id)
+        self.assertEqual(deck.current_revision.composition.total_cards, 1)
+        self.assertIsNone(validate_deck_for_play(deck))
+
     def test_author_can_manage_ordered_ai_deck_draw_setup(self):
         self.draft_title.config = {
             "deck_size_limit": 10,
@@ -730,6 +780,8 @@ class TestCardYamlValidation(APITestCase):
         self.assertEqual(card.description, "Safe description.")
         self.assertEqual(card.cost, 2)
         self.assertFalse(card.cardtrait_set.exists())
+        self.title.refresh_from_db()
+        self.assertEqual(self.title.content_version, 1)
 
     def test_create_card_rejects_bulk_list_yaml_with_clear_error(self):
         url = reverse("card-create", kwargs={"title_slug": self.title.slug})
@@ -772,6 +824,8 @@ class TestCardYamlValidation(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
         card = CardTemplate.objects.get(title=self.title, slug="silence")
+        self.title.refresh_from_db()
+        self.assertEqual(self.title.content_version, 2)
         self.assertEqual(
             card.cardtrait_set.get().data,
             {"actions": [{"action": "silence", "target": "enemy", "scope": "single"}]},
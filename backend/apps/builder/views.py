@@ -9,6 +9,7 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
+from apps.collection.compositions import ensure_deck_revision
 from apps.collection.models import Deck, DeckCard
 from apps.collection.validation import get_title_config, validate_card_for_deck
 
@@ -371,6 +372,7 @@ def _replace_ai_deck_cards(deck, card_counts):
         seen_card_ids.add(card.id)
 
     DeckCard.objects.filter(deck=deck).exclude(card_id__in=seen_card_ids).delete()
+    deck.refresh_from_db(fields=["card_count"])
 
 
 def _assert_ai_deck_name_available(ai_player, name: str, deck_id=None) -> None:
@@ -485,6 +487,7 @@ def create_card(request, title_slug):
             # Create new card using YAML data and specified slug
             serializer = CardTemplateSerializer()
             new_card = serializer.create_from_yaml(title, yaml_data, slug=slug)
+            title.bump_content_version()
 
             response_serializer = CardTemplateSerializer(new_card)
             return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -532,6 +535,7 @@ def card_detail(request, title_slug, card_slug):
                     # Update the existing card in place
                     serializer = CardTemplateSerializer()
                     updated_card = serializer.update_from_yaml(card, yaml_data)
+                title.bump_content_version()
 
                 serializer = CardTemplateSerializer(updated_card)
                 return Response(serializer.data)
@@ -544,6 +548,7 @@ def card_detail(request, title_slug, card_slug):
                 # Soft delete by setting is_latest=False
                 card.is_latest = False
                 card.save(update_fields=["is_latest"])
+                title.bump_content_version()
 
                 return Response(
                     {"message": f'Card "{card.name}" has been deleted'},
@@ -823,6 +828,7 @@ def title_config(request, title_slug):
 
     title.config = updated_config.model_dump(exclude={"type"}, exclude_none=True)
     title.save(update_fields=["config"])
+    title.bump_content_version()
 
     return Response(
         {
@@ -921,6 +927,7 @@ def title_ai_decks(request, title_slug):
             deck.script = script
             deck.save()
             _replace_ai_deck_cards(deck, card_counts)
+            ensure_deck_revision(deck, source="create")
 
             return Response(_serialize_ai_deck(deck), status=status.HTTP_201_CREATED)
     except Exception as exc:
@@ -950,6 +957,11 @@ def title_ai_deck_detail(request, title_slug, deck_id):
 
     try:
         with transaction.atomic():
+            # Lock like player deck edits, so ensure_deck_revision cannot cache
+            # the card-count digest of the deck while its cards are replaced.
+            deck = (
+                _ai_deck_queryset(title).select_for_update(of=("self",)).get(id=deck.id)
+            )
             if "name" in request.data:
                 deck.name = (request.data.get("name") or "").strip()
                 if not deck.name:
@@ -993,6 +1005,8 @@ def title_ai_deck_detail(request, title_slug, deck_id):
                 or "draw_mode" in request.data
             ):
                 _replace_ai_deck_cards(deck, card_counts)
+            # Play validation is memoized on the current revision.
+            ensure_deck_revision(deck, source="edit")
 
             return Response(_serialize_ai_deck(deck), status=status.HTTP_200_OK)
     except Exception as exc:
@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import hashlib
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache, partial
 from typing import Iterable, Mapping
 from urllib.parse import quote
 
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Max
 from django.utils import timezone
@@ -19,6 +21,8 @@ COMPOSITION_CODE_VERSION = 1
 COMPOSITION_CODE_PREFIX = f"dt{COMPOSITION_CODE_VERSION}"
 COMPOSITION_DIGEST_NAMESPACE = f"drawtwo:deck-composition:v{COMPOSITION_CODE_VERSION}"
 MAX_COMPOSITION_TOTAL_CARDS = 2_147_483_647
+RESOLVED_CODE_CACHE_SIZE = 1024
+DECK_CARD_COUNTS_CACHE_TIMEOUT = 60 * 60 * 24
 CARD_SLUG_RE = re.compile(r"[-a-zA-Z0-9_]+\Z")
 COUNT_RE = re.compile(r"[1-9][0-9]*\Z")
 
@@ -126,7 +130,11 @@ def parse_composition_code(code: str) -> dict[str, int]:
 
 
 def composition_digest(title: Title, code: str) -> str:
-    material = f"{COMPOSITION_DIGEST_NAMESPACE}\0{title.slug}\0{code}"
+    return _title_slug_digest(title.slug, code)
+
+
+def _title_slug_digest(title_slug: str, code: str) -> str:
+    material = f"{COMPOSITION_DIGEST_NAMESPACE}\0{title_slug}\0{code}"
     return hashlib.sha256(material.encode("utf-8")).hexdigest()
 
 
@@ -141,21 +149,54 @@ def _cards_for_title(
 ) -> tuple[CardTemplate, ...]:
     """Resolve stable slugs, preferring latest but retaining retired cards."""
 
-    if not card_counts:
-        return ()
+    return _resolve_code(
+        title.id,
+        title.slug,
+        title.content_version,
+        encode_composition_code(card_counts),
+    ).cards
 
-    candidates = CardTemplate.objects.filter(
-        title=title, slug__in=card_counts
-    ).order_by("slug", "-is_latest", "-version", "-id")
-    cards_by_slug: dict[str, CardTemplate] = {}
-    for card in candidates:
-        cards_by_slug.setdefault(card.slug, card)
 
-    missing = sorted(set(card_counts) - set(cards_by_slug))
-    if missing:
-        label = ", ".join(missing)
-        raise CompositionCodeError(f"Unknown card slug(s) for {title.slug}: {label}")
-    return tuple(cards_by_slug[slug] for slug in sorted(card_counts))
+@lru_cache(maxsize=RESOLVED_CODE_CACHE_SIZE)
+def _resolve_code(
+    title_id: int, title_slug: str, content_version: int, code: str
+) -> ResolvedComposition:
+    """
+    Resolve a code's cards and identity, without its stored composition.
+
+    Card lookups only change when title content does, so results are kept in
+    an in-process LRU keyed by the title content version. Callers receive
+    copies of the mutable fields; the cached card instances are shared and
+    must be treated as read-only.
+    """
+
+    card_counts = parse_composition_code(code)
+    cards: tuple[CardTemplate, ...] = ()
+    if card_counts:
+        candidates = CardTemplate.objects.filter(
+            title_id=title_id, slug__in=card_counts
+        ).order_by("slug", "-is_latest", "-version", "-id")
+        cards_by_slug: dict[str, CardTemplate] = {}
+        for card in candidates:
+            cards_by_slug.setdefault(card.slug, card)
+
+        missing = sorted(set(card_counts) - set(cards_by_slug))
+        if missing:
+            label = ", ".join(missing)
+            raise CompositionCodeError(
+                f"Unknown card slug(s) for {title_slug}: {label}"
+            )
+        cards = tuple(cards_by_slug[slug] for slug in sorted(card_counts))
+
+    return ResolvedComposition(
+        composition=None,
+        code=code,
+        digest=_title_slug_digest(title_slug, code),
+        manifest=_manifest_for(card_counts),
+        total_cards=sum(card_counts.values()),
+        card_counts=card_counts,
+        cards=cards,
+    )
 
 
 def resolve_composition_code(
@@ -166,11 +207,9 @@ def resolve_composition_code(
 ) -> ResolvedComposition:
     """Resolve a portable code without writing unless explicitly requested."""
 
-    card_counts = parse_composition_code(code)
-    cards = _cards_for_title(title, card_counts)
-    digest = composition_digest(title, code)
-    manifest = _manifest_for(card_counts)
-    total_cards = sum(card_counts.values())
+    resolved = _resolve_code(title.id, title.slug, title.content_version, code)
+    card_counts = dict(resolved.card_counts)
+    manifest = [dict(entry) for entry in resolved.manifest]
 
     if create:
         composition, _ = get_or_create_composition(title, card_counts)
@@ -178,19 +217,18 @@ def resolve_composition_code(
         composition = DeckComposition.objects.filter(
             title=title,
             version=COMPOSITION_CODE_VERSION,
-            digest=digest,
+            digest=resolved.digest,
         ).first()
         if composition is not None:
-            _assert_composition_matches(composition, code, manifest, total_cards)
+            _assert_composition_matches(
+                composition, code, manifest, resolved.total_cards
+            )
 
-    return ResolvedComposition(
+    return replace(
+        resolved,
         composition=composition,
-        code=code,
-        digest=digest,
         manifest=manifest,
-        total_cards=total_cards,
         card_counts=card_counts,
-        cards=cards,
     )
 
 
@@ -219,11 +257,13 @@ def get_or_create_composition(
     canonical = canonicalize_card_counts(card_counts)
     # Validate that portable compositions cannot silently contain foreign or
     # misspelled slugs. Current DeckCard rows already satisfy this in practice.
-    _cards_for_title(title, canonical)
-    code = encode_composition_code(canonical)
-    digest = composition_digest(title, code)
-    manifest = _manifest_for(canonical)
-    total_cards = sum(canonical.values())
+    resolved = _resolve_code(
+        title.id, title.slug, title.content_version, encode_composition_code(canonical)
+    )
+    code = resolved.code
+    digest = resolved.digest
+    manifest = [dict(entry) for entry in resolved.manifest]
+    total_cards = resolved.total_cards
 
     composition, created = DeckComposition.objects.get_or_create(
         title=title,
@@ -245,6 +285,54 @@ def _deck_card_counts(deck: Deck) -> dict[str, int]:
     )
 
 
+def deck_card_counts_cache_key(deck_id: int) -> str:
+    return f"deck_card_counts_digest:{deck_id}"
+
+
+def forget_deck_card_counts(deck_id: int) -> None:
+    """
+    Drop the cached card-count digest after a deck's cards change.
+
+    It is dropped again once the change commits: until then, a concurrent
+    ``ensure_deck_revision`` reads the pre-edit cards and could cache their
+    digest. Card edits hold the deck's row lock, so one that read the old
+    cards has cached their digest before the second drop.
+    """
+
+    cache_key = deck_card_counts_cache_key(deck_id)
+    cache.delete(cache_key)
+    transaction.on_commit(partial(cache.delete, cache_key))
+
+
+def cached_deck_revision(deck: Deck) -> DeckRevision | None:
+    """
+    Return the deck's current revision without locking the deck, if provable.
+
+    The revision is only returned when the deck's cached card-count digest
+    matches its composition and the hero still matches; otherwise ``None``,
+    and the caller falls back to ``ensure_deck_revision``.
+    """
+
+    if deck.current_revision_id is None:
+        return None
+    digest = cache.get(deck_card_counts_cache_key(deck.pk))
+    if digest is None:
+        return None
+    revision = (
+        DeckRevision.objects.select_related("composition")
+        .filter(pk=deck.current_revision_id)
+        .first()
+    )
+    if (
+        revision is None
+        or revision.composition.digest != digest
+        or revision.hero_slug != deck.hero.slug
+    ):
+        return None
+    deck.current_revision = revision
+    return revision
+
+
 @transaction.atomic
 def ensure_deck_revision(
     deck: Deck,
@@ -264,10 +352,25 @@ def ensure_deck_revision(
         .filter(pk=locked_deck.current_revision_id)
         .first()
     )
+
+    # The digest of the deck's card counts is cached from the last time its
+    # cards were read and dropped whenever a DeckCard row changes, so an
+    # unedited deck is matched against its revision without re-reading them.
+    cache_key = deck_card_counts_cache_key(locked_deck.pk)
+    if (
+        current is not None
+        and current.hero_slug == locked_deck.hero.slug
+        and cache.get(cache_key) == current.composition.digest
+    ):
+        deck.current_revision = current
+        deck.current_revision_id = current.id
+        return current, False
+
     composition, _ = get_or_create_composition(
         locked_deck.title,
         _deck_card_counts(locked_deck),
     )
+    cache.set(cache_key, composition.digest, DECK_CARD_COUNTS_CACHE_TIMEOUT)
     if (
         current is not None
         and current.composition_id == composition.id
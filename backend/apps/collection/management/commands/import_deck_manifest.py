@@ -76,6 +76,8 @@ class Command(BaseCommand):
                     for card, quantity in assignments
                 ]
             )
+            Deck.objects.filter(pk=deck.pk).recount_cards()
+            deck.refresh_from_db(fields=["card_count"])
             ensure_deck_revision(deck, source="import")
 
             validation_error = validate_deck_for_play(deck)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.collection.provisioning import (
+    StarterDeckProvisioningError,
+    load_starter_deck_definitions,
+)
+from apps.collection.tasks import bulk_provision_starter_decks
+
+
+class Command(BaseCommand):
+    help = "Provision starter decks for every eligible user in bulk batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--title",
+            help="Only provision the starter deck configured for this title slug.",
+        )
+        parser.add_argument("--batch-size", type=int, default=250)
+
+    def handle(self, *args, **options):
+        title_slug = options["title"]
+        if title_slug and title_slug not in {
+            definition.title_slug for definition in load_starter_deck_definitions()
+        }:
+            raise CommandError(f'No starter deck is configured for "{title_slug}".')
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        try:
+            provisioned = bulk_provision_starter_decks.run(
+                title_slug=title_slug,
+                batch_size=options["batch_size"],
+            )
+        except StarterDeckProvisioningError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Provisioned {provisioned} starter deck(s).")
+        )
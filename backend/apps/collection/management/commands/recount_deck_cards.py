@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from apps.collection.models import Deck
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored card count of decks whose count has drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--title", help="Only check decks of this title slug.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted decks without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        decks = Deck.objects.all()
+        if options["title"]:
+            decks = decks.filter(title__slug=options["title"])
+
+        drifted = list(
+            decks.annotate(actual_count=Coalesce(Sum("deckcard__count"), Value(0)))
+            .exclude(card_count=F("actual_count"))
+            .values_list("id", "card_count", "actual_count")
+        )
+        for deck_id, stored, actual in drifted:
+            self.stdout.write(f"Deck {deck_id}: stored {stored}, actual {actual}")
+
+        if options["dry_run"]:
+            self.stdout.write(f"{len(drifted)} deck(s) would be updated.")
+            return
+
+        Deck.objects.filter(
+            pk__in=[deck_id for deck_id, _, _ in drifted]
+        ).recount_cards()
+        self.stdout.write(self.style.SUCCESS(f"Updated {len(drifted)} deck(s)."))
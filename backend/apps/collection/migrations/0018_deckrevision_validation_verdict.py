@@ -0,0 +1,23 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collection", "0017_starterdeckprovisioning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deckrevision",
+            name="validated_content_version",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="deckrevision",
+            name="validation_error",
+            field=models.TextField(blank=True, default=""),
+        ),
+    ]
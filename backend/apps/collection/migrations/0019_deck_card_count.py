@@ -0,0 +1,39 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:42
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_card_counts(apps, schema_editor):
+    Deck = apps.get_model("collection", "Deck")
+    DeckCard = apps.get_model("collection", "DeckCard")
+    totals = (
+        DeckCard.objects.filter(deck=OuterRef("pk"))
+        .values("deck")
+        .annotate(total=Sum("count"))
+        .values("total")
+    )
+    Deck.objects.update(card_count=Coalesce(Subquery(totals), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collection", "0018_deckrevision_validation_verdict"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="deck",
+            name="card_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Total number of cards in the deck, counting duplicates.",
+            ),
+        ),
+        migrations.RunPython(
+            populate_card_counts,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
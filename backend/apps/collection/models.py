@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from apps.builder.models import AIPlayer, CardTemplate, HeroTemplate, Title
@@ -48,6 +49,18 @@ class DeckQuerySet(models.QuerySet):
     def archived(self):
         return self.filter(archived_at__isnull=False)
 
+    def recount_cards(self):
+        """Recompute the stored ``card_count`` of every deck in the queryset."""
+        totals = (
+            DeckCard.objects.filter(deck=models.OuterRef("pk"))
+            .values("deck")
+            .annotate(total=models.Sum("count"))
+            .values("total")
+        )
+        return self.update(
+            card_count=Coalesce(models.Subquery(totals), models.Value(0))
+        )
+
 
 class Deck(TimestampedModel):
     # Either user-owned or AI-owned (exactly one must be set)
@@ -70,6 +83,10 @@ class Deck(TimestampedModel):
         help_text="Whether this AI deck appears in normal PvE opponent selection.",
     )
     archived_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    card_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Total number of cards in the deck, counting duplicates.",
+    )
     current_revision = models.ForeignKey(
         "DeckRevision",
         on_delete=models.SET_NULL,
@@ -141,7 +158,7 @@ class Deck(TimestampedModel):
         """
         Returns the total number of cards in the deck, counting duplicates.
         """
-        return self.deckcard_set.aggregate(total=models.Sum("count"))["total"] or 0
+        return self.card_count
 
     def __str__(self):
         return f"{self.owner_name} → {self.name}"
@@ -349,6 +366,10 @@ class DeckRevision(TimestampedModel):
         choices=SOURCE_CHOICES,
         default=SOURCE_EDIT,
     )
+    # Memoized play-validation verdict; valid only while the title's content
+    # version still matches ``validated_content_version``.
+    validated_content_version = models.PositiveIntegerField(null=True, blank=True)
+    validation_error = models.TextField(blank=True, default="")
 
     class Meta:
         constraints = [
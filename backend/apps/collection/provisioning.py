@@ -14,15 +14,18 @@ from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
-from apps.builder.models import HeroTemplate, Title
+from apps.builder.models import CardTemplate, HeroTemplate, Title
 from apps.collection.compositions import (
     ensure_deck_revision,
+    get_or_create_composition,
     parse_composition_code,
     resolve_composition_code,
 )
 from apps.collection.models import (
     Deck,
     DeckCard,
+    DeckComposition,
+    DeckRevision,
     StarterDeckProgram,
     StarterDeckProvisioning,
     UserTitleDeckPreference,
@@ -47,6 +50,18 @@ class StarterDeckDefinition:
     composition_code: str
 
 
+@dataclass(frozen=True)
+class ResolvedStarterDeck:
+    """A starter-deck definition resolved against its title's current content."""
+
+    definition: StarterDeckDefinition
+    title: Title
+    hero: HeroTemplate
+    composition: DeckComposition
+    card_counts: dict[str, int]
+    cards_by_slug: dict[str, CardTemplate]
+
+
 def _required_string(value, *, field: str, path: Path) -> str:
     if not isinstance(value, str) or not value.strip():
         raise StarterDeckProvisioningError(
@@ -122,6 +137,58 @@ def load_starter_deck_definitions() -> tuple[StarterDeckDefinition, ...]:
     return definitions
 
 
+def resolve_starter_deck(
+    definition: StarterDeckDefinition,
+) -> ResolvedStarterDeck | None:
+    """
+    Resolve a definition's title, hero and shared composition.
+
+    Returns ``None`` while the title has no published latest version.
+    """
+
+    title = Title.objects.filter(
+        slug=definition.title_slug,
+        is_latest=True,
+        status=Title.STATUS_PUBLISHED,
+    ).first()
+    if title is None:
+        return None
+
+    try:
+        hero = HeroTemplate.objects.get(
+            title=title,
+            slug=definition.hero_slug,
+            is_latest=True,
+        )
+        composition = resolve_composition_code(
+            title,
+            definition.composition_code,
+        )
+    except (HeroTemplate.DoesNotExist, ValueError) as exc:
+        raise StarterDeckProvisioningError(
+            f'Cannot resolve starter deck for title "{title.slug}": {exc}'
+        ) from exc
+
+    retired_slugs = sorted(
+        card.slug for card in composition.cards if not card.is_latest
+    )
+    if retired_slugs:
+        raise StarterDeckProvisioningError(
+            f'Starter deck for title "{title.slug}" references retired card(s): '
+            f'{", ".join(retired_slugs)}'
+        )
+
+    deck_composition, _ = get_or_create_composition(title, composition.card_counts)
+    return ResolvedStarterDeck(
+        definition=definition,
+        title=title,
+        hero=hero,
+        composition=deck_composition,
+        card_counts=composition.card_counts,
+        cards_by_slug={card.slug: card for card in composition.cards},
+    )
+
+
 @transaction.atomic
 def provision_starter_deck_for_user(
     user,
@@ -157,59 +224,32 @@ def provision_starter_deck_for_user(
         )
         return None, False
 
-    title = Title.objects.filter(
-        slug=definition.title_slug,
-        is_latest=True,
-        status=Title.STATUS_PUBLISHED,
-    ).first()
-    if title is None:
+    resolved = resolve_starter_deck(definition)
+    if resolved is None:
         return None, False
+    title = resolved.title
 
     if Deck.objects.active().filter(user=user, name=definition.name).exists():
         raise StarterDeckProvisioningError(
             f'User {user.pk} already has an active deck named "{definition.name}"'
         )
 
-    try:
-        hero = HeroTemplate.objects.get(
-            title=title,
-            slug=definition.hero_slug,
-            is_latest=True,
-        )
-        composition = resolve_composition_code(
-            title,
-            definition.composition_code,
-        )
-    except (HeroTemplate.DoesNotExist, ValueError) as exc:
-        raise StarterDeckProvisioningError(
-            f'Cannot resolve starter deck for title "{title.slug}": {exc}'
-        ) from exc
-
-    retired_slugs = sorted(
-        card.slug for card in composition.cards if not card.is_latest
-    )
-    if retired_slugs:
-        raise StarterDeckProvisioningError(
-            f'Starter deck for title "{title.slug}" references retired card(s): '
-            f'{", ".join(retired_slugs)}'
-        )
-
     deck = Deck.objects.create(
         user=user,
         title=title,
         name=definition.name,
         description=definition.description,
-        hero=hero,
+        hero=resolved.hero,
+        card_count=sum(resolved.card_counts.values()),
     )
-    cards_by_slug = {card.slug: card for card in composition.cards}
     DeckCard.objects.bulk_create(
         [
             DeckCard(
                 deck=deck,
-                card=cards_by_slug[slug],
+                card=resolved.cards_by_slug[slug],
                 count=count,
             )
-            for slug, count in composition.card_counts.items()
+            for slug, count in resolved.card_counts.items()
         ]
     )
     ensure_deck_revision(deck, source="create")
@@ -249,6 +289,164 @@ def provision_starter_deck_for_user(
     return deck, True
 
 
+@transaction.atomic
+def provision_starter_decks_bulk(
+    resolved: ResolvedStarterDeck,
+    provisionings,
+) -> list[Deck]:
+    """
+    Create starter decks for a batch of pending grants of one definition.
+
+    Users and grants are locked in primary-key order, the same order as the
+    one-user path, and everything is written with ``bulk_create``. Every deck
+    shares the resolved ``DeckComposition`` and gets revision 1 directly. The
+    first deck is validated and its verdict is copied to the other revisions,
+    since all of them hold the same cards. An invalid deck rolls back the
+    whole batch.
+    """
+
+    definition = resolved.definition
+    title = resolved.title
+    user_model = get_user_model()
+    provisioning_ids = [provisioning.pk for provisioning in provisionings]
+    user_ids = sorted({provisioning.user_id for provisioning in provisionings})
+    users = {
+        user.pk: user
+        for user in user_model.objects.select_for_update()
+        .filter(pk__in=user_ids)
+        .only("pk", "deleted_at")
+        .order_by("pk")
+    }
+    locked = list(
+        StarterDeckProvisioning.objects.select_for_update()
+        .filter(
+            pk__in=provisioning_ids,
+            title_slug=definition.title_slug,
+            completed_at__isnull=True,
+        )
+        .order_by("pk")
+    )
+
+    now = timezone.now()
+    name_taken = set(
+        Deck.objects.active()
+        .filter(user_id__in=user_ids, name=definition.name)
+        .values_list("user_id", flat=True)
+    )
+    pending = []
+    finished = []
+    for provisioning in locked:
+        provisioning.last_attempted_at = now
+        provisioning.last_dispatched_at = None
+        provisioning.updated_at = now
+        user = users.get(provisioning.user_id)
+        if user is None or user.deleted_at is not None:
+            provisioning.completed_at = now
+            provisioning.last_error = "Account deleted before provisioning"
+        elif provisioning.user_id in name_taken:
+            provisioning.last_error = (
+                f"User {provisioning.user_id} already has an active deck named "
+                f'"{definition.name}"'
+            )
+        else:
+            pending.append(provisioning)
+            continue
+        finished.append(provisioning)
+
+    card_count = sum(resolved.card_counts.values())
+    decks = Deck.objects.bulk_create(
+        [
+            Deck(
+                user_id=provisioning.user_id,
+                title=title,
+                name=definition.name,
+                description=definition.description,
+                hero=resolved.hero,
+                card_count=card_count,
+            )
+            for provisioning in pending
+        ]
+    )
+    DeckCard.objects.bulk_create(
+        [
+            DeckCard(
+                deck=deck,
+                card=resolved.cards_by_slug[slug],
+                count=count,
+            )
+            for deck in decks
+            for slug, count in resolved.card_counts.items()
+        ]
+    )
+    revisions = DeckRevision.objects.bulk_create(
+        [
+            DeckRevision(
+                deck=deck,
+                sequence=1,
+                composition=resolved.composition,
+                hero_slug=resolved.hero.slug,
+                hero_name=resolved.hero.name,
+                source=DeckRevision.SOURCE_CREATE,
+            )
+            for deck in decks
+        ]
+    )
+    for deck, revision in zip(decks, revisions):
+        deck.current_revision = revision
+    Deck.objects.bulk_update(decks, ["current_revision"])
+
+    if decks:
+        validation_error = validate_deck_for_play(decks[0])
+        if validation_error:
+            raise StarterDeckProvisioningError(
+                f'Invalid starter deck for title "{title.slug}": {validation_error}'
+            )
+        DeckRevision.objects.filter(pk__in=[r.pk for r in revisions[1:]]).update(
+            validated_content_version=title.content_version,
+            validation_error="",
+        )
+
+    decks_by_user = {deck.user_id: deck for deck in decks}
+    preferences = list(
+        UserTitleDeckPreference.objects.filter(
+            user_id__in=decks_by_user,
+            title=title,
+            last_used_deck__isnull=True,
+        )
+    )
+    for preference in preferences:
+        preference.last_used_deck = decks_by_user[preference.user_id]
+        preference.updated_at = now
+    UserTitleDeckPreference.objects.bulk_update(
+        preferences, ["last_used_deck", "updated_at"]
+    )
+    UserTitleDeckPreference.objects.bulk_create(
+        [
+            UserTitleDeckPreference(user_id=user_id, title=title, last_used_deck=deck)
+            for user_id, deck in decks_by_user.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+    for provisioning in pending:
+        provisioning.deck = decks_by_user[provisioning.user_id]
+        provisioning.completed_at = now
+        provisioning.last_error = ""
+    StarterDeckProvisioning.objects.bulk_update(
+        pending + finished,
+        [
+            "deck",
+            "last_attempted_at",
+            "last_dispatched_at",
+            "completed_at",
+            "last_error",
+            "updated_at",
+        ],
+    )
+
+    return decks
+
+
 def provision_starter_decks_for_user(
     user,
     *,
@@ -409,3 +607,53 @@ def retry_pending_starter_decks_for_user(
             provisioned.append(deck)
 
     return provisioned
+
+
+def provision_pending_starter_decks(
+    definition: StarterDeckDefinition,
+    *,
+    batch_size: int = 250,
+    max_batches: int | None = None,
+) -> int:
+    """
+    Complete pending grants of one definition in bulk batches.
+
+    The definition is resolved once for the whole run. A batch that fails is
+    recorded on its grants and ends the run, since a content problem would
+    fail every later batch too. Returns the number of decks created.
+    """
+
+    resolved = resolve_starter_deck(definition)
+    if resolved is None:
+        return 0
+
+    provisioned = 0
+    batches = 0
+    last_pk = 0
+    while max_batches is None or batches < max_batches:
+        batch = list(
+            StarterDeckProvisioning.objects.filter(
+                title_slug=definition.title_slug,
+                completed_at__isnull=True,
+                pk__gt=last_pk,
+            )
+            .order_by("pk")
+            .only("pk", "user_id")[:batch_size]
+        )
+        if not batch:
+            break
+        batches += 1
+        last_pk = batch[-1].pk
+
+        try:
+            provisioned += len(provision_starter_decks_bulk(resolved, batch))
+        except Exception as exc:
+            for provisioning in batch:
+                _record_failure(provisioning, error=str(exc))
+            logger.exception(
+                "Could not bulk provision %s starter decks",
+                definition.title_slug,
+            )
+            break
+
+    return provisioned
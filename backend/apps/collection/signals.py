@@ -1,14 +1,19 @@
 """Collection-related model signals."""
 
 import logging
+from functools import partial
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from apps.collection.compositions import forget_deck_card_counts
+from apps.collection.models import Deck, DeckCard
 from apps.collection.provisioning import provision_starter_decks_for_user
 from apps.collection.tasks import provision_starter_decks_for_user_task
+from apps.core.serializers import forget_title_pve_decks
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -45,3 +50,43 @@ def provision_starter_decks_on_user_creation(
         ),
         robust=True,
     )
+
+
+@receiver(post_save, sender=DeckCard, dispatch_uid="collection_deck_card_saved")
+@receiver(post_delete, sender=DeckCard, dispatch_uid="collection_deck_card_deleted")
+def sync_deck_card_count_on_change(sender, instance, raw=False, **kwargs):
+    """Keep ``Deck.card_count`` in step and make the next revision check re-read."""
+
+    forget_deck_card_counts(instance.deck_id)
+    if raw:
+        return
+
+    total = (
+        DeckCard.objects.filter(deck_id=instance.deck_id).aggregate(total=Sum("count"))[
+            "total"
+        ]
+        or 0
+    )
+    Deck.objects.filter(pk=instance.deck_id).update(card_count=total)
+    # Callers that created the card through their deck instance keep using it.
+    if DeckCard.deck.is_cached(instance):
+        instance.deck.card_count = total
+        ai_deck_title_id = instance.deck.ai_player_id and instance.deck.title_id
+    else:
+        ai_deck_title_id = (
+            Deck.objects.filter(pk=instance.deck_id, ai_player__isnull=False)
+            .values_list("title_id", flat=True)
+            .first()
+        )
+    # PvE deck pickers list card counts.
+    if ai_deck_title_id:
+        transaction.on_commit(partial(forget_title_pve_decks, ai_deck_title_id))
+
+
+@receiver(post_save, sender=Deck, dispatch_uid="collection_ai_deck_saved")
+@receiver(post_delete, sender=Deck, dispatch_uid="collection_ai_deck_deleted")
+def forget_title_pve_decks_on_ai_deck_change(sender, instance, **kwargs):
+    """Rebuild the title's PvE deck picker once an AI deck write commits."""
+
+    if instance.ai_player_id is not None:
+        transaction.on_commit(partial(forget_title_pve_decks, instance.title_id))
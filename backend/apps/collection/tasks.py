@@ -13,6 +13,7 @@ from apps.collection.models import StarterDeckProgram, StarterDeckProvisioning
 from apps.collection.provisioning import (
     STARTER_DECK_RETRY_BACKOFF,
     load_starter_deck_definitions,
+    provision_pending_starter_decks,
     provision_starter_decks_for_user,
 )
 
@@ -90,13 +91,48 @@ def _reserve_due_provisionings(
     return now, reservations
 
 
+def _create_missing_promises(
+    title_slug: str,
+    eligible_after: datetime,
+    *,
+    batch_size: int,
+) -> int:
+    """Promise a starter deck to up to ``batch_size`` eligible users lacking one."""
+
+    user_model = get_user_model()
+    promise = StarterDeckProvisioning.objects.filter(
+        user_id=OuterRef("pk"),
+        title_slug=title_slug,
+    )
+    missing_user_ids = list(
+        user_model.objects.filter(
+            created_at__gt=eligible_after,
+            deleted_at__isnull=True,
+        )
+        .annotate(_has_starter_promise=Exists(promise))
+        .filter(_has_starter_promise=False)
+        .order_by("pk")
+        .values_list("pk", flat=True)[:batch_size]
+    )
+    StarterDeckProvisioning.objects.bulk_create(
+        [
+            StarterDeckProvisioning(
+                user_id=user_id,
+                title_slug=title_slug,
+            )
+            for user_id in missing_user_ids
+        ],
+        ignore_conflicts=True,
+    )
+    return len(missing_user_ids)
+
+
 @shared_task(ignore_result=True)
 def reconcile_starter_deck_provisionings(batch_size: int = 250) -> int:
     """Repair missing promises and dispatch a bounded batch of due retries."""
 
     definitions = load_starter_deck_definitions()
     title_slugs = [definition.title_slug for definition in definitions]
-    user_model = get_user_model()
     program_cutoffs = dict(
         StarterDeckProgram.objects.filter(title_slug__in=title_slugs).values_list(
             "title_slug",
@@ -115,30 +151,7 @@ def reconcile_starter_deck_provisionings(batch_size: int = 250) -> int:
                 title_slug,
             )
             continue
-        promise = StarterDeckProvisioning.objects.filter(
-            user_id=OuterRef("pk"),
-            title_slug=title_slug,
-        )
-        missing_user_ids = list(
-            user_model.objects.filter(
-                created_at__gt=eligible_after,
-                deleted_at__isnull=True,
-            )
-            .annotate(_has_starter_promise=Exists(promise))
-            .filter(_has_starter_promise=False)
-            .order_by("pk")
-            .values_list("pk", flat=True)[:batch_size]
-        )
-        StarterDeckProvisioning.objects.bulk_create(
-            [
-                StarterDeckProvisioning(
-                    user_id=user_id,
-                    title_slug=title_slug,
-                )
-                for user_id in missing_user_ids
-            ],
-            ignore_conflicts=True,
-        )
+        _create_missing_promises(title_slug, eligible_after, batch_size=batch_size)
 
     dispatched_at, reservations = _reserve_due_provisionings(
         active_title_slugs,
@@ -159,3 +172,46 @@ def reconcile_starter_deck_provisionings(batch_size: int = 250) -> int:
             raise
         dispatched += 1
     return dispatched
+
+
+@shared_task(ignore_result=True)
+def bulk_provision_starter_decks(
+    title_slug: str | None = None,
+    batch_size: int = 250,
+) -> int:
+    """
+    Promise and provision starter decks for every eligible user in bulk.
+
+    Used for launch-day signup spikes and for backfilling a newly configured
+    title, where dispatching one task per user would be far too slow.
+    """
+
+    definitions = [
+        definition
+        for definition in load_starter_deck_definitions()
+        if title_slug is None or definition.title_slug == title_slug
+    ]
+    program_cutoffs = dict(
+        StarterDeckProgram.objects.filter(
+            title_slug__in=[definition.title_slug for definition in definitions]
+        ).values_list("title_slug", "eligible_after")
+    )
+
+    provisioned = 0
+    for definition in definitions:
+        eligible_after = program_cutoffs.get(definition.title_slug)
+        if eligible_after is None:
+            logger.error(
+                "Cannot provision starter decks without a program cutoff: %s",
+                definition.title_slug,
+            )
+            continue
+        while _create_missing_promises(
+            definition.title_slug, eligible_after, batch_size=batch_size
+        ):
+            pass
+        provisioned += provision_pending_starter_decks(
+            definition,
+            batch_size=batch_size,
+        )
+    return provisioned
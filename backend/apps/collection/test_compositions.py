@@ -1,3 +1,6 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
@@ -5,8 +8,11 @@ from apps.authentication.models import User
 from apps.builder.models import CardTemplate, HeroTemplate, Title
 from apps.collection.compositions import (
     CompositionCodeError,
+    deck_card_counts_cache_key,
     encode_composition_code,
+    ensure_deck_revision,
     parse_composition_code,
+    resolve_composition_code,
 )
 from apps.collection.models import Deck, DeckCard, DeckCompositionFavorite, DeckRevision
 
@@ -251,3 +257,63 @@ class DeckCompositionApiTests(APITestCase):
         self.assertEqual(removed.status_code, 200)
         self.assertFalse(removed.data["is_favorite"])
         self.assertFalse(DeckCompositionFavorite.objects.exists())
+
+    def test_unedited_deck_revision_check_skips_reading_deck_cards(self):
+        deck, _ = self._create_deck()
+        self._add(deck, self.card_a)
+        revision = Deck.objects.get(pk=deck.pk).current_revision
+
+        with CaptureQueriesContext(connection) as context:
+            current, created = ensure_deck_revision(deck, source="game")
+        self.assertEqual((current, created), (revision, False))
+        self.assertFalse(
+            any(
+                "collection_deckcard" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+        # Writes that bypass the deck views still drop the cached digest.
+        DeckCard.objects.create(deck=deck, card=self.card_b)
+        current, created = ensure_deck_revision(deck, source="game")
+        self.assertTrue(created)
+        self.assertEqual(current.composition.code, "dt1.a-card~1.b-card~1")
+
+    def test_card_edits_drop_a_digest_cached_before_they_commit(self):
+        deck, _ = self._create_deck()
+        self._add(deck, self.card_a)
+        stale_digest = Deck.objects.get(pk=deck.pk).current_revision.composition.digest
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DeckCard.objects.create(deck=deck, card=self.card_b)
+            # A concurrent revision check that read the cards before the edit.
+            cache.set(deck_card_counts_cache_key(deck.pk), stale_digest)
+
+        self.assertIsNone(cache.get(deck_card_counts_cache_key(deck.pk)))
+        current, created = ensure_deck_revision(deck, source="game")
+        self.assertTrue(created)
+        self.assertEqual(current.composition.code, "dt1.a-card~1.b-card~1")
+
+    def test_resolved_codes_are_cached_per_content_version(self):
+        code = "dt1.a-card~2.b-card~1"
+        resolve_composition_code(self.title, code)
+
+        with CaptureQueriesContext(connection) as context:
+            resolved = resolve_composition_code(self.title, code)
+        self.assertEqual(resolved.card_counts, {"a-card": 2, "b-card": 1})
+        self.assertFalse(
+            any(
+                "builder_cardtemplate" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+        CardTemplate.objects.filter(pk=self.card_b.pk).update(is_latest=False)
+        newer_b = CardTemplate.objects.create(
+            title=self.title, slug="b-card", name="B Card", cost=3, version=2
+        )
+        self.assertEqual(
+            resolve_composition_code(self.title, code).cards[1], self.card_b
+        )
+        self.title.bump_content_version()
+        self.assertEqual(resolve_composition_code(self.title, code).cards[1], newer_b)
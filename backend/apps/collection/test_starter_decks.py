@@ -29,6 +29,7 @@ from apps.collection.provisioning import (
     retry_pending_starter_decks_for_user,
 )
 from apps.collection.tasks import (
+    bulk_provision_starter_decks,
     provision_starter_decks_for_user_task,
     reconcile_starter_deck_provisionings,
 )
@@ -700,6 +701,88 @@ class StarterDeckProvisioningTests(TestCase):
         provisioning.refresh_from_db()
         self.assertIsNotNone(provisioning.completed_at)
 
+    def test_bulk_provisioning_backfills_a_batch_with_one_shared_composition(self):
+        with patch(
+            "apps.collection.provisioning.load_starter_deck_definitions",
+            return_value=(),
+        ):
+            users = [
+                User.objects.create_user(email=f"bulk-{index}@example.com")
+                for index in range(5)
+            ]
+        Deck.objects.create(
+            user=users[0],
+            title=self.title,
+            name=self.definition.name,
+            hero=self.hero,
+        )
+        # Promised before the account was deleted.
+        StarterDeckProvisioning.objects.create(
+            user=users[1], title_slug=self.title.slug
+        )
+        users[1].deleted_at = timezone.now()
+        users[1].save(update_fields=["deleted_at"])
+
+        with patch(
+            "apps.collection.tasks.load_starter_deck_definitions",
+            return_value=(self.definition,),
+        ):
+            provisioned = bulk_provision_starter_decks.run(batch_size=2)
+
+        self.assertEqual(provisioned, 3)
+        decks = Deck.objects.filter(
+            user__in=users[2:], title=self.title, name=self.definition.name
+        )
+        self.assertEqual(decks.count(), 3)
+        compositions = {deck.current_revision.composition_id for deck in decks}
+        self.assertEqual(len(compositions), 1)
+        for deck in decks:
+            self.assertEqual(
+                dict(deck.deckcard_set.values_list("card__slug", "count")),
+                {"alpha": 2, "beta": 1},
+            )
+            self.assertEqual(deck.current_revision.sequence, 1)
+            self.assertEqual(
+                deck.current_revision.validated_content_version,
+                self.title.content_version,
+            )
+            self.assertIsNone(validate_deck_for_play(deck))
+            preference = UserTitleDeckPreference.objects.get(
+                user=deck.user, title=self.title
+            )
+            self.assertEqual(preference.last_used_deck, deck)
+
+        name_collision = StarterDeckProvisioning.objects.get(user=users[0])
+        self.assertIsNone(name_collision.completed_at)
+        self.assertIn("already has an active deck", name_collision.last_error)
+        deleted = StarterDeckProvisioning.objects.get(user=users[1])
+        self.assertIsNotNone(deleted.completed_at)
+        self.assertIsNone(deleted.deck_id)
+
+    def test_bulk_provisioning_rolls_back_an_invalid_batch(self):
+        with patch(
+            "apps.collection.provisioning.load_starter_deck_definitions",
+            return_value=(),
+        ):
+            user = User.objects.create_user(email="bulk-invalid@example.com")
+        self.title.config = {**self.title.config, "min_cards_in_deck": 4}
+        self.title.save(update_fields=["config"])
+
+        with (
+            patch(
+                "apps.collection.tasks.load_starter_deck_definitions",
+                return_value=(self.definition,),
+            ),
+            self.assertLogs("apps.collection.provisioning", level="ERROR"),
+        ):
+            provisioned = bulk_provision_starter_decks.run()
+
+        self.assertEqual(provisioned, 0)
+        self.assertFalse(Deck.objects.filter(user=user).exists())
+        provisioning = StarterDeckProvisioning.objects.get(user=user)
+        self.assertIsNone(provisioning.completed_at)
+        self.assertIn("must have at least 4 cards", provisioning.last_error)
+
     def test_registration_api_returns_user_with_listable_starter_deck(self):
         client = APIClient()
         with patch(
@@ -2,7 +2,10 @@
 Tests for collection app - deck building and card management.
 """
 
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 from rest_framework import status
 from rest_framework.test import APIClient
@@ -267,6 +270,50 @@ class DeckConfigValidationTests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Deck size would exceed", response.data["error"])
 
+    def test_card_mutations_maintain_the_stored_card_count(self):
+        self.client.post(
+            f"/api/collection/decks/{self.deck.id}/cards/add/",
+            {"card_slug": self.card_a.slug, "count": 2},
+            format="json",
+        )
+        self.client.post(
+            f"/api/collection/decks/{self.deck.id}/cards/add/",
+            {"card_slug": self.card_b.slug},
+            format="json",
+        )
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.card_count, 3)
+
+        self.client.put(
+            f"/api/collection/decks/{self.deck.id}/cards/{self.card_a.id}/",
+            {"count": 1},
+            format="json",
+        )
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.card_count, 2)
+
+        self.client.delete(
+            f"/api/collection/decks/{self.deck.id}/cards/{self.card_b.id}/delete/"
+        )
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.card_count, 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.deck.deck_size, 1)
+
+    def test_recount_command_repairs_drifted_card_counts(self):
+        DeckCard.objects.create(deck=self.deck, card=self.card_a, count=2)
+        Deck.objects.filter(pk=self.deck.pk).update(card_count=7)
+
+        out = StringIO()
+        call_command("recount_deck_cards", "--dry-run", stdout=out)
+        self.assertIn("stored 7, actual 2", out.getvalue())
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.card_count, 7)
+
+        call_command("recount_deck_cards", stdout=StringIO())
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.card_count, 2)
+
 
 class CollectibleCardDeckValidationTests(TestCase):
     """Test that non-collectible cards cannot be added to player decks."""
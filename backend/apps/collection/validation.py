@@ -83,26 +83,24 @@ def validate_deck_card_count(
     return None
 
 
-def validate_deck_for_play(deck, deck_label: str = "Deck") -> str | None:
-    if getattr(deck, "archived_at", None):
-        return f"{deck_label} has been archived"
-
+def _deck_play_error(deck) -> str | None:
+    """Check the deck's cards and hero; messages omit the leading deck label."""
     config = get_title_config(deck.title)
     deck_size = deck.deck_size
     enforce_deck_rules = not deck.is_ai_deck
 
     if deck.hero.title_id != deck.title_id:
-        return f"{deck_label} has a hero from a different title"
+        return "has a hero from a different title"
 
     if enforce_deck_rules and deck_size < config.min_cards_in_deck:
         return (
-            f"{deck_label} must have at least {config.min_cards_in_deck} cards "
+            f"must have at least {config.min_cards_in_deck} cards "
             f"({deck_size} currently)"
         )
 
     if enforce_deck_rules and deck_size > config.deck_size_limit:
         return (
-            f"{deck_label} cannot have more than {config.deck_size_limit} cards "
+            f"cannot have more than {config.deck_size_limit} cards "
             f"({deck_size} currently)"
         )
 
@@ -116,15 +114,15 @@ def validate_deck_for_play(deck, deck_label: str = "Deck") -> str | None:
         card = deck_card.card
 
         if deck_card.count < 1:
-            return f"{deck_label} contains an invalid count for {card.name}"
+            return f"contains an invalid count for {card.name}"
 
         card_error = validate_card_for_deck(deck, card)
         if card_error:
-            return f"{deck_label} contains an invalid card: {card_error}"
+            return f"contains an invalid card: {card_error}"
 
         if enforce_deck_rules and deck_card.count > config.deck_card_max_count:
             return (
-                f"{deck_label} cannot have more than "
+                f"cannot have more than "
                 f"{config.deck_card_max_count} "
                 f"{_copy_word(config.deck_card_max_count)} of {card.name}"
             )
@@ -135,13 +133,52 @@ def validate_deck_for_play(deck, deck_label: str = "Deck") -> str | None:
             and deck_card.count > 1
         ):
             return (
-                f'{deck_label} contains too many copies of "{card.name}"; '
+                f'contains too many copies of "{card.name}"; '
                 "Unique cards can only have 1 copy"
             )
 
     return None
 
 
+def _memoized_deck_play_error(deck) -> str | None:
+    """
+    Return the deck's play-validation error, memoized on its current revision.
+
+    A revision is an immutable snapshot of the deck's cards and hero, so its
+    verdict only changes when the title's content does. The verdict is stored
+    on the revision together with the title content version it was computed
+    against, and recomputed once that version moves.
+    """
+    if deck.current_revision_id is None:
+        return _deck_play_error(deck)
+
+    from apps.collection.models import DeckRevision
+
+    revision = deck.current_revision
+    content_version = deck.title.content_version
+    if revision.validated_content_version == content_version:
+        return revision.validation_error or None
+
+    error = _deck_play_error(deck)
+    DeckRevision.objects.filter(pk=revision.pk).update(
+        validated_content_version=content_version,
+        validation_error=error or "",
+    )
+    revision.validated_content_version = content_version
+    revision.validation_error = error or ""
+    return error
+
+
+def validate_deck_for_play(deck, deck_label: str = "Deck") -> str | None:
+    if getattr(deck, "archived_at", None):
+        return f"{deck_label} has been archived"
+
+    error = _memoized_deck_play_error(deck)
+    if error:
+        return f"{deck_label} {error}"
+    return None
+
+
 def validate_deck_for_play_or_raise(deck, deck_label: str = "Deck") -> None:
     error = validate_deck_for_play(deck, deck_label)
     if error:
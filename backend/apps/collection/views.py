@@ -1,6 +1,5 @@
 from django.db import transaction
-from django.db.models import Q, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
@@ -107,7 +106,6 @@ def deck_list_by_title(request, title_slug):
                 "title",
                 "current_revision__composition",
             )
-            .annotate(card_count=Coalesce(Sum("deckcard__count"), 0))
             .order_by("-updated_at")
         )
 
@@ -464,9 +462,9 @@ def update_deck_card(request, deck_id, card_id):
             user=request.user,
             archived_at__isnull=True,
         )
+        # Going through the deck's manager keeps ``deck.card_count`` current.
         deck_card = get_object_or_404(
-            DeckCard.objects.select_for_update().select_related("card"),
-            deck=deck,
+            deck.deckcard_set.select_for_update().select_related("card"),
             card_id=card_id,
         )
         card = deck_card.card
@@ -511,7 +509,7 @@ def delete_deck_card(request, deck_id, card_id):
             archived_at__isnull=True,
         )
         card = get_object_or_404(CardTemplate, id=card_id)
-        deck_card = get_object_or_404(DeckCard, deck=deck, card=card)
+        deck_card = get_object_or_404(deck.deckcard_set, card=card)
         deck_card.delete()
         revision, _ = ensure_deck_revision(deck, source="edit")
         composition_data = serialize_deck_composition(deck, revision)
@@ -544,7 +542,6 @@ def opponent_decks_by_title(request, title_slug):
         )
         .exclude(user=request.user)  # Exclude current user
         .select_related("hero", "user")
-        .annotate(card_count=Coalesce(Sum("deckcard__count"), 0))
         .order_by("-updated_at")
     )
 
@@ -729,9 +726,7 @@ def add_deck_card(request, deck_id):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        deck_card = (
-            DeckCard.objects.select_for_update().filter(deck=deck, card=card).first()
-        )
+        deck_card = deck.deckcard_set.select_for_update().filter(card=card).first()
         current_count = deck_card.count if deck_card else 0
         new_total = current_count + count
         validation_error = validate_deck_card_count(
@@ -5,7 +5,7 @@ from django.utils import timezone
 from datetime import timedelta
 
 from .models import SiteSettings
-from apps.gameplay.models import MatchmakingQueue
+from apps.gameplay.models import GameStepProfile, MatchmakingQueue
 
 User = get_user_model()
 
@@ -156,3 +156,11 @@ class MatchmakingQueueEntrySerializer(serializers.ModelSerializer):
             'user_display_name': getattr(getattr(partner, 'user', None), 'display_name', None),
             'status': getattr(partner, 'status', None),
         }
+
+
+class GameStepProfileSerializer(serializers.ModelSerializer):
+    """Serializer for cProfile captures of a game's steps."""
+
+    class Meta:
+        model = GameStepProfile
+        fields = ['id', 'created_at', 'duration_ms', 'stats']
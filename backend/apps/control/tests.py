@@ -6,7 +6,9 @@ from rest_framework.test import APIClient
 from apps.authentication.models import User
 from apps.builder.models import HeroTemplate, Title
 from apps.collection.models import Deck
+from apps.gameplay import instrumentation
 from apps.gameplay.models import Game, MatchmakingQueue
+from apps.gameplay.tests import ServiceTestsBase
 
 
 class MatchmakingManualRunTests(TestCase):
@@ -83,3 +85,46 @@ class MatchmakingManualRunTests(TestCase):
         self.assertEqual(response.data["processed_titles"], 1)
         self.assertEqual(response.data["processed_ladders"], 1)
         self.assertEqual(response.data["matches_created"], 1)
+
+
+class GameplayProfilingControlTests(ServiceTestsBase):
+    def setUp(self):
+        super().setUp()
+        self.staff = User.objects.create_user(
+            email="staff@example.com",
+            username="staff",
+            is_staff=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        instrumentation.reset()
+
+    def test_metrics_are_served_as_prometheus_text_to_staff_only(self):
+        instrumentation.increment("gameplay_test_total", effect="effect_draw")
+
+        response = self.client.get("/api/control/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b'gameplay_test_total{effect="effect_draw"} 1', response.content)
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/api/control/metrics/").status_code, 403)
+
+    def test_profiling_is_toggled_without_touching_the_game_state(self):
+        url = f"/api/control/games/{self.game.id}/profile/"
+        state_version = self.game.state_version
+
+        response = self.client.post(url, {"minutes": 5}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["profiling"])
+        self.game.refresh_from_db()
+        self.assertIsNotNone(self.game.profile_until)
+        self.assertEqual(self.game.state_version, state_version)
+
+        response = self.client.delete(url)
+
+        self.assertFalse(response.data["profiling"])
+        self.game.refresh_from_db()
+        self.assertIsNone(self.game.profile_until)
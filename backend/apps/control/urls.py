@@ -10,6 +10,10 @@ urlpatterns = [
     # System status (health checks + metrics)
     path('system-status/', views.system_status, name='system_status'),
 
+    # Gameplay engine metrics (Prometheus text format) and per-game profiling
+    path('metrics/', views.gameplay_metrics, name='gameplay_metrics'),
+    path('games/<int:game_id>/profile/', views.GameProfileView.as_view(), name='game_profile'),
+
     # Matchmaking queue admin
     path('matchmaking/queue/', views.MatchmakingQueueAdminView.as_view(), name='matchmaking_queue'),
     path('matchmaking/run/', views.MatchmakingManualRunView.as_view(), name='matchmaking_run'),
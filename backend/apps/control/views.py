@@ -3,6 +3,7 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.db.models import Count, Q
+from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
@@ -19,7 +20,9 @@ from .serializers import (
     UserAnalyticsSerializer,
     RecentUsersSerializer,
     MatchmakingQueueEntrySerializer,
+    GameStepProfileSerializer,
 )
+from apps.gameplay import instrumentation
 from apps.gameplay.models import MatchmakingQueue, Game
 from apps.gameplay.services import GameService
 from apps.builder.models import Title
@@ -375,6 +378,74 @@ class MatchmakingManualRunView(APIView):
             )
 
 
+class GameProfileView(APIView):
+    """Toggle cProfile capture of a game's steps and list the captures."""
+
+    permission_classes = [IsStaffPermission]
+    default_minutes = 10
+    max_minutes = 120
+    max_profiles = 20
+
+    def _response(self, game):
+        profiles = game.step_profiles.all()[:self.max_profiles]
+        return Response({
+            'game_id': game.id,
+            'profile_until': game.profile_until,
+            'profiling': instrumentation.profiling_requested(game),
+            'profiles': GameStepProfileSerializer(profiles, many=True).data,
+        })
+
+    def _get_game(self, game_id):
+        try:
+            return Game.objects.only('id', 'profile_until').get(id=game_id)
+        except Game.DoesNotExist:
+            return None
+
+    def get(self, request, game_id):
+        game = self._get_game(game_id)
+        if game is None:
+            return Response({'error': 'Game not found'}, status=status.HTTP_404_NOT_FOUND)
+        return self._response(game)
+
+    def post(self, request, game_id):
+        """Profile the game's steps for the next `minutes` minutes."""
+        game = self._get_game(game_id)
+        if game is None:
+            return Response({'error': 'Game not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            minutes = int(request.data.get('minutes', self.default_minutes))
+        except (ValueError, TypeError):
+            return Response({'error': 'Invalid minutes'}, status=status.HTTP_400_BAD_REQUEST)
+        minutes = max(1, min(minutes, self.max_minutes))
+
+        # Update the column alone; saving the row would invalidate its state.
+        game.profile_until = timezone.now() + timedelta(minutes=minutes)
+        Game.objects.filter(id=game.id).update(profile_until=game.profile_until)
+        logger.info("Profiling game %s until %s", game.id, game.profile_until)
+        return self._response(game)
+
+    def delete(self, request, game_id):
+        """Stop profiling the game; captured profiles are kept."""
+        game = self._get_game(game_id)
+        if game is None:
+            return Response({'error': 'Game not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        game.profile_until = None
+        Game.objects.filter(id=game.id).update(profile_until=None)
+        return self._response(game)
+
+
+@api_view(['GET'])
+@permission_classes([IsStaffPermission])
+def gameplay_metrics(request):
+    """Engine counters and latency histograms of this process, for scraping."""
+    return HttpResponse(
+        instrumentation.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsStaffPermission])
 def control_panel_overview(request):
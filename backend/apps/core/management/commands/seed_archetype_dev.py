@@ -29,6 +29,7 @@ from apps.gameplay.models import (
     MatchmakingQueue,
     UserTitleRating,
 )
+from apps.gameplay.records import rebuild_composition_records, rebuild_ladder_records
 from apps.gameplay.schemas.game import GameState
 from apps.gameplay.services import GameService
 
@@ -460,6 +461,9 @@ class Command(BaseCommand):
                 continue
             self.seed_ranked_history(title, matchup_pairs, ladder_type)
 
+        rebuild_ladder_records(title)
+        rebuild_composition_records(title)
+
     def seed_ranked_history(self, title, matchup_pairs, ladder_type):
         rating_base = 1250 if ladder_type == Game.LADDER_TYPE_DAILY else 1200
 
@@ -1,6 +1,8 @@
+import json
 import logging
 from typing import Any, Dict, List
 
+from django.core.cache import cache
 from pydantic import TypeAdapter, ValidationError
 
 # from .schemas import Card, Trait, Deck, Hero
@@ -11,6 +13,12 @@ from .schemas import Deck, Hero
 
 logger = logging.getLogger(__name__)
 
+# Bump when the catalog payload format changes so cached copies and client
+# ETags from the previous format stop matching.
+TITLE_CATALOG_FORMAT = 1
+TITLE_CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+TITLE_PVE_DECKS_CACHE_TIMEOUT = 60 * 60
+
 
 def to_card_schema(card) -> Card:
     """
@@ -88,27 +96,102 @@ def serialize_cards_with_traits(queryset, *, skip_invalid=False) -> List[Card]:
     return card_schemas
 
 
+def title_catalog_etag(title) -> str:
+    """Strong ETag for a title's card catalog at its current content version."""
+    return f'"cards-{title.id}-{title.content_version}-{TITLE_CATALOG_FORMAT}"'
+
+
+def title_catalog_json(title) -> bytes:
+    """
+    Return the title's latest-card catalog as pre-serialized JSON.
+
+    Cached per title content version, so builder edits (which bump the
+    version) are picked up on the next request without explicit invalidation.
+    """
+    from apps.builder.models import CardTemplate
+
+    cache_key = (
+        f"title_catalog:{title.id}:{title.content_version}:{TITLE_CATALOG_FORMAT}"
+    )
+    payload = cache.get(cache_key)
+    if payload is None:
+        cards_queryset = CardTemplate.objects.filter(
+            title=title, is_latest=True
+        ).order_by("cost", "card_type", "attack", "health", "name")
+        card_data = serialize_cards_with_traits(cards_queryset, skip_invalid=True)
+        payload = json.dumps(
+            [card.model_dump(mode="json") for card in card_data],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        cache.set(cache_key, payload, TITLE_CATALOG_CACHE_TIMEOUT)
+    return payload
+
+
+def deck_schema(deck) -> Deck:
+    """Expects ``hero__faction`` to be selected alongside the deck."""
+    return Deck(
+        id=deck.id,
+        name=deck.name,
+        description=deck.description,
+        hero=Hero(
+            id=deck.hero.id,
+            slug=deck.hero.slug,
+            name=deck.hero.name,
+            health=deck.hero.health,
+            hero_power=deck.hero.hero_power,
+            spec=deck.hero.spec,
+            faction=deck.hero.faction.slug if deck.hero.faction else None,
+        ),
+        card_count=deck.card_count,
+        created_at=deck.created_at,
+        updated_at=deck.updated_at,
+    )
+
+
 def serialize_decks(queryset) -> List[Dict[str, Any]]:
-    queryset = queryset.select_related(
-        "hero", "title", "ai_player", "user"
-    ).prefetch_related("deckcard_set")
-    return [
-        Deck(
-            id=deck.id,
-            name=deck.name,
-            description=deck.description,
-            hero=Hero(
-                id=deck.hero.id,
-                slug=deck.hero.slug,
-                name=deck.hero.name,
-                health=deck.hero.health,
-                hero_power=deck.hero.hero_power,
-                spec=deck.hero.spec,
-                faction=deck.hero.faction.slug if deck.hero.faction else None,
-            ),
-            card_count=deck.deck_size,
-            created_at=deck.created_at,
-            updated_at=deck.updated_at,
-        ).model_dump()
-        for deck in queryset
-    ]
+    queryset = queryset.select_related("hero__faction", "title", "ai_player", "user")
+    return [deck_schema(deck).model_dump() for deck in queryset]
+
+
+def title_pve_decks_cache_key(title_id: int) -> str:
+    return f"title_pve_decks:{title_id}"
+
+
+def title_pve_decks_json(title) -> bytes:
+    """
+    Return the title's PvE opponent decks as pre-serialized JSON.
+
+    Hero edits bump the content version and miss the cache; AI deck writes
+    call ``forget_title_pve_decks`` from the collection signals.
+    """
+    from apps.collection.models import Deck as DeckModel
+
+    cache_key = title_pve_decks_cache_key(title.id)
+    content_version, payload = cache.get(cache_key, (None, None))
+    if content_version != title.content_version:
+        decks = (
+            DeckModel.objects.filter(
+                ai_player__isnull=False,
+                title=title,
+                is_pve_opponent=True,
+                archived_at__isnull=True,
+            )
+            .select_related("hero__faction")
+            .order_by("created_at", "id")
+        )
+        payload = json.dumps(
+            [deck_schema(deck).model_dump(mode="json") for deck in decks],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        cache.set(
+            cache_key,
+            (title.content_version, payload),
+            TITLE_PVE_DECKS_CACHE_TIMEOUT,
+        )
+    return payload
+
+
+def forget_title_pve_decks(title_id: int) -> None:
+    cache.delete(title_pve_decks_cache_key(title_id))
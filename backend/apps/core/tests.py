@@ -1,18 +1,25 @@
 from datetime import datetime, timedelta
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import models
 from django.test import TestCase
 from django.utils import timezone
 
 from apps.authentication.models import Friendship
 from apps.builder.models import AIPlayer, CardTemplate, CardTrait, HeroTemplate, Title
-from apps.collection.models import Deck
+from apps.collection.models import Deck, DeckCard
 from apps.gameplay.models import (
     FriendlyChallenge,
     Game,
     MatchmakingQueue,
     PlayerNotification,
+    UserTitleRating,
+)
+from apps.gameplay.records import (
+    ladder_record_counts,
+    rebuild_ladder_records,
+    record_game_result,
 )
 
 from .lobby_notifications import get_title_lobby_badge_count
@@ -112,9 +119,90 @@ class TitleCardsResilienceTestCase(TestCase):
         )
 
 
+class TitleCardsCatalogCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="catalog-cache@example.com",
+            username="catalog-cache",
+        )
+        self.title = Title.objects.create(
+            slug="catalog-cache",
+            name="Catalog Cache",
+            author=self.author,
+            status=Title.STATUS_PUBLISHED,
+            is_latest=True,
+        )
+        CardTemplate.objects.create(
+            title=self.title,
+            slug="first-card",
+            name="First Card",
+            card_type=CardTemplate.CARD_TYPE_CREATURE,
+            cost=1,
+            attack=1,
+            health=1,
+        )
+        self.url = f"/api/titles/{self.title.slug}/cards/"
+
+    def test_catalog_is_served_from_cache_with_etag(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        first = self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual([card["slug"] for card in second.json()], ["first-card"])
+        self.assertFalse(
+            any("builder_cardtemplate" in query["sql"] for query in queries)
+        )
+
+    def test_matching_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_content_change_invalidates_catalog_and_etag(self):
+        from apps.builder.services import TitleService
+
+        etag = self.client.get(self.url)["ETag"]
+        TitleService(self.title).ingest_yaml(
+            """
+type: card
+slug: second-card
+name: Second Card
+card_type: creature
+cost: 2
+attack: 2
+health: 2
+traits: []
+"""
+        )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            [card["slug"] for card in response.json()],
+            ["first-card", "second-card"],
+        )
+
+
 class TitlePveEndpointTestCase(TestCase):
     """Test cases for title PvE opponent data."""
 
+    def setUp(self):
+        # Cached listings are keyed by title id, which other tests reuse.
+        cache.clear()
+
     def test_pve_decks_are_returned_in_created_order(self):
         """PvE opponents should have a deterministic display order."""
         author = User.objects.create_user(
@@ -210,6 +298,75 @@ class TitlePveEndpointTestCase(TestCase):
         self.assertEqual(response.status_code, 200, response.content)
         self.assertEqual([deck["id"] for deck in response.json()], [visible.id])
 
+    def test_pve_decks_are_cached_until_an_ai_deck_is_edited(self):
+        author = User.objects.create_user(
+            email="cached-author@example.com",
+            username="cached-author",
+        )
+        title = Title.objects.create(
+            slug="pve-cached",
+            name="PvE Cached",
+            author=author,
+            status=Title.STATUS_PUBLISHED,
+            is_latest=True,
+        )
+        hero = HeroTemplate.objects.create(
+            title=title,
+            slug="balanced",
+            name="Balanced",
+            health=20,
+            is_latest=True,
+        )
+        ai_player = AIPlayer.objects.create(name="Cached Test AI")
+        decks = [
+            Deck.objects.create(
+                title=title,
+                ai_player=ai_player,
+                name=f"Opponent {index}",
+                hero=hero,
+            )
+            for index in range(3)
+        ]
+        url = f"/api/titles/{title.slug}/pve/"
+
+        response = self.client.get(url)
+        self.assertEqual(
+            [deck["name"] for deck in response.json()],
+            ["Opponent 0", "Opponent 1", "Opponent 2"],
+        )
+
+        # Only the title lookup remains once the listing is cached.
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.client.force_login(author)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/builder/titles/{title.slug}/ai-decks/{decks[1].id}/",
+                {"name": "Renamed"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        response = self.client.get(url)
+        self.assertEqual(
+            [deck["name"] for deck in response.json()],
+            ["Opponent 0", "Renamed", "Opponent 2"],
+        )
+
+        # Writes from outside the builder, e.g. the admin or scenario sync.
+        card = CardTemplate.objects.create(title=title, slug="card", name="Card")
+        with self.captureOnCommitCallbacks(execute=True):
+            DeckCard.objects.create(deck=decks[0], card=card, count=2)
+            decks[2].archive()
+
+        response = self.client.get(url)
+        self.assertEqual(
+            [(deck["name"], deck["card_count"]) for deck in response.json()],
+            [("Opponent 0", 2), ("Renamed", 0)],
+        )
+
 
 class TitleNotificationsOrderingTestCase(TestCase):
     """Test cases for lobby notification priority ordering."""
@@ -644,6 +801,57 @@ class TitleGamesHistoryTestCase(TestCase):
         )
         self.assertIn("updated_at", games[0])
 
+    def _create_finished_ranked(self, winner):
+        return Game.objects.create(
+            title=self.title,
+            side_a=self.deck_a,
+            side_b=self.deck_b,
+            type=Game.GAME_TYPE_RANKED,
+            ladder_type=Game.LADDER_TYPE_DAILY,
+            status=Game.GAME_STATUS_ENDED,
+            winner=winner,
+            state={"winner": "side_a" if winner == self.deck_a else "side_b"},
+        )
+
+    def test_history_stats_come_from_ladder_record(self):
+        for winner in (self.deck_a, self.deck_a, self.deck_b):
+            record_game_result(self._create_finished_ranked(winner))
+        self._create_finished_friendly(self.deck_b)
+
+        self.client.force_login(self.user_a)
+        response = self.client.get(
+            f"/api/titles/{self.title.slug}/games/history/?ladder_type=daily"
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        stats = response.json()["stats"]
+        self.assertEqual(stats["ranked"], {"total": 3, "wins": 2, "losses": 1})
+        self.assertEqual(stats["friendly"], {"total": 1})
+
+        rating = UserTitleRating.objects.get(
+            user=self.user_b,
+            title=self.title,
+            ladder_type=Game.LADDER_TYPE_DAILY,
+        )
+        self.assertEqual((rating.games_played, rating.wins, rating.losses), (3, 1, 2))
+
+    def test_rebuild_ladder_records_matches_game_history(self):
+        for winner in (self.deck_a, self.deck_b, self.deck_b, None):
+            self._create_finished_ranked(winner)
+
+        self.assertEqual(rebuild_ladder_records(self.title), 2)
+
+        rating = UserTitleRating.objects.get(
+            user=self.user_a,
+            title=self.title,
+            ladder_type=Game.LADDER_TYPE_DAILY,
+        )
+        self.assertEqual((rating.games_played, rating.wins, rating.losses), (4, 1, 2))
+        self.assertEqual(
+            ladder_record_counts(self.title, self.user_a, Game.LADDER_TYPE_DAILY),
+            {"games_played": 4, "wins": 1, "losses": 2},
+        )
+
 
 class BasicDjangoTestCase(TestCase):
     """Basic Django functionality tests."""
@@ -1,6 +1,7 @@
 from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -20,9 +21,14 @@ from apps.gameplay.models import (
 from apps.gameplay.schemas import GameList, GameSummary
 from apps.gameplay.schemas.game import Notification
 
-from .schemas import Deck as DeckSchema
 from .schemas import Hero
-from .serializers import serialize_cards_with_traits, serialize_decks
+from .serializers import (
+    serialize_cards_with_traits,
+    serialize_decks,
+    title_catalog_etag,
+    title_catalog_json,
+    title_pve_decks_json,
+)
 
 
 def get_title_or_403(slug, user):
@@ -146,19 +152,23 @@ def title_by_slug(request, slug):
 def title_cards(request, slug):
     """
     Get all cards for a title, ordered by cost then name.
-    Returns data in the Card schema format with efficient trait fetching.
+
+    The catalog is served as cached, pre-serialized JSON keyed by the title's
+    content version, with an ETag so clients can revalidate with
+    If-None-Match and skip the download when nothing changed.
     """
     title = get_title_or_403(slug, request.user)
 
-    # Build the queryset with filtering and ordering
-    cards_queryset = CardTemplate.objects.filter(title=title, is_latest=True).order_by(
-        "cost", "card_type", "attack", "health", "name"
-    )
-
-    # Use the helper function to serialize with efficient prefetching
-    card_data = serialize_cards_with_traits(cards_queryset, skip_invalid=True)
-
-    return Response([card.model_dump() for card in card_data])
+    etag = title_catalog_etag(title)
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if etag in if_none_match or "*" in if_none_match:
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(
+            title_catalog_json(title), content_type="application/json"
+        )
+    response["ETag"] = etag
+    return response
 
 
 @api_view(["GET"])
@@ -273,35 +283,7 @@ def title_decks(request, slug):
 def title_pve(request, slug):
     """Get normal PvE opponent decks for a title."""
     title = get_title_or_403(slug, request.user)
-
-    decks = Deck.objects.filter(
-        ai_player__isnull=False,
-        title=title,
-        is_pve_opponent=True,
-        archived_at__isnull=True,
-    ).order_by("created_at", "id")
-    return Response(
-        [
-            DeckSchema(
-                id=deck.id,
-                name=deck.name,
-                description=deck.description,
-                hero=Hero(
-                    id=deck.hero.id,
-                    slug=deck.hero.slug,
-                    name=deck.hero.name,
-                    health=deck.hero.health,
-                    hero_power=deck.hero.hero_power,
-                    spec=deck.hero.spec,
-                    faction=deck.hero.faction.slug if deck.hero.faction else None,
-                ),
-                card_count=deck.deck_size,
-                created_at=deck.created_at,
-                updated_at=deck.updated_at,
-            ).model_dump()
-            for deck in decks
-        ]
-    )
+    return HttpResponse(title_pve_decks_json(title), content_type="application/json")
 
 
 @api_view(["GET"])
@@ -498,56 +480,30 @@ def title_games_history(request, slug):
     if ladder_type not in dict(Game.LADDER_TYPE_CHOICES):
         return Response({"error": "Invalid ladder type"}, status=400)
 
-    # Get all completed games for stats calculation only
-    ended_games = (
-        Game.objects.for_title(title)
-        .for_user(user)
-        .filter(status=Game.GAME_STATUS_ENDED)
-        .select_related(
-            "side_a__user",
-            "side_b__user",
-            "side_a__hero",
-            "side_b__hero",
-            "winner",
-            "player_a_user",
-            "player_b_user",
-        )
-        .prefetch_related("elo_change")
-    )
-
-    # Calculate stats using efficient aggregation (only from ended games)
-    ranked_games = ended_games.filter(
-        type=Game.GAME_TYPE_RANKED,
+    # Ranked stats and rating come from the user's materialized ladder record.
+    user_rating = UserTitleRating.objects.filter(
+        user=user,
+        title=title,
         ladder_type=ladder_type,
-    )
-    friendly_games = ended_games.filter(type=Game.GAME_TYPE_FRIENDLY)
-
-    def get_ranked_stats(queryset):
-        total = queryset.count()
-        wins = 0
-        losses = 0
-        for game in queryset:
-            user_deck = game.side_a if game.player_a_user == user else game.side_b
-            if game.winner == user_deck:
-                wins += 1
-            elif game.winner is not None:
-                losses += 1
-        return {"total": total, "wins": wins, "losses": losses}
-
-    ranked_stats = get_ranked_stats(ranked_games)
-    friendly_stats = {"total": friendly_games.count()}
-
-    # Get user's current ELO rating for this title
-    try:
-        user_rating = UserTitleRating.objects.get(
-            user=user,
-            title=title,
-            ladder_type=ladder_type,
-        )
+    ).first()
+    if user_rating:
+        ranked_stats = {
+            "total": user_rating.games_played,
+            "wins": user_rating.wins,
+            "losses": user_rating.losses,
+        }
         current_rating = user_rating.elo_rating
-    except UserTitleRating.DoesNotExist:
+    else:
+        ranked_stats = {"total": 0, "wins": 0, "losses": 0}
         current_rating = 1200  # Default rating if user hasn't played ranked games yet
 
+    friendly_stats = {
+        "total": Game.objects.for_title(title)
+        .for_user(user)
+        .filter(status=Game.GAME_STATUS_ENDED, type=Game.GAME_TYPE_FRIENDLY)
+        .count()
+    }
+
     # Get all games (ended and in-progress) for the games list
     # Show ALL games regardless of ladder type.
     # Stats are filtered by ladder_type, but the list shows everything.
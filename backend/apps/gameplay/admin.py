@@ -122,7 +122,16 @@ class GameActionAdmin(admin.ModelAdmin):
 
 @admin.register(UserTitleRating)
 class UserTitleRatingAdmin(admin.ModelAdmin):
-    list_display = ['user', 'title', 'ladder_type', 'elo_rating', 'updated_at']
+    list_display = [
+        'user',
+        'title',
+        'ladder_type',
+        'elo_rating',
+        'games_played',
+        'wins',
+        'losses',
+        'updated_at',
+    ]
     list_filter = ['title', 'ladder_type', 'updated_at']
     search_fields = ['user__username', 'user__email', 'title__name']
     readonly_fields = ['created_at', 'updated_at']
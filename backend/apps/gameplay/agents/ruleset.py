@@ -1,5 +1,6 @@
 import hashlib
 import json
+from functools import lru_cache
 from typing import Any
 
 from apps.builder.models import CardTemplate, HeroTemplate, Title
@@ -74,3 +75,38 @@ def compute_ruleset_id(title: Title) -> str:
         "trait_definitions": TRAIT_DEFINITIONS,
     }
     return hashlib.sha256(_canonical(payload).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def ruleset_code_fingerprint() -> str:
+    """Hash of the code-defined ruleset inputs (engine version, trait catalog)."""
+    payload = {
+        "engine": RULESET_ENGINE_VERSION,
+        "trait_definitions": TRAIT_DEFINITIONS,
+    }
+    return hashlib.sha256(_canonical(payload).encode("utf-8")).hexdigest()
+
+
+def refresh_title_ruleset_id(title: Title) -> str:
+    """Recompute and store the title's ruleset id."""
+    ruleset_id = compute_ruleset_id(title)
+    fingerprint = ruleset_code_fingerprint()
+    Title.objects.filter(pk=title.pk).update(
+        ruleset_id=ruleset_id,
+        ruleset_fingerprint=fingerprint,
+    )
+    title.ruleset_id = ruleset_id
+    title.ruleset_fingerprint = fingerprint
+    return ruleset_id
+
+
+def get_ruleset_id(title: Title) -> str:
+    """
+    Return the title's stored ruleset id, recomputing it only when missing or
+    when a deploy changed the code-defined inputs since it was stored.
+
+    Content edits refresh the stored id through ``Title.bump_content_version``.
+    """
+    if title.ruleset_id and title.ruleset_fingerprint == ruleset_code_fingerprint():
+        return title.ruleset_id
+    return refresh_title_ruleset_id(title)
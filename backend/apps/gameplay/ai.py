@@ -1,8 +1,10 @@
 import logging
+import time
 from dataclasses import dataclass
 from typing import Any
 
 from apps.builder.schemas import DeckScript
+from apps.gameplay import instrumentation
 from apps.gameplay.agents.legal import list_legal_commands
 from apps.gameplay.agents.policies import policy_for_script
 from apps.gameplay.schemas.commands import Command, EndTurnCommand
@@ -12,6 +14,11 @@ from apps.gameplay.schemas.game import GameState
 logger = logging.getLogger(__name__)
 
 
+def _budget_options(budget_ms: int | None) -> dict:
+    # Without an override each policy keeps its own default budget.
+    return {} if budget_ms is None else {"budget_ms": budget_ms}
+
+
 @dataclass(frozen=True)
 class AIDecision:
     command: Command | None
@@ -62,9 +69,12 @@ class AIMoveChooser:
         *,
         policy: str = "",
         error: str = "",
+        budget_ms: int | None = None,
     ) -> AIDecision:
         script = DeckScript.model_validate(deck.script or {})
-        command = policy_for_script(script).select_command(state, legal_commands)
+        command = policy_for_script(script).select_command(
+            state, legal_commands, **_budget_options(budget_ms)
+        )
         return AIDecision(
             command=command,
             actor_kind="scripted_ai",
@@ -73,7 +83,29 @@ class AIMoveChooser:
         )
 
     @staticmethod
-    def choose_decision(state: GameState, deck) -> AIDecision:
+    def choose_decision(
+        state: GameState, deck, budget_ms: int | None = None
+    ) -> AIDecision:
+        """``budget_ms`` overrides each policy's own default search budget."""
+        start = time.perf_counter()
+        # Simulated effects of the search are part of the decision's time.
+        with instrumentation.suppressed():
+            decision = AIMoveChooser._choose_decision(state, deck, budget_ms)
+        policy = decision.policy.split(":", 1)[0]
+        instrumentation.observe(
+            "gameplay_ai_decision_seconds", time.perf_counter() - start, policy=policy
+        )
+        instrumentation.increment(
+            "gameplay_ai_decisions_total",
+            policy=policy,
+            fallback=bool(decision.error),
+        )
+        return decision
+
+    @staticmethod
+    def _choose_decision(
+        state: GameState, deck, budget_ms: int | None = None
+    ) -> AIDecision:
         legal_commands = list_legal_commands(state, state.active)
         config = AIMoveChooser._strategy_config(deck)
         policy_kind = AIMoveChooser._policy_kind(deck)
@@ -87,6 +119,7 @@ class AIMoveChooser:
                     command = LinearModelPolicy(str(model_path)).select_command(
                         state,
                         legal_commands,
+                        **_budget_options(budget_ms),
                     )
                     return AIDecision(
                         command=command,
@@ -101,6 +134,7 @@ class AIMoveChooser:
                         legal_commands,
                         policy=f"scripted_fallback:linear_model:{model_path}",
                         error=str(exc),
+                        budget_ms=budget_ms,
                     )
 
             logger.warning("Model AI configured without model_path; using scripted")
@@ -110,12 +144,14 @@ class AIMoveChooser:
                 legal_commands,
                 policy="scripted_fallback:missing_model_path",
                 error="missing model_path",
+                budget_ms=budget_ms,
             )
 
         return AIMoveChooser._scripted_decision(
             state,
             deck,
             legal_commands,
+            budget_ms=budget_ms,
         )
 
     @staticmethod
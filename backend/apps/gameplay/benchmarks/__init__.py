@@ -0,0 +1,7 @@
+"""
+Engine micro-benchmarks.
+
+``states/`` holds recorded small, mid and full-board states (see
+``recording``), ``baseline.json`` the reference timings they are compared
+against. Run them with ``python manage.py benchmark_engine``.
+"""
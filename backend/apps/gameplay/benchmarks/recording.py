@@ -0,0 +1,151 @@
+"""
+Record representative engine states for the benchmark suite.
+
+Starting states come from the scenario manifests and from the seeded
+development titles, built by ``ScenarioGameService`` inside a transaction
+that is rolled back. Each game is played forward with ``SmartPolicy`` and
+snapshots are taken at the first main phase (small), once both boards hold
+creatures (mid), and with both boards filled to ``FULL_BOARD_CREATURES``
+(full).
+"""
+
+import json
+from pathlib import Path
+
+import yaml
+from django.core.management import call_command
+from django.db import transaction
+from pydantic import TypeAdapter
+
+from apps.builder.models import CardTemplate, HeroTemplate, Title
+from apps.builder.schemas import DeckScript
+from apps.gameplay.agents.legal import list_legal_commands
+from apps.gameplay.agents.policies.smart import SmartPolicy
+from apps.gameplay.agents.simulator import apply_command, apply_effects
+from apps.gameplay.engine.handlers import spawn_creature
+from apps.gameplay.scenarios import MANIFEST_DIR, ScenarioGameService, ScenarioManifest
+from apps.gameplay.schemas.effects import Effect
+from apps.gameplay.schemas.game import GameState
+
+# Seeded development titles and the command that seeds each one.
+DEV_TITLES = {"archetype": "sync_archetype_dev"}
+MID_BOARD_CREATURES = 2
+FULL_BOARD_CREATURES = 7
+MAX_DECISIONS = 300
+
+
+def _scenario_manifests() -> list[ScenarioManifest]:
+    manifests = []
+    for path in sorted(MANIFEST_DIR.glob("*.yaml")):
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or []
+        for raw_scenario in data if isinstance(data, list) else [data]:
+            manifests.append(ScenarioManifest.model_validate(raw_scenario))
+    return manifests
+
+
+def _dev_title_manifest(title_slug: str) -> ScenarioManifest:
+    """A mirror match of the title's first two heroes with every card."""
+    if not Title.objects.filter(slug=title_slug, is_latest=True).exists():
+        call_command(DEV_TITLES[title_slug])
+    title = Title.objects.get(slug=title_slug, is_latest=True)
+
+    hero_slugs = list(
+        HeroTemplate.objects.filter(title=title, is_latest=True)
+        .order_by("slug")
+        .values_list("slug", flat=True)[:2]
+    )
+    card_slugs = list(
+        CardTemplate.objects.filter(title=title, is_latest=True, is_collectible=True)
+        .order_by("slug")
+        .values_list("slug", flat=True)
+    )
+    return ScenarioManifest.model_validate(
+        {
+            "slug": f"{title_slug}-mirror",
+            "title": title_slug,
+            "sides": {
+                side: {
+                    "controller": "ai",
+                    "hero": {"slug": hero_slug},
+                    "deck": card_slugs[offset:] + card_slugs[:offset],
+                }
+                for side, hero_slug, offset in zip(
+                    ("side_a", "side_b"),
+                    hero_slugs * 2,
+                    (0, len(card_slugs) // 2),
+                )
+            },
+        }
+    )
+
+
+def _board_size(state: GameState) -> int:
+    return min(len(state.board["side_a"]), len(state.board["side_b"]))
+
+
+def _fill_boards(state: GameState) -> GameState:
+    state = state.model_copy(deep=True)
+    creature_cards = [
+        card for card in state.cards.values() if card.card_type == "creature"
+    ]
+    for side in ("side_a", "side_b"):
+        index = 0
+        while len(state.board[side]) < FULL_BOARD_CREATURES and creature_cards:
+            card = creature_cards[index % len(creature_cards)]
+            creature = spawn_creature(card, state, side, len(state.board[side]))
+            creature.exhausted = False
+            index += 1
+    return state
+
+
+def _play_to_sizes(state: GameState, queue: list) -> dict[str, GameState]:
+    state.ai_sides = []
+    state = apply_effects(state, TypeAdapter(list[Effect]).validate_python(queue)).state
+
+    policy = SmartPolicy(DeckScript())
+    snapshots: dict[str, GameState] = {}
+    largest = None
+    decisions = 0
+    while state.winner == "none" and decisions < MAX_DECISIONS:
+        if state.phase == "main":
+            snapshots.setdefault("small", state)
+            if largest is None or _board_size(state) > _board_size(largest):
+                largest = state
+            if _board_size(state) >= MID_BOARD_CREATURES:
+                snapshots["mid"] = state
+                break
+
+        legal_commands = list_legal_commands(state, state.active)
+        command = policy.select_command(state, legal_commands)
+        if command is None:
+            break
+        state = apply_command(state, state.active, command).state
+        decisions += 1
+
+    snapshots.setdefault("mid", largest or state)
+    snapshots["full"] = _fill_boards(snapshots["mid"])
+    return snapshots
+
+
+def record_states(output_dir: Path) -> list[Path]:
+    """Write ``<source>-<size>.json`` state files and return their paths."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    with transaction.atomic():
+        manifests = _scenario_manifests() + [
+            _dev_title_manifest(slug) for slug in DEV_TITLES
+        ]
+        for manifest in manifests:
+            game = ScenarioGameService._create_game(manifest)
+            snapshots = _play_to_sizes(game.game_state, game.queue)
+            for size, state in snapshots.items():
+                path = output_dir / f"{manifest.slug}-{size}.json"
+                payload = {
+                    "source": manifest.slug,
+                    "size": size,
+                    "state": state.model_dump(mode="json"),
+                }
+                path.write_text(json.dumps(payload, indent=1) + "\n")
+                paths.append(path)
+        transaction.set_rollback(True)
+    return paths
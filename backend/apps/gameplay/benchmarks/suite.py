@@ -0,0 +1,243 @@
+"""
+Engine micro-benchmarks over the recorded states.
+
+Every benchmark is pure engine work on an in-memory ``GameState``; nothing
+touches the database, the cache, Redis or Celery. Each one runs in rounds
+sized to take ``min_time / rounds`` seconds, and the fastest round's
+per-call time is reported, as with ``timeit``.
+"""
+
+import gc
+import json
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.utils import timezone
+
+from apps.builder.schemas import DeckScript
+from apps.gameplay import instrumentation
+from apps.gameplay.agents.hash import state_hash
+from apps.gameplay.agents.legal import list_legal_commands
+from apps.gameplay.agents.observation import filter_state_for_player
+from apps.gameplay.agents.policies.smart import SmartPolicy
+from apps.gameplay.agents.simulator import apply_command
+from apps.gameplay.engine.dispatcher import resolve
+from apps.gameplay.schemas.effects import DrawEffect, EndTurnEffect, NewPhaseEffect
+from apps.gameplay.schemas.game import GameState
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+STATES_DIR = BENCHMARKS_DIR / "states"
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_ROUNDS = 5
+DEFAULT_TOLERANCE = 0.25
+RESULTS_VERSION = 1
+
+
+@dataclass
+class RecordedState:
+    name: str
+    source: str
+    size: str
+    state: GameState
+
+
+@dataclass
+class Benchmark:
+    name: str
+    state: str
+    run: Callable[[], object]
+
+    @property
+    def key(self) -> str:
+        return f"{self.state}/{self.name}"
+
+
+def load_states(directory: Path = STATES_DIR) -> list[RecordedState]:
+    states = []
+    for path in sorted(directory.glob("*.json")):
+        payload = json.loads(path.read_text())
+        states.append(
+            RecordedState(
+                name=path.stem,
+                source=payload["source"],
+                size=payload["size"],
+                state=GameState.model_validate(payload["state"]),
+            )
+        )
+    return states
+
+
+def _turn_cycle_effects(state: GameState) -> list:
+    side = state.active
+    return [
+        DrawEffect(side=side),
+        NewPhaseEffect(side=side, phase="refresh"),
+        EndTurnEffect(side=side),
+    ]
+
+
+def build_benchmarks(recorded: RecordedState) -> list[Benchmark]:
+    """Benchmarks for one recorded state, one per command and effect type."""
+    from apps.gameplay.services import GameService
+
+    state = recorded.state
+    side = state.active
+    legal_commands = list_legal_commands(state, side)
+    policy = SmartPolicy(DeckScript())
+
+    benchmarks = [
+        Benchmark(
+            "list_legal_commands",
+            recorded.name,
+            lambda: list_legal_commands(state, side),
+        ),
+        Benchmark("state_hash", recorded.name, lambda: state_hash(state)),
+        Benchmark(
+            "filter_state_for_player",
+            recorded.name,
+            lambda: filter_state_for_player(state, side),
+        ),
+        Benchmark(
+            "smart_policy.select_command",
+            recorded.name,
+            lambda: policy.select_command(state, legal_commands),
+        ),
+    ]
+
+    commands = {}
+    effects = {effect.type: effect for effect in _turn_cycle_effects(state)}
+    for command in legal_commands:
+        commands.setdefault(command.type, command)
+        try:
+            compiled = GameService.compile_cmd(
+                state, command.model_dump(mode="json"), side
+            )
+        except Exception:
+            continue
+        for effect in compiled[:1]:
+            effects.setdefault(effect.type, effect)
+
+    for command_type, command in sorted(commands.items()):
+        benchmarks.append(
+            Benchmark(
+                f"apply_command:{command_type}",
+                recorded.name,
+                lambda command=command: apply_command(state, side, command),
+            )
+        )
+    for effect_type, effect in sorted(effects.items()):
+        benchmarks.append(
+            Benchmark(
+                f"resolve:{effect_type}",
+                recorded.name,
+                lambda effect=effect: resolve(effect, state),
+            )
+        )
+    return benchmarks
+
+
+def _time_calls(run: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        run()
+    return time.perf_counter() - start
+
+
+def measure(
+    benchmark: Benchmark,
+    *,
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+) -> dict:
+    round_time = min_time / rounds
+    number = 1
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while True:
+            elapsed = _time_calls(benchmark.run, number)
+            if elapsed >= round_time:
+                break
+            number *= 10 if elapsed * 10 < round_time else 2
+        per_call = [elapsed / number]
+        per_call.extend(
+            _time_calls(benchmark.run, number) / number for _ in range(rounds - 1)
+        )
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    best = min(per_call)
+    return {
+        "key": benchmark.key,
+        "name": benchmark.name,
+        "state": benchmark.state,
+        "calls_per_round": number,
+        "rounds": rounds,
+        "best_us": round(best * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "ops_per_sec": round(1 / best, 1) if best else None,
+    }
+
+
+def run_suite(
+    states: list[RecordedState],
+    *,
+    only: str = "",
+    min_time: float = DEFAULT_MIN_TIME,
+    rounds: int = DEFAULT_ROUNDS,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """Run every benchmark whose key contains ``only`` and return the report."""
+    results = []
+    # Measure the engine itself, not the metrics it would record in a step.
+    with instrumentation.suppressed():
+        for recorded in states:
+            for benchmark in build_benchmarks(recorded):
+                if only and only not in benchmark.key:
+                    continue
+                result = measure(benchmark, min_time=min_time, rounds=rounds)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def same_environment(report: dict, baseline: dict) -> bool:
+    """Whether two reports were measured on the same interpreter and machine."""
+    return all(report.get(key) == baseline.get(key) for key in ("python", "machine"))
+
+
+def compare_results(
+    report: dict, baseline: dict, *, tolerance: float = DEFAULT_TOLERANCE
+) -> list[dict]:
+    """Benchmarks slower than their baseline by more than ``tolerance``."""
+    baseline_by_key = {result["key"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        previous = baseline_by_key.get(result["key"])
+        if not previous or not previous["best_us"]:
+            continue
+        ratio = result["best_us"] / previous["best_us"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                {
+                    "key": result["key"],
+                    "baseline_us": previous["best_us"],
+                    "best_us": result["best_us"],
+                    "ratio": round(ratio, 3),
+                }
+            )
+    return regressions
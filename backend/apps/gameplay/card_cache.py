@@ -0,0 +1,121 @@
+"""
+Per-title card data used to build a game's initial state.
+
+``create_game`` needs every deck card as a ``Card`` schema, the summon targets
+of those cards and both hero powers, and a ``CardInPlay`` template for each
+summon target. All of it derives from the title's latest builder content, so
+it is built once per title content version and kept both in-process and in
+the shared cache. A content edit bumps ``Title.content_version``, which makes
+every cached copy miss.
+"""
+
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+
+from apps.builder.models import CardTemplate, HeroTemplate
+from apps.builder.schemas import Card, HeroPower, SummonAction
+from apps.core.serializers import serialize_cards_with_traits
+from apps.gameplay.schemas.game import CardInPlay
+
+TITLE_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# title_id -> (content_version, TitleCardCatalog)
+_local_catalogs: dict = {}
+
+
+@dataclass
+class TitleCardCatalog:
+    cards_by_id: dict[int, Card] = field(default_factory=dict)
+    card_ids_by_slug: dict[str, int] = field(default_factory=dict)
+    summon_targets_by_card_id: dict[int, frozenset[str]] = field(default_factory=dict)
+    summon_targets_by_hero_id: dict[int, frozenset[str]] = field(default_factory=dict)
+    summonable_templates: dict[str, CardInPlay] = field(default_factory=dict)
+
+    def card_by_slug(self, slug: str) -> Card | None:
+        card_id = self.card_ids_by_slug.get(slug)
+        return self.cards_by_id.get(card_id) if card_id is not None else None
+
+
+def card_summon_targets(card: Card) -> frozenset[str]:
+    return frozenset(
+        action.target
+        for trait in card.traits
+        for action in trait.actions
+        if isinstance(action, SummonAction)
+    )
+
+
+def hero_summon_targets(hero_power: dict) -> frozenset[str]:
+    return frozenset(
+        action.target
+        for action in HeroPower.model_validate(hero_power or {}).actions
+        if isinstance(action, SummonAction)
+    )
+
+
+def summonable_template(card: Card) -> CardInPlay:
+    """A ``CardInPlay`` template; the card id is assigned when summoned."""
+    return CardInPlay(
+        card_type=card.card_type,
+        card_id="",
+        template_slug=card.slug,
+        name=card.name,
+        description=card.description,
+        attack=card.attack,
+        health=card.health,
+        cost=card.cost,
+        traits=card.traits,
+        faction=card.faction,
+        spec=card.spec,
+        tags=card.tags,
+        art_url=card.art_url,
+    )
+
+
+def build_title_card_catalog(title) -> TitleCardCatalog:
+    catalog = TitleCardCatalog()
+    for card in serialize_cards_with_traits(
+        CardTemplate.objects.filter(title=title, is_latest=True), skip_invalid=True
+    ):
+        catalog.cards_by_id[card.id] = card
+        catalog.card_ids_by_slug[card.slug] = card.id
+        catalog.summon_targets_by_card_id[card.id] = card_summon_targets(card)
+
+    for hero_id, hero_power in HeroTemplate.objects.filter(
+        title=title, is_latest=True
+    ).values_list("id", "hero_power"):
+        catalog.summon_targets_by_hero_id[hero_id] = hero_summon_targets(hero_power)
+
+    summon_targets = set()
+    for targets in catalog.summon_targets_by_card_id.values():
+        summon_targets.update(targets)
+    for targets in catalog.summon_targets_by_hero_id.values():
+        summon_targets.update(targets)
+    for slug in summon_targets:
+        card = catalog.card_by_slug(slug)
+        if card is not None:
+            catalog.summonable_templates[slug] = summonable_template(card)
+
+    return catalog
+
+
+def get_title_card_catalog(title) -> TitleCardCatalog:
+    """Return the card catalog for the title's current content version."""
+    version = title.content_version
+    local = _local_catalogs.get(title.id)
+    if local is not None and local[0] == version:
+        return local[1]
+
+    cache_key = f"gameplay_card_catalog:{title.id}:{version}"
+    catalog = cache.get(cache_key)
+    if catalog is None:
+        catalog = build_title_card_catalog(title)
+        cache.set(cache_key, catalog, TITLE_CARD_CACHE_TIMEOUT)
+
+    _local_catalogs[title.id] = (version, catalog)
+    return catalog
+
+
+def clear_local_catalogs() -> None:
+    _local_catalogs.clear()
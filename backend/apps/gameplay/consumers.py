@@ -1,23 +1,28 @@
 import asyncio
 import json
 import logging
+import time
 from urllib.parse import parse_qs
 
 from asgiref.sync import sync_to_async
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from pydantic import TypeAdapter
 
-from apps.gameplay.schemas.game import GameState
 from apps.gameplay.schemas.updates import GameUpdate as PydGameUpdate
+from apps.gameplay.state_cache import load_game_state
 
 from .models import Game, GameUpdate
 from .presence import (
     clear_game_connection_presence,
     mark_game_connection_active,
+    presence_refresh_due,
     refresh_game_connection_presence,
 )
 from .services import GameService
+from .wire import COMPACT_WIRE_FORMAT, CardCatalogEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +30,70 @@ logger = logging.getLogger(__name__)
 # Prevents deadlocks if Redis becomes unresponsive
 CHANNEL_LAYER_TIMEOUT = 30.0
 
+DEFAULT_ACCESS_CACHE_SECONDS = 30.0
+ACCESS_CACHE_MAX_ENTRIES = 10000
+
+# (game_id, user_id) -> (expires_at, side or None), per process. Sides of
+# participants never change; the TTL bounds staleness of staff spectator
+# access and of denials.
+_access_cache: dict[tuple[str, int], tuple[float, str | None]] = {}
+_ACCESS_CACHE_MISS = object()
+
+
+def _cached_game_side(game_id, user_id):
+    entry = _access_cache.get((game_id, user_id))
+    if entry is None or entry[0] < time.monotonic():
+        return _ACCESS_CACHE_MISS
+    return entry[1]
+
+
+def _cache_game_side(game_id, user_id, side):
+    ttl = float(
+        getattr(
+            settings,
+            "GAMEPLAY_WS_ACCESS_CACHE_SECONDS",
+            DEFAULT_ACCESS_CACHE_SECONDS,
+        )
+    )
+    if ttl <= 0:
+        return
+    now = time.monotonic()
+    if len(_access_cache) >= ACCESS_CACHE_MAX_ENTRIES:
+        for key in [key for key, entry in _access_cache.items() if entry[0] < now]:
+            del _access_cache[key]
+    _access_cache[(game_id, user_id)] = (now + ttl, side)
+
+
+def clear_access_cache():
+    _access_cache.clear()
+
+
+def resolve_game_side(game, user, guest_token=None):
+    """
+    The side ``user`` (or the guest token holder) sees ``game`` from, or None.
+
+    Participants are matched on the game's user id columns, so neither user
+    row is loaded; only the staff check needs the user itself.
+    """
+    if user.is_authenticated:
+        if game.player_a_user_id == user.id:
+            return "side_a"
+        if game.player_b_user_id == user.id:
+            return "side_b"
+
+    if game.allows_guest_access(guest_token):
+        return game.guest_access_side
+
+    # Staff/superuser can view any game as spectator (read-only)
+    if user.is_authenticated:
+        try:
+            if user.is_staff or user.is_superuser:
+                return "spectator"
+        except ObjectDoesNotExist:
+            # The token outlived its user.
+            return None
+    return None
+
 
 class GameConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -35,14 +104,19 @@ class GameConsumer(AsyncWebsocketConsumer):
         access_context = await self.get_game_access_context()
         if not access_context:
             logger.warning(
-                f"User {self.scope['user']} does not have access to game {self.game_id}"
+                f"User {self.scope['user'].id} does not have access to game "
+                f"{self.game_id}"
             )
             await self.close()
             return
 
         game, self.side = access_context
+        self.card_encoder = None
+        if self.get_query_param("wire") == COMPACT_WIRE_FORMAT:
+            self.card_encoder = CardCatalogEncoder()
         self.presence_user_id = None
         self.presence_active = False
+        self.presence_refreshed_at = None
         if self.side != "spectator" and self.scope["user"].is_authenticated:
             self.presence_user_id = self.scope["user"].id
 
@@ -76,7 +150,7 @@ class GameConsumer(AsyncWebsocketConsumer):
             filter_updates_for_side,
         )
 
-        game_state = GameState.model_validate(game.state)
+        game_state = await database_sync_to_async(load_game_state)(game)
         raw_updates = await self.get_game_updates()
         updates = TypeAdapter(list[PydGameUpdate]).validate_python(raw_updates)
 
@@ -93,11 +167,13 @@ class GameConsumer(AsyncWebsocketConsumer):
 
         await self.send(
             text_data=json.dumps(
-                {
-                    "type": "game_updates",
-                    "state": state_to_send,
-                    "updates": updates_to_send,
-                }
+                self.encode_game_updates(
+                    {
+                        "type": "game_updates",
+                        "state": state_to_send,
+                        "updates": updates_to_send,
+                    }
+                )
             )
         )
 
@@ -152,7 +228,7 @@ class GameConsumer(AsyncWebsocketConsumer):
         if self.side == "spectator":
             logger.warning(
                 "Spectator %s attempted to send command to game %s",
-                self.scope["user"],
+                self.scope["user"].id,
                 self.game_id,
             )
             await self.send(
@@ -214,6 +290,7 @@ class GameConsumer(AsyncWebsocketConsumer):
                 channel_name=self.channel_name,
             )
             self.presence_active = True
+            self.presence_refreshed_at = time.monotonic()
             return
 
         await sync_to_async(clear_game_connection_presence, thread_sensitive=False)(
@@ -229,6 +306,12 @@ class GameConsumer(AsyncWebsocketConsumer):
         if not user_id:
             return
 
+        # Coalesce heartbeat writes: one presence write per refresh interval.
+        now = time.monotonic()
+        if not presence_refresh_due(getattr(self, "presence_refreshed_at", None), now):
+            return
+        self.presence_refreshed_at = now
+
         await sync_to_async(refresh_game_connection_presence, thread_sensitive=False)(
             game_id=self.game_id,
             user_id=user_id,
@@ -240,46 +323,63 @@ class GameConsumer(AsyncWebsocketConsumer):
         # Send game updates to WebSocket
         await self.send(
             text_data=json.dumps(
-                {
-                    "type": "game_updates",
-                    "updates": event["updates"],
-                    "errors": event["errors"],
-                    "state": event["state"],
-                }
+                self.encode_game_updates(
+                    {
+                        "type": "game_updates",
+                        "updates": event["updates"],
+                        "errors": event["errors"],
+                        "state": event["state"],
+                    }
+                )
             )
         )
 
+    def encode_game_updates(self, message: dict) -> dict:
+        """Apply the connection's wire format to an outgoing game_updates."""
+        encoder = getattr(self, "card_encoder", None)
+        if encoder is None or message.get("state") is None:
+            return message
+        state, catalog = encoder.encode_state(message["state"])
+        message = {**message, "state": state}
+        if catalog:
+            message["catalog"] = catalog
+        return message
+
     @database_sync_to_async
     def get_game_access_context(self):
         if not self.game_id:
             return None
-        try:
-            game = Game.objects.get(id=self.game_id)
-            user = self.scope["user"]
-            # Check if user is a participant in the game (either side)
-            # Works for both PvE (one side is user, other is AI)
-            # and PvP (both sides are users)
-            if user.is_authenticated:
-                if game.player_a_user == user:
-                    return game, "side_a"
-                if game.player_b_user == user:
-                    return game, "side_b"
-
-            guest_token = self.get_guest_token()
-            if game.allows_guest_access(guest_token):
-                return game, game.guest_access_side
-
-            # Staff/superuser can view any game as spectator (read-only)
-            if user.is_authenticated and (user.is_staff or user.is_superuser):
-                return game, "spectator"
+
+        user = self.scope["user"]
+        guest_token = self.get_guest_token()
+        # Guest tokens can grant access on their own, so only cache without one.
+        cache_key = None
+        if user.is_authenticated and not guest_token:
+            cache_key = (self.game_id, user.id)
+        side = _ACCESS_CACHE_MISS
+        if cache_key:
+            side = _cached_game_side(*cache_key)
+            if side is None:
+                return None
+
+        game = Game.objects.filter(id=self.game_id).first()
+        if game is None:
             return None
-        except Game.DoesNotExist:
+        if side is _ACCESS_CACHE_MISS:
+            side = resolve_game_side(game, user, guest_token)
+            if cache_key:
+                _cache_game_side(*cache_key, side)
+        if side is None:
             return None
+        return game, side
 
-    def get_guest_token(self):
+    def get_query_param(self, name):
         query_string = self.scope.get("query_string", b"").decode()
         query_params = parse_qs(query_string)
-        return query_params.get("guest_token", [None])[0]
+        return query_params.get(name, [None])[0]
+
+    def get_guest_token(self):
+        return self.get_query_param("guest_token")
 
     @database_sync_to_async
     def get_user_side(self, game):
@@ -290,10 +390,10 @@ class GameConsumer(AsyncWebsocketConsumer):
         user = self.scope["user"]
 
         # Check if user owns side_a's deck
-        if game.player_a_user == user:
+        if game.player_a_user_id == user.id:
             return "side_a"
         # Check if user owns side_b's deck
-        elif game.player_b_user == user:
+        elif game.player_b_user_id == user.id:
             return "side_b"
         # If AI game, assign human player to their side
         elif game.side_a.is_ai_deck:
@@ -1,6 +1,7 @@
 import logging
 from typing import Callable, Dict
 
+from apps.gameplay import instrumentation
 from apps.gameplay.schemas.effects import Effect
 from apps.gameplay.schemas.game import GameState
 from apps.gameplay.schemas.engine import Result, Fault
@@ -21,12 +22,19 @@ def register(kind: str):
 
 def resolve(effect: Effect, state: GameState) -> Result:
     """Pure-ish resolver: deep-copy first (your choice), dispatch by kind."""
-    st = state.model_copy(deep=True)
+    with instrumentation.span("gameplay_state_copy"):
+        st = state.model_copy(deep=True)
     handler = _REGISTRY.get(effect.type)
     logger.debug(f"\033[38;5;208m{effect}\033[0m")
     if not handler:
-        return Fault(error_id="unknown_effect", reason="Unknown Effect")
-    return handler(effect, st)
+        result = Fault(error_id="unknown_effect", reason="Unknown Effect")
+    else:
+        with instrumentation.span("gameplay_effect_handler", effect=effect.type):
+            result = handler(effect, st)
+    instrumentation.increment(
+        "gameplay_effects_total", effect=effect.type, outcome=result.type
+    )
+    return result
 
 # Import handlers to register them (must be after register() is defined)
 from apps.gameplay.engine import handlers  # noqa: E402, F401
@@ -0,0 +1,224 @@
+"""
+Lightweight timers, counters and per-game profiling for the gameplay engine.
+
+Spans and counters are aggregated in process memory and rendered in the
+Prometheus text exposition format:
+
+- ``GET /api/control/metrics/`` serves the web process's registry.
+- With ``GAMEPLAY_METRICS_TEXTFILE_DIR`` set, every process running steps
+  (i.e. Celery workers) rewrites ``gameplay-<host>-<pid>.prom`` in that
+  directory at most every ``GAMEPLAY_METRICS_TEXTFILE_INTERVAL_SECONDS``, for
+  node_exporter's textfile collector or any local scraper.
+
+Engine work done while the AI searches for a move is not counted separately;
+it is part of that decision's ``gameplay_ai_decision_seconds``.
+
+Games flagged from the control panel (``Game.profile_until``) run their steps
+under ``cProfile`` and store the report as ``GameStepProfile`` rows.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+DEFAULT_METRICS_TEXTFILE_INTERVAL_SECONDS = 15
+PROFILE_STATS_LIMIT = 60
+
+_lock = threading.Lock()
+# (name, labels) -> value
+_counters: dict = {}
+# (name, labels) -> [per-bucket counts..., +Inf count, sum]
+_histograms: dict = {}
+_suppressed: ContextVar[bool] = ContextVar("gameplay_instrumentation_suppressed")
+_last_textfile_write = 0.0
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "GAMEPLAY_INSTRUMENTATION", True)) and not (
+        _suppressed.get(False)
+    )
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    if not enabled():
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if not enabled():
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram[index] += 1
+                break
+        else:
+            histogram[len(LATENCY_BUCKETS)] += 1
+        histogram[-1] += value
+
+
+@contextmanager
+def span(name: str, **labels):
+    """Time the block into the ``<name>_seconds`` histogram."""
+    if not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def suppressed():
+    """Record nothing inside the block, e.g. simulated effects of AI search."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _format_labels(labels: tuple, extra: tuple = ()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(
+            key,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in pairs
+    )
+    return "{" + rendered + "}"
+
+
+def render_prometheus(extra_labels: dict | None = None) -> str:
+    """Render the registry in the Prometheus text exposition format."""
+    extra = tuple(sorted((extra_labels or {}).items()))
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(value)) for key, value in _histograms.items())
+
+    lines = []
+    typed = set()
+    for (name, labels), value in counters:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels, extra)} {value}")
+
+    for (name, labels), histogram in histograms:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram[:-1]):
+            cumulative += count
+            le = (("le", str(bound)),)
+            lines.append(
+                f"{name}_bucket{_format_labels(labels, extra + le)} {cumulative}"
+            )
+        lines.append(f"{name}_sum{_format_labels(labels, extra)} {histogram[-1]}")
+        lines.append(f"{name}_count{_format_labels(labels, extra)} {cumulative}")
+
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def maybe_write_textfile() -> None:
+    """Rewrite this process's metrics file if the interval has elapsed."""
+    global _last_textfile_write
+
+    directory = getattr(settings, "GAMEPLAY_METRICS_TEXTFILE_DIR", "")
+    if not directory:
+        return
+    interval = float(
+        getattr(
+            settings,
+            "GAMEPLAY_METRICS_TEXTFILE_INTERVAL_SECONDS",
+            DEFAULT_METRICS_TEXTFILE_INTERVAL_SECONDS,
+        )
+    )
+    now = time.monotonic()
+    if now - _last_textfile_write < interval:
+        return
+    _last_textfile_write = now
+
+    process = f"{socket.gethostname()}-{os.getpid()}"
+    path = os.path.join(directory, f"gameplay-{process}.prom")
+    try:
+        # Write then rename so scrapers never read a partial file.
+        with open(f"{path}.tmp", "w") as textfile:
+            textfile.write(render_prometheus({"process": process}))
+        os.replace(f"{path}.tmp", path)
+    except OSError as exc:
+        logger.warning(f"Could not write gameplay metrics to {path}: {exc}")
+
+
+def profiling_requested(game) -> bool:
+    return bool(game.profile_until and game.profile_until > timezone.now())
+
+
+def profile_step(game, run, *args):
+    """Run ``run(*args)`` under cProfile and store the report for ``game``."""
+    from apps.gameplay.models import GameStepProfile
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    result = profiler.runcall(run, *args)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(
+        PROFILE_STATS_LIMIT
+    )
+    GameStepProfile.objects.create(
+        game=game, duration_ms=duration_ms, stats=report.getvalue()
+    )
+    return result
@@ -0,0 +1,349 @@
+"""
+In-process load generator for the game WebSocket path.
+
+Synthetic players are real users with real decks, paired into PvP games (or
+matched against an AI deck). Each one authenticates with a JWT access token
+in the ``token`` query parameter, exactly as ``JWTAuthMiddleware`` expects,
+connects to ``GameConsumer`` through the ASGI WebSocket stack, and plays
+random commands from ``list_legal_commands`` on the state it receives.
+
+Everything runs in one process: the in-memory channel layer stands in for
+Redis and Celery tasks run eagerly, so a run approximates one ASGI worker
+that also executes its games' steps. The report has command-to-update
+latency percentiles, connect and reconnect latency, database queries and
+commits, and the channel layer traffic that Redis would otherwise carry.
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.collection.models import Deck, DeckCard
+from apps.gameplay.agents.legal import list_legal_commands
+from apps.gameplay.middleware import JWTAuthMiddlewareStack
+from apps.gameplay.models import Game
+from apps.gameplay.schemas.commands import ConcedeCommand
+from apps.gameplay.schemas.game import GameState
+from apps.gameplay.services import GameService
+from apps.gameplay.tasks import step
+
+User = get_user_model()
+
+LOADTEST_EMAIL_DOMAIN = "loadtest.local"
+RECEIVE_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class SyntheticPlayer:
+    user: object
+    deck: Deck
+    token: str
+    game_id: int | None = None
+    side: str | None = None
+
+
+@dataclass
+class LoadTestStats:
+    command_latencies: list = field(default_factory=list)
+    connect_latencies: list = field(default_factory=list)
+    reconnect_latencies: list = field(default_factory=list)
+    commands_sent: int = 0
+    commands_rejected: int = 0
+    finished_games: set = field(default_factory=set)
+    stalls: int = 0
+    db_queries: int = 0
+    db_query_seconds: float = 0.0
+    channel_messages: int = 0
+    channel_bytes: int = 0
+
+
+def websocket_application():
+    """The ``config.asgi`` WebSocket stack, without the origin check."""
+    from apps.gameplay.routing import websocket_urlpatterns
+
+    return JWTAuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+
+
+def create_players(count: int, template_deck: Deck) -> list[SyntheticPlayer]:
+    """Create ``count`` users, each with a copy of ``template_deck``."""
+    run_id = uuid.uuid4().hex[:8]
+    deck_cards = list(template_deck.deckcard_set.values_list("card_id", "count"))
+    players = []
+    for index in range(count):
+        user = User.objects.create_user(
+            email=f"{run_id}-{index}@{LOADTEST_EMAIL_DOMAIN}",
+            username=f"loadtest-{run_id}-{index}",
+        )
+        deck = Deck.objects.create(
+            title_id=template_deck.title_id,
+            user=user,
+            name=template_deck.name,
+            hero_id=template_deck.hero_id,
+            card_count=template_deck.card_count,
+        )
+        DeckCard.objects.bulk_create(
+            [
+                DeckCard(deck=deck, card_id=card_id, count=count)
+                for card_id, count in deck_cards
+            ]
+        )
+        players.append(
+            SyntheticPlayer(user=user, deck=deck, token=str(AccessToken.for_user(user)))
+        )
+    return players
+
+
+def start_games(players: list[SyntheticPlayer], ai_deck: Deck | None = None) -> None:
+    """Pair players into PvP games, or give each one a game against ``ai_deck``."""
+    if ai_deck is not None:
+        for player in players:
+            game = GameService.create_game(player.deck, ai_deck)
+            player.game_id, player.side = game.id, "side_a"
+            step.delay(game.id)
+        return
+
+    for player_a, player_b in zip(players[::2], players[1::2]):
+        game = GameService.create_game(player_a.deck, player_b.deck)
+        player_a.game_id, player_a.side = game.id, "side_a"
+        player_b.game_id, player_b.side = game.id, "side_b"
+        step.delay(game.id)
+
+
+def delete_players(players: list[SyntheticPlayer]) -> None:
+    user_ids = [player.user.id for player in players]
+    Game.objects.filter(side_a__user_id__in=user_ids).delete()
+    Game.objects.filter(side_b__user_id__in=user_ids).delete()
+    Deck.objects.filter(user_id__in=user_ids).delete()
+    User.objects.filter(id__in=user_ids).delete()
+
+
+def _wants_to_act(state: dict, side: str) -> bool:
+    if state.get("winner", "none") != "none":
+        return False
+    if state.get("phase") == "mulligan":
+        return not state.get("mulligan_done", {}).get(side, False)
+    return state.get("phase") == "main" and state.get("active") == side
+
+
+async def _connect(application, player: SyntheticPlayer):
+    communicator = WebsocketCommunicator(
+        application, f"/ws/game/{player.game_id}/?token={player.token}"
+    )
+    start = time.perf_counter()
+    connected, _ = await communicator.connect(timeout=RECEIVE_TIMEOUT_SECONDS)
+    if not connected:
+        raise RuntimeError(f"Player {player.user.id} could not join {player.game_id}")
+    message = await communicator.receive_json_from(timeout=RECEIVE_TIMEOUT_SECONDS)
+    return communicator, message, time.perf_counter() - start
+
+
+async def play(
+    application,
+    player: SyntheticPlayer,
+    stats: LoadTestStats,
+    *,
+    max_commands: int = 200,
+    reconnect_every: int = 0,
+    think_seconds: float = 0.0,
+    rng: random.Random | None = None,
+) -> None:
+    """
+    Play one side of a game until it ends. After ``max_commands`` the player
+    concedes, so the opponent is never left waiting for a move.
+    """
+    rng = rng or random.Random()
+    communicator, message, latency = await _connect(application, player)
+    stats.connect_latencies.append(latency)
+    state = message["state"]
+    sent_at = None
+    commands = 0
+
+    try:
+        while state.get("winner", "none") == "none":
+            # Only act on the newest state; queued broadcasts supersede it.
+            if (
+                sent_at is None
+                and _wants_to_act(state, player.side)
+                and await communicator.receive_nothing(timeout=0)
+            ):
+                if reconnect_every and commands and commands % reconnect_every == 0:
+                    await communicator.disconnect()
+                    communicator, message, latency = await _connect(application, player)
+                    stats.reconnect_latencies.append(latency)
+                    state = message["state"]
+                    if not _wants_to_act(state, player.side):
+                        continue
+
+                if commands >= max_commands:
+                    command = ConcedeCommand()
+                else:
+                    legal_commands = list_legal_commands(
+                        GameState.model_validate(state), player.side
+                    )
+                    command = rng.choice(legal_commands or [ConcedeCommand()])
+                if think_seconds:
+                    await asyncio.sleep(rng.uniform(0, think_seconds))
+                await communicator.send_json_to(command.model_dump(mode="json"))
+                sent_at = time.perf_counter()
+                commands += 1
+                stats.commands_sent += 1
+
+            try:
+                message = await communicator.receive_json_from(
+                    timeout=RECEIVE_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                stats.stalls += 1
+                break
+            if message.get("type") != "game_updates":
+                continue
+
+            if sent_at is not None:
+                if message.get("state") is None:
+                    stats.commands_rejected += 1
+                else:
+                    stats.command_latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+            if message.get("state") is not None:
+                state = message["state"]
+
+        if state.get("winner", "none") != "none":
+            stats.finished_games.add(player.game_id)
+    finally:
+        await communicator.disconnect()
+
+
+@contextmanager
+def _count_channel_traffic(layer, stats: LoadTestStats):
+    """Count messages and payload bytes the channel layer is asked to carry."""
+
+    def counted(send):
+        async def wrapper(target, message):
+            stats.channel_messages += 1
+            stats.channel_bytes += len(json.dumps(message, default=str))
+            return await send(target, message)
+
+        return wrapper
+
+    # The layer is shared by the whole process, so later runs must not count
+    # into this run's stats.
+    send, group_send = layer.send, layer.group_send
+    layer.send, layer.group_send = counted(send), counted(group_send)
+    try:
+        yield
+    finally:
+        layer.send, layer.group_send = send, group_send
+
+
+def _database_counters() -> dict:
+    if connection.vendor != "postgresql":
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute(
+            "SELECT xact_commit, xact_rollback, tup_returned, tup_fetched, "
+            "tup_inserted, tup_updated, tup_deleted "
+            "FROM pg_stat_database WHERE datname = current_database()"
+        )
+        columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, cursor.fetchone()))
+
+
+def _percentiles(samples: list) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction):
+        return round(
+            ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] * 1000, 2
+        )
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+        "p50_ms": at(0.5),
+        "p90_ms": at(0.9),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def run_load_test(players: list[SyntheticPlayer], **play_options) -> dict:
+    """Play every player concurrently and return the report."""
+
+    application = websocket_application()
+    stats = LoadTestStats()
+    seed = play_options.pop("seed", None)
+
+    def count_query(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats.db_queries += 1
+            stats.db_query_seconds += time.perf_counter() - start
+
+    async def play_all():
+        await asyncio.gather(
+            *(
+                play(
+                    application,
+                    player,
+                    stats,
+                    rng=random.Random(None if seed is None else seed + index),
+                    **play_options,
+                )
+                for index, player in enumerate(players)
+                if player.game_id
+            )
+        )
+
+    before = _database_counters()
+    start = time.perf_counter()
+    # Consumers' database work runs on this thread, so one wrapper sees it all.
+    with (
+        _count_channel_traffic(get_channel_layer(), stats),
+        connection.execute_wrapper(count_query),
+    ):
+        async_to_sync(play_all)()
+    elapsed = time.perf_counter() - start
+    after = _database_counters()
+
+    return {
+        "players": len(players),
+        "games": len({player.game_id for player in players if player.game_id}),
+        "elapsed_seconds": round(elapsed, 3),
+        "commands_sent": stats.commands_sent,
+        "commands_rejected": stats.commands_rejected,
+        "commands_per_second": (
+            round(stats.commands_sent / elapsed, 2) if elapsed else 0
+        ),
+        "games_finished": len(stats.finished_games),
+        "stalls": stats.stalls,
+        "command_latency": _percentiles(stats.command_latencies),
+        "connect_latency": _percentiles(stats.connect_latencies),
+        "reconnect_latency": _percentiles(stats.reconnect_latencies),
+        "database": {
+            "queries": stats.db_queries,
+            "query_seconds": round(stats.db_query_seconds, 3),
+            **{key: after[key] - before.get(key, 0) for key in after},
+        },
+        "channel_layer": {
+            "messages": stats.channel_messages,
+            "bytes": stats.channel_bytes,
+        },
+    }
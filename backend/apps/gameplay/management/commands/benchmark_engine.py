@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gameplay.benchmarks.suite import (
+    BASELINE_PATH,
+    DEFAULT_MIN_TIME,
+    DEFAULT_ROUNDS,
+    DEFAULT_TOLERANCE,
+    STATES_DIR,
+    compare_results,
+    load_states,
+    run_suite,
+    same_environment,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the game engine on recorded states and, with --baseline, "
+        "compare the timings against a baseline recorded on the same machine. "
+        "Needs no database, Redis or Celery unless --record is given."
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--record",
+            action="store_true",
+            help=(
+                "Re-record the benchmark states from the scenario manifests and "
+                "seeded dev titles first. Needs the database."
+            ),
+        )
+        parser.add_argument(
+            "--only", default="", help="Only run benchmarks whose key contains this."
+        )
+        parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME)
+        parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+        parser.add_argument(
+            "--baseline",
+            nargs="?",
+            const=str(BASELINE_PATH),
+            help=(
+                "Compare against this baseline (the stored one if no path is "
+                "given). Timings are absolute, so only same-machine baselines "
+                "can fail the run."
+            ),
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help="Allowed slowdown over the baseline, e.g. 0.25 for 25%%.",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Save this run as the baseline instead of comparing against it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["record"]:
+            from apps.gameplay.benchmarks.recording import record_states
+
+            for path in record_states(STATES_DIR):
+                self.stdout.write(f"Recorded {path.name}")
+
+        states = load_states()
+        if not states:
+            raise CommandError(f"No recorded states in {STATES_DIR}; use --record.")
+
+        report = run_suite(
+            states,
+            only=options["only"],
+            min_time=options["min_time"],
+            rounds=options["rounds"],
+            on_result=lambda result: self.stdout.write(
+                f"{result['key']:<70} {result['best_us']:>12.1f} us"
+            ),
+        )
+
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(report, indent=1) + "\n")
+
+        if options["update_baseline"]:
+            baseline_path = Path(options["baseline"] or BASELINE_PATH)
+            baseline_path.write_text(json.dumps(report, indent=1) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+            return
+        if not options["baseline"]:
+            return
+        baseline_path = Path(options["baseline"])
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; nothing to compare.")
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        regressions = compare_results(
+            report,
+            baseline,
+            tolerance=options["tolerance"],
+        )
+        comparable = same_environment(report, baseline)
+        style = self.style.ERROR if comparable else self.style.WARNING
+        for regression in regressions:
+            self.stdout.write(
+                style(
+                    f"{regression['key']}: {regression['baseline_us']:.1f} us -> "
+                    f"{regression['best_us']:.1f} us ({regression['ratio']:.2f}x)"
+                )
+            )
+        if not comparable:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"The baseline was recorded on Python {baseline.get('python')} "
+                    f"({baseline.get('machine')}), not Python {report['python']} "
+                    f"({report['machine']}); timings are not compared strictly. "
+                    "Use --update-baseline to record one here."
+                )
+            )
+            return
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) regressed beyond "
+                f"{options['tolerance']:.0%} of the baseline."
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+from celery import current_app
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from apps.collection.models import Deck
+from apps.gameplay.loadtest import (
+    create_players,
+    delete_players,
+    run_load_test,
+    start_games,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Play synthetic players through the game WebSocket consumer in this "
+        "process, using the in-memory channel layer, eager Celery tasks and the "
+        "configured database, and report latency and load."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=20)
+        parser.add_argument(
+            "--deck",
+            type=int,
+            required=True,
+            help="Deck copied for every synthetic player.",
+        )
+        parser.add_argument(
+            "--ai-deck",
+            type=int,
+            help="Play every player against this AI deck instead of pairing them.",
+        )
+        parser.add_argument("--max-commands", type=int, default=200)
+        parser.add_argument(
+            "--reconnect-every",
+            type=int,
+            default=0,
+            help="Reconnect each player after this many commands (0 never does).",
+        )
+        parser.add_argument(
+            "--think-ms",
+            type=int,
+            default=0,
+            help="Random delay of up to this long before each command.",
+        )
+        parser.add_argument("--seed", type=int)
+        parser.add_argument("--output", help="Write the JSON report to this path.")
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic users, decks and games afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            template_deck = Deck.objects.get(id=options["deck"])
+            ai_deck = (
+                Deck.objects.get(id=options["ai_deck"]) if options["ai_deck"] else None
+            )
+        except Deck.DoesNotExist as exc:
+            raise CommandError(str(exc)) from exc
+        if ai_deck is None and options["players"] % 2:
+            raise CommandError("--players must be even unless --ai-deck is given.")
+
+        players = create_players(options["players"], template_deck)
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        try:
+            with override_settings(
+                CHANNEL_LAYERS={
+                    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+                },
+                GAMEPLAY_PRESENCE_REDIS_URL="",
+            ):
+                start_games(players, ai_deck)
+                report = run_load_test(
+                    players,
+                    max_commands=options["max_commands"],
+                    reconnect_every=options["reconnect_every"],
+                    think_seconds=options["think_ms"] / 1000,
+                    seed=options["seed"],
+                )
+        finally:
+            current_app.conf.task_always_eager = eager
+            if not options["keep"]:
+                delete_players(players)
+
+        rendered = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(rendered + "\n")
+        self.stdout.write(rendered)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.builder.models import Title
+from apps.gameplay.records import rebuild_ladder_records
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized ranked win/loss records from game history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--title", help="Only rebuild records for this title slug.")
+
+    def handle(self, *args, **options):
+        title = None
+        if options.get("title"):
+            title = Title.objects.filter(slug=options["title"], is_latest=True).first()
+            if title is None:
+                raise CommandError(f"Title '{options['title']}' not found.")
+
+        written = rebuild_ladder_records(title)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} ladder records."))
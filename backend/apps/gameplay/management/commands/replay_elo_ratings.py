@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.builder.models import Title
+from apps.gameplay.models import ELORatingChange, Game, UserTitleRating
+from apps.gameplay.ratings import replay_ratings
+
+
+class Command(BaseCommand):
+    help = "Rebuild ELO ratings by replaying the rating change ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--title", help="Only replay ladders for this title slug.")
+        parser.add_argument(
+            "--ladder",
+            choices=[Game.LADDER_TYPE_RAPID, Game.LADDER_TYPE_DAILY],
+            help="Only replay this ladder type.",
+        )
+
+    def handle(self, *args, **options):
+        changes = ELORatingChange.objects.filter(title__isnull=False)
+        ratings = UserTitleRating.objects.all()
+        if options.get("title"):
+            title = Title.objects.filter(slug=options["title"], is_latest=True).first()
+            if title is None:
+                raise CommandError(f"Title '{options['title']}' not found.")
+            changes = changes.filter(title=title)
+            ratings = ratings.filter(title=title)
+        if options.get("ladder"):
+            changes = changes.filter(ladder_type=options["ladder"])
+            ratings = ratings.filter(ladder_type=options["ladder"])
+
+        ladders = set(changes.values_list("title_id", "ladder_type").distinct())
+        ladders.update(ratings.values_list("title_id", "ladder_type").distinct())
+        titles = Title.objects.in_bulk({title_id for title_id, _ in ladders})
+
+        # Each ladder replays in its own transaction, locking only its ratings.
+        replayed = 0
+        for title_id, ladder_type in sorted(ladders):
+            replayed += replay_ratings(titles[title_id], ladder_type)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Replayed {replayed} ELO changes across {len(ladders)} ladders."
+            )
+        )
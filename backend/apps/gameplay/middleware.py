@@ -3,10 +3,10 @@ Custom middleware for WebSocket authentication using JWT tokens.
 """
 import logging
 from urllib.parse import parse_qs
-from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 
@@ -15,7 +15,28 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-@database_sync_to_async
+class TokenUser(SimpleLazyObject):
+    """
+    The user named by a validated access token.
+
+    ``id``, ``pk`` and the authentication flags come from the token's claims,
+    so consumers that only need those never touch the database. Any other
+    attribute loads the user row on first access.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        super().__init__(lambda: User.objects.get(id=user_id))
+        # Set directly so reading them never triggers the lazy load.
+        self.__dict__["id"] = user_id
+        self.__dict__["pk"] = user_id
+
+    def __repr__(self):
+        return f"<TokenUser: {self.id}>"
+
+
 def get_user_from_token(token_string):
     """
     Validate JWT token and return the associated user.
@@ -23,22 +44,26 @@ def get_user_from_token(token_string):
     try:
         # Validate and decode the token
         access_token = AccessToken(token_string)
-        user_id = access_token['user_id']
-
-        # Get the user from the database
-        user = User.objects.get(id=user_id)
-        return user
-    except (TokenError, InvalidToken, User.DoesNotExist) as e:
-        logger.warning(f"Invalid token or user not found: {e}")
+        user_id = User._meta.pk.to_python(access_token['user_id'])
+    except (TokenError, InvalidToken, KeyError) as e:
+        logger.warning(f"Invalid token: {e}")
         return AnonymousUser()
+    return TokenUser(user_id)
 
 
 class JWTAuthMiddleware(BaseMiddleware):
     """
     Custom middleware that authenticates WebSocket connections using JWT tokens
     passed as query parameters.
+
+    Connections without a token fall through to ``session_auth`` (the session
+    auth stack), so the session is only loaded when it can matter.
     """
 
+    def __init__(self, inner, session_auth=None):
+        super().__init__(inner)
+        self.session_auth = session_auth or inner
+
     async def __call__(self, scope, receive, send):
         # Get query string from scope
         query_string = scope.get('query_string', b'').decode()
@@ -49,16 +74,14 @@ class JWTAuthMiddleware(BaseMiddleware):
 
         if token:
             # Authenticate user with JWT token
-            scope['user'] = await get_user_from_token(token)
-            logger.info(f"JWT auth: User {scope['user']} authenticated via token")
-        else:
-            # No token provided, keep the user from the session (if any)
-            # This allows backwards compatibility with session-based auth
-            if 'user' not in scope:
-                scope['user'] = AnonymousUser()
-            logger.debug(f"No JWT token in query params, user from session: {scope['user']}")
+            scope = dict(scope, user=get_user_from_token(token))
+            logger.info(f"JWT auth: User {scope['user'].id} authenticated via token")
+            return await super().__call__(scope, receive, send)
 
-        return await super().__call__(scope, receive, send)
+        # No token provided, keep the user from the session (if any)
+        # This allows backwards compatibility with session-based auth
+        logger.debug("No JWT token in query params, using session auth")
+        return await self.session_auth(scope, receive, send)
 
 
 def JWTAuthMiddlewareStack(inner):
@@ -67,4 +90,4 @@ def JWTAuthMiddlewareStack(inner):
     Maintains compatibility with AuthMiddlewareStack pattern.
     """
     from channels.auth import AuthMiddlewareStack
-    return JWTAuthMiddleware(AuthMiddlewareStack(inner))
+    return JWTAuthMiddleware(inner, session_auth=AuthMiddlewareStack(inner))
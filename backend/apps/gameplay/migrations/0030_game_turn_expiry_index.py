@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0029_game_loadout"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                condition=models.Q(("turn_expires__isnull", False)),
+                fields=["status", "turn_expires"],
+                name="gameplay_ga_turn_expiry_idx",
+            ),
+        ),
+    ]
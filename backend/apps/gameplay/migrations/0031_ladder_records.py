@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_ladder_records(apps, schema_editor):
+    """Populate ladder records from already finished ranked games."""
+    Game = apps.get_model("gameplay", "Game")
+    UserTitleRating = apps.get_model("gameplay", "UserTitleRating")
+
+    records = defaultdict(lambda: {"games_played": 0, "wins": 0, "losses": 0})
+    ended_ranked_games = (
+        Game.objects.filter(status="ended", type="ranked", ladder_type__isnull=False)
+        .values_list(
+            "title_id",
+            "ladder_type",
+            "player_a_user_id",
+            "player_b_user_id",
+            "side_a_id",
+            "side_b_id",
+            "winner_id",
+        )
+        .iterator()
+    )
+    for (
+        title_id,
+        ladder_type,
+        player_a_user_id,
+        player_b_user_id,
+        side_a_id,
+        side_b_id,
+        winner_id,
+    ) in ended_ranked_games:
+        recorded_user_ids = set()
+        for user_id, deck_id in (
+            (player_a_user_id, side_a_id),
+            (player_b_user_id, side_b_id),
+        ):
+            if not user_id or user_id in recorded_user_ids:
+                continue
+            recorded_user_ids.add(user_id)
+            record = records[(user_id, title_id, ladder_type)]
+            record["games_played"] += 1
+            if winner_id == deck_id:
+                record["wins"] += 1
+            elif winner_id is not None:
+                record["losses"] += 1
+
+    for (user_id, title_id, ladder_type), record in records.items():
+        UserTitleRating.objects.update_or_create(
+            user_id=user_id,
+            title_id=title_id,
+            ladder_type=ladder_type,
+            defaults=record,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0030_game_turn_expiry_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usertitlerating",
+            name="games_played",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usertitlerating",
+            name="losses",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="usertitlerating",
+            name="wins",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["title", "type", "ladder_type", "status"],
+                name="gameplay_ga_title_ladder_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["player_a_user", "title", "status"],
+                name="gameplay_ga_player_a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="game",
+            index=models.Index(
+                fields=["player_b_user", "title", "status"],
+                name="gameplay_ga_player_b_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_ladder_records, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,158 @@
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_composition_records(apps, schema_editor):
+    """Populate composition matchup rollups from captured finished games."""
+    Game = apps.get_model("gameplay", "Game")
+    GameLoadout = apps.get_model("gameplay", "GameLoadout")
+    CompositionMatchupRecord = apps.get_model("gameplay", "CompositionMatchupRecord")
+
+    games = {
+        game_id: (title_id, game_type, state, side_a_id, side_b_id, winner_id)
+        for game_id, title_id, game_type, state, side_a_id, side_b_id, winner_id in (
+            Game.objects.filter(
+                status="ended",
+                type__in=["ranked", "friendly"],
+            ).values_list(
+                "id",
+                "title_id",
+                "type",
+                "state",
+                "side_a_id",
+                "side_b_id",
+                "winner_id",
+            )
+        )
+    }
+    loadouts_by_game = defaultdict(list)
+    for loadout in (
+        GameLoadout.objects.filter(game_id__in=list(games))
+        .values_list("game_id", "side", "composition_id", "hero_slug", "hero_name")
+        .iterator()
+    ):
+        loadouts_by_game[loadout[0]].append(loadout[1:])
+
+    rows = {}
+    for game_id, loadouts in loadouts_by_game.items():
+        title_id, game_type, state, side_a_id, side_b_id, winner_id = games[game_id]
+        winner_side = (state or {}).get("winner")
+        if winner_side not in {"side_a", "side_b"} and winner_id:
+            if side_a_id != side_b_id:
+                if winner_id == side_a_id:
+                    winner_side = "side_a"
+                elif winner_id == side_b_id:
+                    winner_side = "side_b"
+
+        for side, composition_id, hero_slug, hero_name in loadouts:
+            opposing = next((item for item in loadouts if item[0] != side), None)
+            key = (
+                composition_id,
+                title_id,
+                game_type,
+                hero_slug,
+                opposing[2] if opposing else "",
+            )
+            row = rows.setdefault(key, {"wins": 0, "losses": 0, "draws": 0})
+            row["hero_name"] = hero_name
+            row["opponent_hero_name"] = opposing[3] if opposing else ""
+            if winner_side == side:
+                row["wins"] += 1
+            elif winner_side in {"side_a", "side_b"}:
+                row["losses"] += 1
+            else:
+                row["draws"] += 1
+
+    CompositionMatchupRecord.objects.bulk_create(
+        [
+            CompositionMatchupRecord(
+                composition_id=composition_id,
+                title_id=title_id,
+                game_type=game_type,
+                hero_slug=hero_slug,
+                opponent_hero_slug=opponent_hero_slug,
+                **row,
+            )
+            for (
+                composition_id,
+                title_id,
+                game_type,
+                hero_slug,
+                opponent_hero_slug,
+            ), row in rows.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("builder", "0014_alter_cardtrait_trait_slug_alter_traitoverride_slug"),
+        ("collection", "0017_starterdeckprovisioning"),
+        ("gameplay", "0031_ladder_records"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CompositionMatchupRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("game_type", models.CharField(max_length=20)),
+                ("hero_slug", models.SlugField(max_length=255)),
+                ("opponent_hero_slug", models.SlugField(blank=True, max_length=255)),
+                ("hero_name", models.CharField(max_length=120)),
+                ("opponent_hero_name", models.CharField(blank=True, max_length=120)),
+                ("wins", models.PositiveIntegerField(default=0)),
+                ("losses", models.PositiveIntegerField(default=0)),
+                ("draws", models.PositiveIntegerField(default=0)),
+                (
+                    "composition",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="matchup_records",
+                        to="collection.deckcomposition",
+                    ),
+                ),
+                (
+                    "title",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="composition_matchup_records",
+                        to="builder.title",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gameplay_composition_matchup_record",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "composition",
+                            "title",
+                            "game_type",
+                            "hero_slug",
+                            "opponent_hero_slug",
+                        ),
+                        name="gameplay_comp_matchup_record_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_composition_records,
+            migrations.RunPython.noop,
+        ),
+    ]
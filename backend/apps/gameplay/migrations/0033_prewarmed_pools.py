@@ -0,0 +1,49 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0032_composition_matchup_records"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrewarmedScenarioGame",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("scenario_slug", models.SlugField(max_length=255)),
+                ("ruleset_id", models.CharField(max_length=64)),
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="gameplay.game",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gameplay_prewarmed_scenario_game",
+                "indexes": [
+                    models.Index(
+                        fields=["scenario_slug", "ruleset_id"],
+                        name="gameplay_prewarm_scenario_idx",
+                    )
+                ],
+            },
+        ),
+    ]
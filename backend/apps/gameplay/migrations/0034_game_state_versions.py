@@ -0,0 +1,33 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0033_prewarmed_pools"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="state_flushed_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Token of the state stored in the state column.",
+                max_length=32,
+            ),
+        ),
+        migrations.AddField(
+            model_name="game",
+            name="state_version",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Token of the latest state, which may only be in the hot cache.",
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.10 on 2026-10-19 14:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0034_game_state_versions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="game",
+            name="profile_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Steps are captured with cProfile until this time.",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="GameStepProfile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("duration_ms", models.FloatField()),
+                (
+                    "stats",
+                    models.TextField(
+                        help_text="pstats report sorted by cumulative time."
+                    ),
+                ),
+                (
+                    "game",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="step_profiles",
+                        to="gameplay.game",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gameplay_game_step_profile",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_composition_captures(apps, schema_editor):
+    """Count each row's captured games and earliest capture from loadouts."""
+    Game = apps.get_model("gameplay", "Game")
+    GameLoadout = apps.get_model("gameplay", "GameLoadout")
+    CompositionMatchupRecord = apps.get_model("gameplay", "CompositionMatchupRecord")
+
+    games = {
+        game_id: (title_id, game_type)
+        for game_id, title_id, game_type in Game.objects.filter(
+            status="ended",
+            type__in=["ranked", "friendly"],
+        ).values_list("id", "title_id", "type")
+    }
+    loadouts_by_game = defaultdict(list)
+    for loadout in (
+        GameLoadout.objects.filter(game_id__in=list(games))
+        .order_by("game_id", "side")
+        .values_list("game_id", "side", "composition_id", "hero_slug", "created_at")
+        .iterator()
+    ):
+        loadouts_by_game[loadout[0]].append(loadout[1:])
+
+    captures = {}
+    for game_id, loadouts in loadouts_by_game.items():
+        counted_compositions = set()
+        for side, composition_id, hero_slug, created_at in loadouts:
+            opposing = next((item for item in loadouts if item[0] != side), None)
+            key = (
+                composition_id,
+                *games[game_id],
+                hero_slug,
+                opposing[2] if opposing else "",
+            )
+            row = captures.setdefault(key, [0, created_at])
+            row[1] = min(row[1], created_at)
+            if composition_id not in counted_compositions:
+                counted_compositions.add(composition_id)
+                row[0] += 1
+
+    records = []
+    for record in CompositionMatchupRecord.objects.iterator():
+        key = (
+            record.composition_id,
+            record.title_id,
+            record.game_type,
+            record.hero_slug,
+            record.opponent_hero_slug,
+        )
+        if key in captures:
+            record.captured_games, record.first_captured_at = captures[key]
+            records.append(record)
+    CompositionMatchupRecord.objects.bulk_update(
+        records,
+        ["captured_games", "first_captured_at"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gameplay", "0035_game_step_profiles"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="compositionmatchuprecord",
+            name="captured_games",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="compositionmatchuprecord",
+            name="first_captured_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            backfill_composition_captures,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.10 on 2026-10-19 16:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("collection", "0019_deck_card_count"),
+        ("gameplay", "0037_composition_record_captures"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrewarmedPveGame",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "ai_side",
+                    models.CharField(
+                        choices=[("side_a", "Side_a"), ("side_b", "Side_b")],
+                        max_length=10,
+                    ),
+                ),
+                ("content_version", models.PositiveIntegerField()),
+                ("ruleset_id", models.CharField(max_length=64)),
+                (
+                    "ai_deck",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="collection.deck",
+                    ),
+                ),
+                (
+                    "game",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="gameplay.game",
+                    ),
+                ),
+                (
+                    "revision",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="collection.deckrevision",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "gameplay_prewarmed_pve_game",
+                "indexes": [
+                    models.Index(
+                        fields=["ai_deck", "ai_side", "revision", "content_version"],
+                        name="gameplay_prewarm_pve_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
+import copy
 import hashlib
 import secrets
+import uuid
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
@@ -10,7 +12,6 @@ from django.utils import timezone
 from apps.collection.models import Deck, DeckComposition, DeckRevision
 from apps.core.models import TimestampedModel, list_to_choices
 from apps.gameplay.schemas.effects import Effect
-from apps.gameplay.schemas.game import GameState
 
 User = get_user_model()
 
@@ -129,6 +130,18 @@ class Game(TimestampedModel):
     )
 
     state = models.JSONField(default=dict)
+    state_version = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        help_text="Token of the latest state, which may only be in the hot cache.",
+    )
+    state_flushed_version = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        help_text="Token of the state stored in the state column.",
+    )
     ruleset_id = models.CharField(
         max_length=64,
         blank=True,
@@ -151,6 +164,11 @@ class Game(TimestampedModel):
         blank=True,
         help_text="When the current turn expires (for time enforcement)",
     )
+    profile_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Steps are captured with cProfile until this time.",
+    )
 
     guest_access_token_hash = models.CharField(
         max_length=64,
@@ -171,9 +189,32 @@ class Game(TimestampedModel):
         help_text="Expiry time for single-game guest access.",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["title", "type", "ladder_type", "status"],
+                name="gameplay_ga_title_ladder_idx",
+            ),
+            models.Index(
+                fields=["player_a_user", "title", "status"],
+                name="gameplay_ga_player_a_idx",
+            ),
+            models.Index(
+                fields=["player_b_user", "title", "status"],
+                name="gameplay_ga_player_b_idx",
+            ),
+            models.Index(
+                fields=["status", "turn_expires"],
+                name="gameplay_ga_turn_expiry_idx",
+                condition=Q(turn_expires__isnull=False),
+            ),
+        ]
+
     @property
     def game_state(self):
-        return GameState.model_validate(self.state)
+        from apps.gameplay.state_cache import load_game_state
+
+        return load_game_state(self)
 
     @property
     def is_vs_ai(self):
@@ -253,7 +294,63 @@ class Game(TimestampedModel):
             self.player_a_user = self.side_a.user
         if self.side_b_id:
             self.player_b_user = self.side_b.user
+
+        # Every state write gets a fresh token so hot cached copies go stale.
+        update_fields = kwargs.get("update_fields")
+        deferred_fields = self.get_deferred_fields()
+        writes_state = (
+            "state" in update_fields
+            if update_fields is not None
+            else "state" not in deferred_fields
+        )
+        if (
+            update_fields is None
+            and writes_state
+            and "_stale_state" in self.__dict__
+            and self.state == self._stale_state
+        ):
+            # A full-row save (e.g. from the admin) of an unchanged stale column
+            # must not replace the newer hot state, so the column is left out.
+            writes_state = False
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name != "state"
+                and field.attname not in deferred_fields
+            ]
+        if writes_state:
+            self.state_version = self.state_flushed_version = uuid.uuid4().hex
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields,
+                    "state_version",
+                    "state_flushed_version",
+                }
         super().save(*args, **kwargs)
+        self._track_stale_state()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        game = super().from_db(db, field_names, values)
+        game._track_stale_state()
+        return game
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self.__dict__.pop("_stale_state", None)
+        self._track_stale_state()
+
+    def _track_stale_state(self):
+        """Remember the loaded state column while a newer state is only hot."""
+        fields = self.__dict__
+        if "state" in fields and fields.get("state_version") != fields.get(
+            "state_flushed_version"
+        ):
+            if "_stale_state" not in fields:
+                self._stale_state = copy.deepcopy(self.state)
+        else:
+            fields.pop("_stale_state", None)
 
     def enqueue(
         self, effects: list[Effect], trigger: bool = True, prepend: bool = False
@@ -335,6 +432,105 @@ class GameLoadout(TimestampedModel):
         return f"Game {self.game_id} {self.side}: {self.composition.code}"
 
 
+class CompositionMatchupRecord(TimestampedModel):
+    """
+    Rollup of finished-game results for one composition and hero matchup.
+
+    Maintained when captured games end; rebuilt from ``GameLoadout`` history
+    with the ``rebuild_composition_records`` command.
+    """
+
+    composition = models.ForeignKey(
+        DeckComposition,
+        on_delete=models.CASCADE,
+        related_name="matchup_records",
+    )
+    title = models.ForeignKey(
+        "builder.Title",
+        on_delete=models.CASCADE,
+        related_name="composition_matchup_records",
+    )
+    game_type = models.CharField(max_length=20)
+    hero_slug = models.SlugField(max_length=255)
+    # Blank when the opposing side was not captured.
+    opponent_hero_slug = models.SlugField(max_length=255, blank=True)
+    hero_name = models.CharField(max_length=120)
+    opponent_hero_name = models.CharField(max_length=120, blank=True)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    # A game is counted on only one row per composition, so the rows of a
+    # composition sum to its distinct captured games.
+    captured_games = models.PositiveIntegerField(default=0)
+    first_captured_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "gameplay_composition_matchup_record"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "composition",
+                    "title",
+                    "game_type",
+                    "hero_slug",
+                    "opponent_hero_slug",
+                ],
+                name="gameplay_comp_matchup_record_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.composition_id} {self.game_type} "
+            f"{self.hero_slug} vs {self.opponent_hero_slug}"
+        )
+
+
+class PrewarmedPveGame(TimestampedModel):
+    """A PvE game with only its AI deck seated, waiting for a player's deck."""
+
+    ai_deck = models.ForeignKey(Deck, on_delete=models.CASCADE, related_name="+")
+    ai_side = models.CharField(max_length=10, choices=GameLoadout.SIDE_CHOICES)
+    revision = models.ForeignKey(
+        DeckRevision, on_delete=models.CASCADE, related_name="+"
+    )
+    content_version = models.PositiveIntegerField()
+    ruleset_id = models.CharField(max_length=64)
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        db_table = "gameplay_prewarmed_pve_game"
+        indexes = [
+            models.Index(
+                fields=["ai_deck", "ai_side", "revision", "content_version"],
+                name="gameplay_prewarm_pve_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.ai_deck_id} {self.ai_side} game {self.game_id}"
+
+
+class PrewarmedScenarioGame(TimestampedModel):
+    """A fully initialized scenario game waiting to be claimed by a guest."""
+
+    scenario_slug = models.SlugField(max_length=255)
+    ruleset_id = models.CharField(max_length=64)
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        db_table = "gameplay_prewarmed_scenario_game"
+        indexes = [
+            models.Index(
+                fields=["scenario_slug", "ruleset_id"],
+                name="gameplay_prewarm_scenario_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.scenario_slug} game {self.game_id}"
+
+
 class GameUpdate(TimestampedModel):
     game = models.ForeignKey(Game, on_delete=models.CASCADE)
     update = models.JSONField()
@@ -343,6 +539,23 @@ class GameUpdate(TimestampedModel):
         return f"{self.game.side_a.name} vs {self.game.side_b.name} - {self.update['type']}"
 
 
+class GameStepProfile(TimestampedModel):
+    """cProfile capture of one step of a game flagged for profiling."""
+
+    game = models.ForeignKey(
+        Game, on_delete=models.CASCADE, related_name="step_profiles"
+    )
+    duration_ms = models.FloatField()
+    stats = models.TextField(help_text="pstats report sorted by cumulative time.")
+
+    class Meta:
+        db_table = "gameplay_game_step_profile"
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Game {self.game_id} step profile ({self.duration_ms:.1f} ms)"
+
+
 class GameAction(TimestampedModel):
     """
     Decision log for humans, scripted AIs, and future model-driven agents.
@@ -429,6 +642,11 @@ class UserTitleRating(TimestampedModel):
         default=1200, help_text="Player's ELO rating for this title (default: 1200)"
     )
 
+    # Materialized ladder record, maintained when ranked games end.
+    games_played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+
     class Meta:
         db_table = "gameplay_user_title_rating"
         verbose_name = "User Title Rating"
@@ -7,9 +7,16 @@ including filtering state and updates based on what each player should see.
 
 import asyncio
 import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
+from django.conf import settings
+
+from apps.gameplay import instrumentation
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +24,23 @@ logger = logging.getLogger(__name__)
 # Prevents Celery workers from blocking indefinitely if Redis is unresponsive.
 SEND_TIMEOUT = 5.0
 
+DEFAULT_BROADCAST_COALESCE_MS = 30
+
+
+@dataclass
+class _PendingBroadcast:
+    state: object
+    started_at: float
+    updates: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    merged: int = 0
+
+
+# game_id -> pending broadcast, for games inside coalesced_broadcasts().
+_pending_broadcasts: ContextVar[dict | None] = ContextVar(
+    "gameplay_pending_broadcasts", default=None
+)
+
 
 def filter_updates_for_side(updates: list, viewing_side: str) -> list:
     """
@@ -90,15 +114,65 @@ async def _send_with_timeout(channel_layer, group_name: str, message: dict):
         logger.error(f"Error sending to channel group {group_name}: {e}")
 
 
+def _coalesce_window_seconds() -> float:
+    return (
+        float(
+            getattr(
+                settings,
+                "GAMEPLAY_BROADCAST_COALESCE_MS",
+                DEFAULT_BROADCAST_COALESCE_MS,
+            )
+        )
+        / 1000
+    )
+
+
+@contextmanager
+def coalesced_broadcasts(game_id: int):
+    """
+    Merge the game's broadcasts made inside the block.
+
+    Updates are concatenated in order and only the newest state is sent. A
+    pending broadcast goes out once it is ``GAMEPLAY_BROADCAST_COALESCE_MS``
+    old, and whatever is pending when the block exits is sent immediately,
+    so the last update of a burst is never held back.
+    """
+    pending = _pending_broadcasts.get()
+    if _coalesce_window_seconds() <= 0 or (pending is not None and game_id in pending):
+        yield
+        return
+
+    token = None
+    if pending is None:
+        pending = {}
+        token = _pending_broadcasts.set(pending)
+    pending[game_id] = None
+    try:
+        yield
+    finally:
+        broadcast = pending.pop(game_id)
+        if token is not None:
+            _pending_broadcasts.reset(token)
+        if broadcast is not None:
+            _flush_broadcast(game_id, broadcast)
+
+
+def _flush_broadcast(game_id: int, broadcast: _PendingBroadcast):
+    if broadcast.merged:
+        instrumentation.increment(
+            "gameplay_broadcasts_coalesced_total", broadcast.merged
+        )
+    _broadcast_game_updates(
+        game_id, broadcast.state, broadcast.updates, broadcast.errors
+    )
+
+
 def send_game_updates_to_clients(game_id: int, state, updates: list, errors: list = []):
     """
     Send game updates to WebSocket clients with per-player filtering.
 
-    Each player receives their own filtered version of the state and updates,
-    hiding information they shouldn't see (opponent's hand, deck, etc.).
-    Spectators (staff viewing games) receive unfiltered full state.
-
-    Uses timeout to prevent blocking if Redis channel layer is unresponsive.
+    Inside ``coalesced_broadcasts(game_id)`` the send may be merged with the
+    game's next ones; otherwise it goes out immediately.
 
     Args:
         game_id: The game ID
@@ -106,45 +180,76 @@ def send_game_updates_to_clients(game_id: int, state, updates: list, errors: lis
         updates: List of update objects/dicts
         errors: List of error objects/dicts (optional)
     """
-    channel_layer = get_channel_layer()
+    pending = _pending_broadcasts.get()
+    if pending is None or game_id not in pending:
+        _broadcast_game_updates(game_id, state, updates, errors)
+        return
+
+    now = time.monotonic()
+    broadcast = pending[game_id]
+    if broadcast is not None and now - broadcast.started_at >= (
+        _coalesce_window_seconds()
+    ):
+        _flush_broadcast(game_id, broadcast)
+        broadcast = None
+    if broadcast is None:
+        broadcast = pending[game_id] = _PendingBroadcast(state=state, started_at=now)
+    else:
+        broadcast.state = state
+        broadcast.merged += 1
+    broadcast.updates.extend(updates)
+    broadcast.errors.extend(errors)
+
+
+def _broadcast_game_updates(game_id: int, state, updates: list, errors: list):
+    """
+    Each player receives their own filtered version of the state and updates,
+    hiding information they shouldn't see (opponent's hand, deck, etc.).
+    Spectators (staff viewing games) receive unfiltered full state.
 
-    # Send side-specific messages to per-player groups
-    for side in ["side_a", "side_b"]:
-        side_group_name = f"game_{game_id}_{side}"
-        filtered_updates = filter_updates_for_side(updates, side)
-        filtered_state = filter_state_for_side(state, side)
+    Uses timeout to prevent blocking if Redis channel layer is unresponsive.
+    """
+    with instrumentation.span("gameplay_broadcast"):
+        channel_layer = get_channel_layer()
+
+        # Send side-specific messages to per-player groups
+        for side in ["side_a", "side_b"]:
+            side_group_name = f"game_{game_id}_{side}"
+            filtered_updates = filter_updates_for_side(updates, side)
+            filtered_state = filter_state_for_side(state, side)
+
+            async_to_sync(_send_with_timeout)(
+                channel_layer,
+                side_group_name,
+                {
+                    "type": "game_updates",
+                    "updates": filtered_updates,
+                    "errors": errors,
+                    "state": filtered_state,
+                },
+            )
+
+        # Send unfiltered state to spectators (staff viewing games)
+        spectator_group_name = f"game_{game_id}_spectator"
+        state_dict = (
+            state.model_dump(mode="json") if hasattr(state, "model_dump") else state
+        )
+        updates_list = [
+            u.model_dump(mode="json") if hasattr(u, "model_dump") else u
+            for u in updates
+        ]
 
         async_to_sync(_send_with_timeout)(
             channel_layer,
-            side_group_name,
+            spectator_group_name,
             {
                 "type": "game_updates",
-                "updates": filtered_updates,
+                "updates": updates_list,
                 "errors": errors,
-                "state": filtered_state,
+                "state": state_dict,
             },
         )
 
-    # Send unfiltered state to spectators (staff viewing games)
-    spectator_group_name = f"game_{game_id}_spectator"
-    state_dict = (
-        state.model_dump(mode="json") if hasattr(state, "model_dump") else state
-    )
-    updates_list = [
-        u.model_dump(mode="json") if hasattr(u, "model_dump") else u for u in updates
-    ]
-
-    async_to_sync(_send_with_timeout)(
-        channel_layer,
-        spectator_group_name,
-        {
-            "type": "game_updates",
-            "updates": updates_list,
-            "errors": errors,
-            "state": state_dict,
-        },
-    )
-
 
 def send_matchmaking_success(user_id: int, game_id: int, title_slug: str):
     """
@@ -6,7 +6,8 @@ from django.conf import settings
 logger = logging.getLogger(__name__)
 
 
-DEFAULT_GAME_PRESENCE_TTL_SECONDS = 75
+DEFAULT_GAME_PRESENCE_TTL_SECONDS = 120
+DEFAULT_GAME_PRESENCE_REFRESH_INTERVAL_SECONDS = 55
 
 _redis_client = None
 
@@ -23,12 +24,16 @@ def mark_game_connection_active(
         return
 
     ttl_seconds = _presence_ttl_seconds()
-    expires_at = time.time() + ttl_seconds
+    now = time.time()
     key = _presence_key(game_id=game_id, user_id=user_id, side=side)
 
+    # One round-trip: prune expired connections, upsert this one, extend the key.
     try:
-        client.zadd(key, {channel_name: expires_at})
-        client.expire(key, ttl_seconds * 2)
+        pipe = client.pipeline(transaction=False)
+        pipe.zremrangebyscore(key, "-inf", now)
+        pipe.zadd(key, {channel_name: now + ttl_seconds})
+        pipe.expire(key, ttl_seconds * 2)
+        pipe.execute()
     except Exception as exc:
         logger.warning("Failed to mark game presence for %s: %s", key, exc)
 
@@ -48,6 +53,18 @@ def refresh_game_connection_presence(
     )
 
 
+def presence_refresh_due(last_refreshed_at: float | None, now: float) -> bool:
+    """
+    Whether a connection's heartbeat should rewrite its presence entry.
+
+    Heartbeats are coalesced per connection to one write per refresh interval;
+    ``last_refreshed_at`` and ``now`` are ``time.monotonic()`` readings.
+    """
+    if last_refreshed_at is None:
+        return True
+    return now - last_refreshed_at >= _presence_refresh_interval_seconds()
+
+
 def clear_game_connection_presence(
     *,
     game_id: int | str,
@@ -73,16 +90,42 @@ def is_user_live_in_game(*, game_id: int | str, user_id: int, side: str) -> bool
         return False
 
     key = _presence_key(game_id=game_id, user_id=user_id, side=side)
-    now = time.time()
 
+    # Expired members are ignored rather than pruned, so this is one command;
+    # pruning happens on the next heartbeat write.
     try:
-        client.zremrangebyscore(key, "-inf", now)
-        return client.zcard(key) > 0
+        return client.zcount(key, f"({time.time()}", "+inf") > 0
     except Exception as exc:
         logger.warning("Failed to check game presence for %s: %s", key, exc)
         return False
 
 
+def live_users_in_games(entries) -> set[tuple]:
+    """
+    Bulk presence check for ``(game_id, user_id, side)`` entries.
+
+    Returns the subset of entries with a live connection, using a single
+    pipelined round-trip however many entries are checked.
+    """
+    entries = list(entries)
+    client = _get_redis_client()
+    if client is None or not entries:
+        return set()
+
+    score_min = f"({time.time()}"
+    try:
+        pipe = client.pipeline(transaction=False)
+        for game_id, user_id, side in entries:
+            key = _presence_key(game_id=game_id, user_id=user_id, side=side)
+            pipe.zcount(key, score_min, "+inf")
+        counts = pipe.execute()
+    except Exception as exc:
+        logger.warning("Failed to check presence for %s games: %s", len(entries), exc)
+        return set()
+
+    return {entry for entry, count in zip(entries, counts) if count > 0}
+
+
 def _presence_key(*, game_id: int | str, user_id: int, side: str) -> str:
     prefix = getattr(settings, "GAMEPLAY_PRESENCE_KEY_PREFIX", "drawtwo:presence")
     return f"{prefix}:game:{game_id}:user:{user_id}:side:{side}"
@@ -98,6 +141,19 @@ def _presence_ttl_seconds() -> int:
     )
 
 
+def _presence_refresh_interval_seconds() -> float:
+    # Longer than the 30s client ping period so every other ping is skipped,
+    # yet short enough that entries are rewritten every two ping periods,
+    # leaving room in the TTL for one late ping.
+    return float(
+        getattr(
+            settings,
+            "GAMEPLAY_PRESENCE_REFRESH_INTERVAL_SECONDS",
+            DEFAULT_GAME_PRESENCE_REFRESH_INTERVAL_SECONDS,
+        )
+    )
+
+
 def _get_redis_client():
     global _redis_client
 
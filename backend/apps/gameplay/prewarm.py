@@ -0,0 +1,262 @@
+"""
+Pre-warmed game pools for PvE and scenario games.
+
+Starting a game builds its state, inserts the ``Game`` and ``GameLoadout``
+rows and waits for the opening step. Both start paths are kept ready in small
+per-key pools that a background task refills:
+
+- ``PrewarmedPveGame`` rows hold a not-yet-started game with only the AI
+  deck seated, per side of each popular AI deck. ``create_game`` claims one,
+  seats the player's deck on the other side and runs the opening step in the
+  request.
+- ``PrewarmedScenarioGame`` rows hold complete, not-yet-started scenario
+  games, whose opening step also runs on claim.
+
+Claims lock with ``skip_locked`` and delete the row in the caller's
+transaction, so concurrent requests never share an entry and a failed game
+creation puts it back. Entries built against an older deck revision, title
+content version or ruleset are never claimed and are pruned on refill.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.gameplay.models import Game, PrewarmedPveGame, PrewarmedScenarioGame
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREWARM_POOL_SIZE = 0
+DEFAULT_PREWARM_POPULAR_DECKS = 20
+POPULAR_DECK_WINDOW = timedelta(days=1)
+SIDES = ("side_a", "side_b")
+
+
+def prewarm_pool_size() -> int:
+    return max(
+        int(getattr(settings, "GAMEPLAY_PREWARM_POOL_SIZE", DEFAULT_PREWARM_POOL_SIZE)),
+        0,
+    )
+
+
+def _claimed(game: Game) -> Game:
+    # Time the game from the claim, not from when it was pre-built.
+    game.created_at = timezone.now()
+    Game.objects.filter(pk=game.pk).update(created_at=game.created_at)
+    return game
+
+
+def claim_prewarmed_pve_game(
+    ai_deck, ai_side: str, revision, ruleset_id: str
+) -> Game | None:
+    """Claim a game seating ``ai_deck`` on ``ai_side``; must run in a transaction."""
+    if not prewarm_pool_size():
+        return None
+
+    entry = (
+        PrewarmedPveGame.objects.select_for_update(skip_locked=True)
+        .filter(
+            ai_deck=ai_deck,
+            ai_side=ai_side,
+            revision=revision,
+            content_version=ai_deck.title.content_version,
+            ruleset_id=ruleset_id,
+        )
+        .select_related("game")
+        .order_by("pk")
+        .first()
+    )
+    if entry is None:
+        return None
+    game = entry.game
+    entry.delete()
+    return _claimed(game)
+
+
+def build_prewarmed_pve_game(ai_deck, ai_side: str, revision) -> Game:
+    """Create a not-yet-started PvE game with only ``ai_deck`` seated."""
+    from apps.builder.schemas import TitleConfig
+    from apps.gameplay.agents.ruleset import get_ruleset_id
+    from apps.gameplay.card_cache import get_title_card_catalog
+    from apps.gameplay.services import GameService
+
+    game_state = GameService._new_game_state(
+        TitleConfig.model_validate(ai_deck.title.config)
+    )
+    GameService._seat_deck(
+        game_state, ai_side, ai_deck, get_title_card_catalog(ai_deck.title)
+    )
+    # The player's side holds the AI deck until a claim seats the player's.
+    game = Game.objects.create(
+        status=Game.GAME_STATUS_INIT,
+        type=Game.GAME_TYPE_PVE,
+        side_a=ai_deck,
+        side_b=ai_deck,
+        state=game_state.model_dump(),
+        ruleset_id=get_ruleset_id(ai_deck.title),
+    )
+    GameService._game_loadout(game, ai_side, ai_deck, revision).save()
+    return game
+
+
+def popular_pve_decks(limit: int):
+    """AI decks with the most PvE games started recently."""
+    from apps.collection.models import Deck
+
+    since = timezone.now() - POPULAR_DECK_WINDOW
+    # Games still in INIT include the pooled ones, which would feed back into
+    # their own deck's popularity.
+    started = [Game.GAME_STATUS_IN_PROGRESS, Game.GAME_STATUS_ENDED]
+    return list(
+        Deck.objects.active()
+        .filter(ai_player__isnull=False)
+        .select_related("title", "hero")
+        .annotate(
+            recent_games=Count(
+                "games_as_side_a",
+                filter=Q(
+                    games_as_side_a__type=Game.GAME_TYPE_PVE,
+                    games_as_side_a__status__in=started,
+                    games_as_side_a__created_at__gte=since,
+                ),
+                distinct=True,
+            )
+            + Count(
+                "games_as_side_b",
+                filter=Q(
+                    games_as_side_b__type=Game.GAME_TYPE_PVE,
+                    games_as_side_b__status__in=started,
+                    games_as_side_b__created_at__gte=since,
+                ),
+                distinct=True,
+            )
+        )
+        .filter(recent_games__gt=0)
+        .order_by("-recent_games", "pk")[:limit]
+    )
+
+
+def _delete_pooled_games(entries) -> None:
+    Game.objects.filter(
+        pk__in=entries.values("game_id"), status=Game.GAME_STATUS_INIT
+    ).delete()
+
+
+def refill_pve_games(ai_deck, *, size: int) -> int:
+    """Top up both sides of ``ai_deck`` to ``size`` current games."""
+    from apps.collection.compositions import ensure_deck_revision
+    from apps.collection.validation import validate_deck_for_play
+    from apps.gameplay.agents.ruleset import get_ruleset_id
+
+    revision, _ = ensure_deck_revision(ai_deck, source="game")
+    entries = PrewarmedPveGame.objects.filter(ai_deck=ai_deck)
+    _delete_pooled_games(
+        entries.exclude(
+            revision=revision,
+            content_version=ai_deck.title.content_version,
+            ruleset_id=get_ruleset_id(ai_deck.title),
+        )
+    )
+    if validate_deck_for_play(ai_deck):
+        _delete_pooled_games(entries)
+        return 0
+
+    counts = dict(entries.values_list("ai_side").annotate(entries=Count("id")))
+    created = 0
+    for side in SIDES:
+        for _ in range(size - counts.get(side, 0)):
+            with transaction.atomic():
+                game = build_prewarmed_pve_game(ai_deck, side, revision)
+                PrewarmedPveGame.objects.create(
+                    ai_deck=ai_deck,
+                    ai_side=side,
+                    revision=revision,
+                    content_version=ai_deck.title.content_version,
+                    ruleset_id=game.ruleset_id,
+                    game=game,
+                )
+            created += 1
+    return created
+
+
+def claim_prewarmed_scenario_game(scenario_slug: str, ruleset_id: str) -> Game | None:
+    """Claim a ready scenario game; must run inside the caller's transaction."""
+    if not prewarm_pool_size():
+        return None
+
+    entry = (
+        PrewarmedScenarioGame.objects.select_for_update(skip_locked=True)
+        .filter(scenario_slug=scenario_slug, ruleset_id=ruleset_id)
+        .select_related("game")
+        .order_by("pk")
+        .first()
+    )
+    if entry is None:
+        return None
+    game = entry.game
+    entry.delete()
+    return _claimed(game)
+
+
+def refill_scenario_games(scenario_slug: str, *, size: int) -> int:
+    from apps.gameplay.agents.ruleset import get_ruleset_id
+    from apps.gameplay.scenarios import ScenarioGameService
+
+    scenario = ScenarioGameService.load_manifest(scenario_slug)
+    ruleset_id = get_ruleset_id(ScenarioGameService._get_title(scenario.title))
+
+    _delete_pooled_games(
+        PrewarmedScenarioGame.objects.filter(scenario_slug=scenario_slug).exclude(
+            ruleset_id=ruleset_id
+        )
+    )
+
+    missing = (
+        size - PrewarmedScenarioGame.objects.filter(scenario_slug=scenario_slug).count()
+    )
+    for _ in range(missing):
+        with transaction.atomic():
+            game = ScenarioGameService._create_game(scenario)
+            PrewarmedScenarioGame.objects.create(
+                scenario_slug=scenario_slug,
+                ruleset_id=game.ruleset_id,
+                game=game,
+            )
+    return max(missing, 0)
+
+
+def refill_prewarmed_pools() -> int:
+    """Refill every pool; returns the number of entries created."""
+    size = prewarm_pool_size()
+    if not size:
+        return 0
+
+    created = 0
+    decks = popular_pve_decks(
+        int(
+            getattr(
+                settings,
+                "GAMEPLAY_PREWARM_POPULAR_DECKS",
+                DEFAULT_PREWARM_POPULAR_DECKS,
+            )
+        )
+    )
+    # Decks that dropped out of the popular set stop holding pooled games.
+    _delete_pooled_games(PrewarmedPveGame.objects.exclude(ai_deck__in=decks))
+    for deck in decks:
+        try:
+            created += refill_pve_games(deck, size=size)
+        except Exception:
+            logger.exception(f"Could not pre-warm PvE games for deck {deck.id}")
+
+    for scenario_slug in getattr(settings, "GAMEPLAY_PREWARM_SCENARIOS", []):
+        try:
+            created += refill_scenario_games(scenario_slug, size=size)
+        except Exception:
+            logger.exception(f"Could not pre-warm scenario {scenario_slug}")
+
+    return created
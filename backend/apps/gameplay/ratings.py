@@ -0,0 +1,161 @@
+"""
+ELO rating ledger.
+
+``ELORatingChange`` rows are the ledger: one append-only entry per rated game
+holding both players' before/after ratings. ``UserTitleRating.elo_rating`` is
+the folded current value of that ledger.
+
+Every writer locks the rating rows it touches with ``select_for_update`` in
+primary-key order, so concurrent game endings that share a player serialize
+on that player's row instead of overwriting each other, and can never
+deadlock. Replays lock only the rating rows of the ladder being rebuilt.
+"""
+
+import logging
+
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ELO_RATING = 1200
+
+
+def lock_ratings(title_id, ladder_type: str, user_ids) -> dict:
+    """
+    Lock (creating if needed) rating rows for ``user_ids`` in primary-key order.
+
+    Must be called inside a transaction. Returns ratings keyed by user id.
+    """
+    from apps.gameplay.models import UserTitleRating
+
+    user_ids = sorted(set(user_ids))
+    for user_id in user_ids:
+        UserTitleRating.objects.get_or_create(
+            user_id=user_id,
+            title_id=title_id,
+            ladder_type=ladder_type,
+            defaults={"elo_rating": DEFAULT_ELO_RATING},
+        )
+
+    ratings = (
+        UserTitleRating.objects.select_for_update()
+        .filter(title_id=title_id, ladder_type=ladder_type, user_id__in=user_ids)
+        .order_by("pk")
+    )
+    return {rating.user_id: rating for rating in ratings}
+
+
+def apply_rating_change(game, winner_user, loser_user, ladder_type: str):
+    """
+    Append the ledger entry for a rated game and fold it into both ratings.
+
+    Returns the ``ELORatingChange``, or ``None`` if the game was already rated.
+    """
+    from apps.gameplay.elo import ELOCalculator
+    from apps.gameplay.models import ELORatingChange
+
+    with transaction.atomic():
+        ratings = lock_ratings(
+            game.title_id, ladder_type, [winner_user.id, loser_user.id]
+        )
+
+        # Checked under the rating locks so a concurrent retry of the same
+        # game ending cannot apply the change twice.
+        if ELORatingChange.objects.filter(game=game).exists():
+            logger.info(f"ELO change already exists for game {game.id}")
+            return None
+
+        winner_rating = ratings[winner_user.id]
+        loser_rating = ratings[loser_user.id]
+        winner_old_rating = winner_rating.elo_rating
+        loser_old_rating = loser_rating.elo_rating
+        winner_new_rating, loser_new_rating = ELOCalculator.calculate_new_ratings(
+            winner_old_rating, loser_old_rating
+        )
+
+        winner_rating.elo_rating = winner_new_rating
+        loser_rating.elo_rating = loser_new_rating
+        for rating in sorted((winner_rating, loser_rating), key=lambda r: r.pk):
+            rating.save(update_fields=["elo_rating"])
+
+        return ELORatingChange.objects.create(
+            game=game,
+            title_id=game.title_id,
+            ladder_type=ladder_type,
+            winner=winner_user,
+            winner_old_rating=winner_old_rating,
+            winner_new_rating=winner_new_rating,
+            winner_rating_change=winner_new_rating - winner_old_rating,
+            loser=loser_user,
+            loser_old_rating=loser_old_rating,
+            loser_new_rating=loser_new_rating,
+            loser_rating_change=loser_new_rating - loser_old_rating,
+        )
+
+
+def replay_ratings(title, ladder_type: str) -> int:
+    """
+    Rebuild one ladder's ratings by replaying its ledger in order.
+
+    Every player starts from the default rating, so removing a disputed entry
+    and replaying recomputes all later entries and current ratings. Only the
+    ladder's rating rows are locked. Returns the number of entries replayed.
+    """
+    from apps.gameplay.elo import ELOCalculator
+    from apps.gameplay.models import ELORatingChange, UserTitleRating
+
+    with transaction.atomic():
+        ledger = list(
+            ELORatingChange.objects.filter(
+                title=title, ladder_type=ladder_type
+            ).order_by("created_at", "id")
+        )
+        user_ids = {change.winner_id for change in ledger}
+        user_ids.update(change.loser_id for change in ledger)
+        user_ids.update(
+            UserTitleRating.objects.filter(
+                title=title, ladder_type=ladder_type
+            ).values_list("user_id", flat=True)
+        )
+        ratings = lock_ratings(title.id, ladder_type, user_ids)
+
+        current = {user_id: DEFAULT_ELO_RATING for user_id in ratings}
+        for change in ledger:
+            winner_old_rating = current[change.winner_id]
+            loser_old_rating = current[change.loser_id]
+            winner_new_rating, loser_new_rating = ELOCalculator.calculate_new_ratings(
+                winner_old_rating, loser_old_rating
+            )
+            change.winner_old_rating = winner_old_rating
+            change.winner_new_rating = winner_new_rating
+            change.winner_rating_change = winner_new_rating - winner_old_rating
+            change.loser_old_rating = loser_old_rating
+            change.loser_new_rating = loser_new_rating
+            change.loser_rating_change = loser_new_rating - loser_old_rating
+            current[change.winner_id] = winner_new_rating
+            current[change.loser_id] = loser_new_rating
+
+        ELORatingChange.objects.bulk_update(
+            ledger,
+            [
+                "winner_old_rating",
+                "winner_new_rating",
+                "winner_rating_change",
+                "loser_old_rating",
+                "loser_new_rating",
+                "loser_rating_change",
+            ],
+            batch_size=500,
+        )
+        for user_id, rating in ratings.items():
+            rating.elo_rating = current[user_id]
+        UserTitleRating.objects.bulk_update(
+            sorted(ratings.values(), key=lambda r: r.pk),
+            ["elo_rating"],
+            batch_size=500,
+        )
+
+    logger.info(
+        f"Replayed {len(ledger)} ELO ledger entries for {title.slug} ({ladder_type})"
+    )
+    return len(ledger)
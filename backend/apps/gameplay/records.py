@@ -0,0 +1,306 @@
+"""
+Materialized game records: per-user ranked ladder records and per-composition
+matchup rollups.
+
+Ladder records live on ``UserTitleRating`` next to the rating they belong to,
+so profile and history views read a player's ladder record from a single row
+instead of scanning every game they ever finished. Composition rollups live on
+``CompositionMatchupRecord`` so composition stats read a handful of counter
+rows instead of every captured loadout.
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Coalesce, Least
+
+from apps.gameplay.ratings import lock_ratings
+
+logger = logging.getLogger(__name__)
+
+
+def ladder_record_counts(title, user, ladder_type: str) -> dict:
+    """
+    Compute a user's ranked record for one ladder straight from ``Game`` rows.
+
+    One conditional aggregate query; used to rebuild the materialized record.
+    """
+    from apps.gameplay.models import Game
+
+    is_side_a = Q(player_a_user=user)
+    won = (is_side_a & Q(winner=F("side_a"))) | (~is_side_a & Q(winner=F("side_b")))
+
+    return (
+        Game.objects.for_title(title)
+        .for_user(user)
+        .filter(
+            status=Game.GAME_STATUS_ENDED,
+            type=Game.GAME_TYPE_RANKED,
+            ladder_type=ladder_type,
+        )
+        .aggregate(
+            games_played=Count("id"),
+            wins=Count("id", filter=won),
+            losses=Count("id", filter=Q(winner__isnull=False) & ~won),
+        )
+    )
+
+
+def record_game_result(game) -> None:
+    """
+    Add a finished ranked game to both players' ladder records.
+
+    Counters are incremented with ``F()`` expressions so concurrent game
+    endings for the same player cannot overwrite each other.
+    """
+    from apps.gameplay.models import Game, UserTitleRating
+
+    if game.type != Game.GAME_TYPE_RANKED or game.status != Game.GAME_STATUS_ENDED:
+        return
+    if not game.ladder_type:
+        return
+
+    participants = (
+        (game.player_a_user_id, game.side_a_id),
+        (game.player_b_user_id, game.side_b_id),
+    )
+    counters_by_user = {}
+
+    for user_id, deck_id in participants:
+        if not user_id or user_id in counters_by_user:
+            continue
+
+        counters = {"games_played": F("games_played") + 1}
+        if game.winner_id == deck_id:
+            counters["wins"] = F("wins") + 1
+        elif game.winner_id is not None:
+            counters["losses"] = F("losses") + 1
+        counters_by_user[user_id] = counters
+
+    with transaction.atomic():
+        # Same lock order as rating changes, so the two never deadlock.
+        ratings = lock_ratings(game.title_id, game.ladder_type, counters_by_user)
+        for rating in sorted(ratings.values(), key=lambda r: r.pk):
+            UserTitleRating.objects.filter(pk=rating.pk).update(
+                **counters_by_user[rating.user_id]
+            )
+
+
+def rebuild_ladder_records(title=None) -> int:
+    """
+    Recompute materialized ladder records from game history.
+
+    Covers every user with a rating row or a finished ranked game. Returns the
+    number of records written.
+    """
+    from apps.authentication.models import User
+    from apps.builder.models import Title
+    from apps.gameplay.models import Game, UserTitleRating
+
+    ranked_games = Game.objects.filter(
+        status=Game.GAME_STATUS_ENDED,
+        type=Game.GAME_TYPE_RANKED,
+    )
+    ratings = UserTitleRating.objects.all()
+    if title is not None:
+        ranked_games = ranked_games.filter(title=title)
+        ratings = ratings.filter(title=title)
+
+    keys = set(ratings.values_list("user_id", "title_id", "ladder_type"))
+    for user_field in ("player_a_user_id", "player_b_user_id"):
+        keys.update(
+            ranked_games.filter(
+                **{f"{user_field}__isnull": False},
+                ladder_type__isnull=False,
+            )
+            .values_list(user_field, "title_id", "ladder_type")
+            .distinct()
+        )
+
+    titles = Title.objects.in_bulk({title_id for _, title_id, _ in keys})
+    users = User.objects.in_bulk({user_id for user_id, _, _ in keys})
+
+    written = 0
+    for user_id, title_id, ladder_type in sorted(keys):
+        counts = ladder_record_counts(titles[title_id], users[user_id], ladder_type)
+        UserTitleRating.objects.update_or_create(
+            user_id=user_id,
+            title_id=title_id,
+            ladder_type=ladder_type,
+            defaults=counts,
+        )
+        written += 1
+
+    logger.info("Rebuilt %s ladder records", written)
+    return written
+
+
+def composition_result_for_side(game, side: str, winner_side: str | None = None) -> str:
+    """Return wins/losses/draws for one captured side of a finished game."""
+    from apps.gameplay.models import GameLoadout
+
+    sides = {GameLoadout.SIDE_A, GameLoadout.SIDE_B}
+    if winner_side is None:
+        winner_side = (game.state or {}).get("winner")
+
+    # Every normally completed captured game has winner side in state. Keep the
+    # FK fallback for tests and manually finalized games, while avoiding a guess
+    # if both sides somehow point to the same source deck.
+    if winner_side not in sides and game.winner_id:
+        if game.side_a_id != game.side_b_id:
+            if game.winner_id == game.side_a_id:
+                winner_side = GameLoadout.SIDE_A
+            elif game.winner_id == game.side_b_id:
+                winner_side = GameLoadout.SIDE_B
+
+    if winner_side == side:
+        return "wins"
+    if winner_side in sides:
+        return "losses"
+    return "draws"
+
+
+def _composition_matchup_keys(game, loadouts, winner_side=None):
+    """
+    Yield (key, names, result, counters) for each captured side of ``game``.
+
+    ``counters`` holds the capture counters the side adds to its row: the
+    game is only counted once per composition, on its first captured side.
+    """
+    by_side = {loadout.side: loadout for loadout in loadouts}
+    counted_compositions = set()
+    for loadout in sorted(loadouts, key=lambda item: item.side):
+        opposing = next(
+            (item for side, item in by_side.items() if side != loadout.side),
+            None,
+        )
+        key = (
+            loadout.composition_id,
+            game.title_id,
+            game.type,
+            loadout.hero_slug,
+            opposing.hero_slug if opposing is not None else "",
+        )
+        names = {
+            "hero_name": loadout.hero_name,
+            "opponent_hero_name": opposing.hero_name if opposing is not None else "",
+        }
+        counters = {"first_captured_at": loadout.created_at, "captured_games": 0}
+        if loadout.composition_id not in counted_compositions:
+            counted_compositions.add(loadout.composition_id)
+            counters["captured_games"] = 1
+        yield (
+            key,
+            names,
+            composition_result_for_side(game, loadout.side, winner_side),
+            counters,
+        )
+
+
+def record_composition_results(game, winner_side: str | None = None) -> None:
+    """
+    Add a finished game to the composition matchup rollup.
+
+    One row per (composition, title, game type, hero, opposing hero) holds
+    win/loss/draw counters, incremented with ``F()`` so concurrent endings of
+    games sharing a composition cannot lose updates.
+    """
+    from apps.gameplay.models import CompositionMatchupRecord, Game
+
+    if game.status != Game.GAME_STATUS_ENDED:
+        return
+    if game.type not in {Game.GAME_TYPE_RANKED, Game.GAME_TYPE_FRIENDLY}:
+        return
+
+    loadouts = list(game.loadouts.all())
+    for key, names, result, counters in _composition_matchup_keys(
+        game, loadouts, winner_side
+    ):
+        composition_id, title_id, game_type, hero_slug, opponent_hero_slug = key
+        record, _ = CompositionMatchupRecord.objects.get_or_create(
+            composition_id=composition_id,
+            title_id=title_id,
+            game_type=game_type,
+            hero_slug=hero_slug,
+            opponent_hero_slug=opponent_hero_slug,
+            defaults=names,
+        )
+        captured_at = Value(counters["first_captured_at"])
+        CompositionMatchupRecord.objects.filter(pk=record.pk).update(
+            **{result: F(result) + 1},
+            captured_games=F("captured_games") + counters["captured_games"],
+            first_captured_at=Least(
+                Coalesce("first_captured_at", captured_at), captured_at
+            ),
+            **names,
+        )
+
+
+def rebuild_composition_records(title=None) -> int:
+    """
+    Recompute the composition matchup rollup from captured game loadouts.
+
+    Existing rows in scope are replaced. Returns the number of rows written.
+    """
+    from apps.gameplay.models import CompositionMatchupRecord, Game
+
+    games = Game.objects.filter(
+        status=Game.GAME_STATUS_ENDED,
+        type__in=[Game.GAME_TYPE_RANKED, Game.GAME_TYPE_FRIENDLY],
+        loadouts__isnull=False,
+    ).distinct()
+    records = CompositionMatchupRecord.objects.all()
+    if title is not None:
+        games = games.filter(title=title)
+        records = records.filter(title=title)
+
+    rows = {}
+    for game in (
+        games.prefetch_related("loadouts").order_by("id").iterator(chunk_size=500)
+    ):
+        for key, names, result, counters in _composition_matchup_keys(
+            game, list(game.loadouts.all())
+        ):
+            row = rows.setdefault(
+                key,
+                {
+                    "wins": 0,
+                    "losses": 0,
+                    "draws": 0,
+                    "captured_games": 0,
+                    "first_captured_at": counters["first_captured_at"],
+                },
+            )
+            row.update(names)
+            row[result] += 1
+            row["captured_games"] += counters["captured_games"]
+            row["first_captured_at"] = min(
+                row["first_captured_at"], counters["first_captured_at"]
+            )
+
+    with transaction.atomic():
+        records.delete()
+        CompositionMatchupRecord.objects.bulk_create(
+            [
+                CompositionMatchupRecord(
+                    composition_id=composition_id,
+                    title_id=title_id,
+                    game_type=game_type,
+                    hero_slug=hero_slug,
+                    opponent_hero_slug=opponent_hero_slug,
+                    **row,
+                )
+                for (
+                    composition_id,
+                    title_id,
+                    game_type,
+                    hero_slug,
+                    opponent_hero_slug,
+                ), row in rows.items()
+            ],
+            batch_size=500,
+        )
+
+    logger.info("Rebuilt %s composition matchup records", len(rows))
+    return len(rows)
@@ -78,13 +78,33 @@ class ScenarioGameService:
     @transaction.atomic
     def start_scenario(slug: str) -> tuple[Game, str]:
         scenario = ScenarioGameService.load_manifest(slug)
-        game = ScenarioGameService._create_game(scenario)
+        game = ScenarioGameService._claim_prewarmed_game(scenario)
+        if game is None:
+            game = ScenarioGameService._create_game(scenario)
+        else:
+            # A claimed game is already built, so its opening step runs here
+            # and the first frame does not wait on Celery.
+            GameService._step_inline(game.id)
+            game.refresh_from_db()
         token = game.issue_guest_access_token(
             scenario.viewer_side,
             ttl=timedelta(minutes=scenario.guest_token_ttl_minutes),
         )
         return game, token
 
+    @staticmethod
+    def _claim_prewarmed_game(scenario: ScenarioManifest) -> Game | None:
+        from apps.gameplay.agents.ruleset import get_ruleset_id
+        from apps.gameplay.prewarm import (
+            claim_prewarmed_scenario_game,
+            prewarm_pool_size,
+        )
+
+        if not prewarm_pool_size():
+            return None
+        title = ScenarioGameService._get_title(scenario.title)
+        return claim_prewarmed_scenario_game(scenario.slug, get_ruleset_id(title))
+
     @staticmethod
     def _create_game(scenario: ScenarioManifest) -> Game:
         title = ScenarioGameService._get_title(scenario.title)
@@ -137,7 +157,7 @@ class ScenarioGameService:
             rng_seed=f"scenario:{scenario.slug}:{uuid.uuid4().hex}",
         )
 
-        from apps.gameplay.agents.ruleset import compute_ruleset_id
+        from apps.gameplay.agents.ruleset import get_ruleset_id
 
         game = Game.objects.create(
             status=Game.GAME_STATUS_INIT,
@@ -146,7 +166,7 @@ class ScenarioGameService:
             side_a=system_decks["side_a"],
             side_b=system_decks["side_b"],
             state=game_state.model_dump(),
-            ruleset_id=compute_ruleset_id(title),
+            ruleset_id=get_ruleset_id(title),
         )
         game.enqueue([NewPhaseEffect(side="side_a", phase="start")], trigger=False)
         return game
@@ -1,18 +1,17 @@
-import hashlib
 import logging
 import math
 import random
+import time
 import traceback
 import uuid
 from datetime import timedelta
+from typing import NamedTuple
 
 from django.conf import settings
 from django.db import DatabaseError, transaction
 from django.db.models import Q
 from pydantic import TypeAdapter, ValidationError
 
-logger = logging.getLogger(__name__)
-
 from apps.builder.models import CardTemplate, Title
 from apps.builder.schemas import (
     Action,
@@ -23,14 +22,13 @@ from apps.builder.schemas import (
     DrawAction,
     EventValue,
     HealAction,
-    HeroPower,
     RemoveAction,
     SilenceAction,
     SummonAction,
     TempManaBoostAction,
     TitleConfig,
 )
-from apps.collection.compositions import ensure_deck_revision
+from apps.collection.compositions import cached_deck_revision, ensure_deck_revision
 from apps.collection.models import Deck
 from apps.collection.validation import (
     DeckValidationError,
@@ -38,10 +36,21 @@ from apps.collection.validation import (
     validate_deck_for_play_or_raise,
 )
 from apps.core.card_assets import get_hero_art_url
-from apps.core.serializers import serialize_cards_with_traits, to_card_schema
+from apps.core.serializers import serialize_cards_with_traits
+from apps.gameplay import instrumentation, state_cache
+from apps.gameplay.card_cache import (
+    card_summon_targets,
+    get_title_card_catalog,
+    hero_summon_targets,
+    summonable_template,
+)
 from apps.gameplay.engine.dispatcher import resolve
 from apps.gameplay.models import Game, GameLoadout, PlayerNotification
-from apps.gameplay.notifications import send_game_updates_to_clients
+from apps.gameplay.notifications import (
+    coalesced_broadcasts,
+    send_game_updates_to_clients,
+)
+from apps.gameplay.records import record_composition_results, record_game_result
 from apps.gameplay.schemas.commands import (
     AttackCommand,
     Command,
@@ -81,10 +90,27 @@ from apps.gameplay.schemas.events import (
 )
 from apps.gameplay.schemas.game import CardInPlay, GameState, HeroInPlay
 
+logger = logging.getLogger(__name__)
+
 # Moved to avoid circular import - imported where needed
 
 DEFAULT_STEP_DELAY_SECONDS = 0.1
+COMMAND_EXECUTION_CELERY = "celery"
+COMMAND_EXECUTION_INLINE = "inline"
+DEFAULT_COMMAND_EXECUTION = COMMAND_EXECUTION_CELERY
+DEFAULT_INLINE_STEP_BUDGET_MS = 50
 DEFAULT_AI_COMMAND_DELAY_SECONDS = 1.0
+AI_EXECUTION_STEP = "step"
+AI_EXECUTION_TASK = "task"
+DEFAULT_AI_EXECUTION = AI_EXECUTION_STEP
+DEFAULT_AI_TASK_BUDGET_MS = 1000
+DEFAULT_TURN_EXPIRY_WAKEUP_HORIZON_SECONDS = 15 * 60
+EXPIRED_TURN_BATCH_SIZE = 50
+
+
+class StepContinuation(NamedTuple):
+    delay_seconds: float
+    ai_command: bool
 
 
 class GameService:
@@ -190,6 +216,54 @@ class GameService:
             ) from exc
         return max(size, 0)
 
+    @staticmethod
+    def _deck_cards_in_draw_order(deck, catalog) -> tuple[list[Card], bool]:
+        """
+        Return a deck's cards for a new game and whether they need shuffling.
+
+        Ordered AI decks keep their scripted draw order; every other deck is
+        expanded from its card copies and shuffled by the caller.
+        """
+        ordered_card_ids = GameService._ordered_ai_deck_card_ids(deck)
+        if ordered_card_ids is not None:
+            missing_ids = sorted(set(ordered_card_ids) - set(catalog.cards_by_id))
+            if missing_ids:
+                raise DeckValidationError(
+                    f'AI deck "{deck.name}" references missing cards in its '
+                    f"draw order: {', '.join(map(str, missing_ids))}"
+                )
+            return [catalog.cards_by_id[card_id] for card_id in ordered_card_ids], False
+
+        deck_card_copies = {
+            card_copy.card_id: card_copy.count for card_copy in deck.deckcard_set.all()
+        }
+        cards_by_id = {
+            card_id: catalog.cards_by_id[card_id]
+            for card_id in deck_card_copies
+            if card_id in catalog.cards_by_id
+        }
+        uncached_ids = set(deck_card_copies) - set(cards_by_id)
+        if uncached_ids:
+            for card in serialize_cards_with_traits(
+                CardTemplate.objects.filter(id__in=uncached_ids)
+            ):
+                cards_by_id[card.id] = card
+        cards = [
+            cards_by_id[card_id]
+            for card_id, count in deck_card_copies.items()
+            for _ in range(count)
+        ]
+        return cards, True
+
+    @staticmethod
+    def _game_deck_revision(deck):
+        if deck.ai_player_id is not None:
+            revision = cached_deck_revision(deck)
+            if revision is not None:
+                return revision
+        revision, _ = ensure_deck_revision(deck, source="game")
+        return revision
+
     @staticmethod
     @transaction.atomic
     def create_game(
@@ -197,21 +271,33 @@ class GameService:
         deck_b,
         randomize_starting_player: bool = False,
         reuse_active_game: bool = True,
+        prewarmed: bool = False,
     ) -> Game:
         # A game must copy cards and capture attribution from the same locked deck
         # state. Lock in primary-key order so concurrent game creation and deck
-        # edits cannot observe two different versions of a deck.
+        # edits cannot observe two different versions of a deck. AI decks are
+        # shared by every PvE game against them and are edited only through
+        # content tooling, so they are read without a lock to keep popular
+        # opponents from serializing game creation. Their revision is trusted
+        # only while the shared card-count digest, dropped whenever their
+        # cards change, still matches it.
         deck_ids = {deck_a.pk, deck_b.pk}
-        locked_decks = {
+        decks = {
             deck.pk: deck
-            for deck in Deck.objects.select_for_update()
-            .filter(pk__in=deck_ids)
+            for deck in Deck.objects.select_related("title", "hero")
+            .filter(pk__in=deck_ids, ai_player__isnull=False)
             .order_by("pk")
         }
-        if len(locked_decks) != len(deck_ids):
+        decks.update(
+            (deck.pk, deck)
+            for deck in Deck.objects.select_for_update()
+            .filter(pk__in=deck_ids - set(decks))
+            .order_by("pk")
+        )
+        if len(decks) != len(deck_ids):
             raise DeckValidationError("One or both decks no longer exist")
-        deck_a = locked_decks[deck_a.pk]
-        deck_b = locked_decks[deck_b.pk]
+        deck_a = decks[deck_a.pk]
+        deck_b = decks[deck_b.pk]
 
         if deck_a.title_id != deck_b.title_id:
             raise DeckValidationError("Both decks must be from the same title")
@@ -233,257 +319,244 @@ class GameService:
             if existing_game:
                 return existing_game
 
-        # Load world config
-        config = TitleConfig.model_validate(deck_a.title.config)
-        rng_seed = uuid.uuid4().hex
-        rng_counter = 0
+        if prewarmed and deck_a.is_ai_deck != deck_b.is_ai_deck:
+            game = GameService._claim_prewarmed_pve_game(
+                deck_a, deck_b, randomize_starting_player
+            )
+            if game is not None:
+                return game
 
-        def creation_rng(purpose: str) -> random.Random:
-            nonlocal rng_counter
-            material = f"{rng_seed}:{rng_counter}:{purpose}"
-            digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
-            rng_counter += 1
-            return random.Random(int(digest, 16))
+        # Load world config
+        game_state = GameService._new_game_state(
+            TitleConfig.model_validate(deck_a.title.config)
+        )
 
         # Optionally randomize which deck goes first (50/50 chance)
         # By default, deck_a always goes first for deterministic behavior
         # This allows for future enhancements like alternating starts between same players
-        if randomize_starting_player and creation_rng("starting_player").random() < 0.5:
+        if (
+            randomize_starting_player
+            and game_state.next_rng("starting_player").random() < 0.5
+        ):
             # Swap the decks so deck_b starts
             deck_a, deck_b = deck_b, deck_a
 
-        revision_a, _ = ensure_deck_revision(deck_a, source="game")
-        revision_b, _ = ensure_deck_revision(deck_b, source="game")
+        revision_a = GameService._game_deck_revision(deck_a)
+        revision_b = GameService._game_deck_revision(deck_b)
 
-        card_id = 0
-        cards_in_play = {}
-        decks = {"side_a": [], "side_b": []}
+        # Card schemas, summon targets and summonable templates come from the
+        # title's cached card catalog; only cards that are no longer the latest
+        # version of their template are read from the database.
+        catalog = get_title_card_catalog(deck_a.title)
+        GameService._seat_deck(game_state, "side_a", deck_a, catalog)
+        GameService._seat_deck(game_state, "side_b", deck_b, catalog)
 
-        def add_card_to_side(card: Card, side: str):
-            nonlocal card_id
-            card_id += 1
-            cards_in_play[str(card_id)] = GameService.get_card_in_play(card, card_id)
-            decks[side].append(str(card_id))
+        from apps.gameplay.agents.ruleset import get_ruleset_id
 
-        def build_deck_cards(deck, side: str) -> bool:
-            ordered_card_ids = GameService._ordered_ai_deck_card_ids(deck)
-            if ordered_card_ids is not None:
-                if not ordered_card_ids:
-                    return False
-
-                cards_by_id = {
-                    card.id: to_card_schema(card)
-                    for card in CardTemplate.objects.filter(
-                        id__in=set(ordered_card_ids),
-                        title=deck.title,
-                        is_latest=True,
-                    )
-                    .select_related("title", "faction")
-                    .prefetch_related("cardtrait_set", "allowed_heroes", "tags")
-                }
-                missing_ids = sorted(set(ordered_card_ids) - set(cards_by_id))
-                if missing_ids:
-                    raise DeckValidationError(
-                        f'AI deck "{deck.name}" references missing cards in its '
-                        f"draw order: {', '.join(map(str, missing_ids))}"
-                    )
+        game = Game.objects.create(
+            status=Game.GAME_STATUS_INIT,
+            side_a=deck_a,
+            side_b=deck_b,
+            state=game_state.model_dump(),
+            ruleset_id=get_ruleset_id(deck_a.title),
+        )
 
-                for ordered_card_id in ordered_card_ids:
-                    add_card_to_side(cards_by_id[ordered_card_id], side)
-                return False
-
-            deck_card_copies = {
-                card_copy.card.id: card_copy.count
-                for card_copy in deck.deckcard_set.all()
-            }
-            cards = serialize_cards_with_traits(deck.cards.all())
-            for card in cards:
-                for _ in range(deck_card_copies[card.id]):
-                    add_card_to_side(card, side)
-            return True
+        GameLoadout.objects.bulk_create(
+            [
+                GameService._game_loadout(game, GameLoadout.SIDE_A, deck_a, revision_a),
+                GameService._game_loadout(game, GameLoadout.SIDE_B, deck_b, revision_b),
+            ]
+        )
 
-        should_shuffle_a = build_deck_cards(deck_a, "side_a")
-        should_shuffle_b = build_deck_cards(deck_b, "side_b")
+        # Callers still need to set game type / time controls after create_game()
+        # returns. Triggering the first step here can race with those stale-state
+        # saves and wipe out opening draws, so the caller must kick off the first
+        # step after post-create mutations are complete.
+        game.enqueue([StartGameEffect(side="side_a")], trigger=False)
 
-        if should_shuffle_a:
-            creation_rng("shuffle_side_a_deck").shuffle(decks["side_a"])
-        if should_shuffle_b:
-            creation_rng("shuffle_side_b_deck").shuffle(decks["side_b"])
+        return game
 
-        # Get the side b compensation card if it exists and side B is human.
-        comp_card = None
-        if config.side_b_compensation and not deck_b.is_ai_deck:
-            card = CardTemplate.objects.get(
-                slug=config.side_b_compensation, is_latest=True
-            )
-            comp_card = to_card_schema(card)
-            card_id += 1
-            comp_card_in_play = GameService.get_card_in_play(comp_card, card_id)
-            cards_in_play[str(card_id)] = comp_card_in_play
-
-        opening_hand_sizes = {
-            "side_a": GameService._ai_opening_hand_size(
-                deck_a,
-                config.hand_start_size,
-            ),
-            "side_b": GameService._ai_opening_hand_size(
-                deck_b,
-                config.hand_start_size,
-            ),
-        }
+    @staticmethod
+    def _new_game_state(config: TitleConfig) -> GameState:
+        """An empty, not-yet-started game whose sides are filled by _seat_deck."""
+        return GameState(
+            turn=0,
+            active="side_a",
+            phase="start",
+            heroes={},
+            config=config,
+            rng_seed=uuid.uuid4().hex,
+            rng_counter=0,
+        )
 
-        # Collect all summonable card slugs from cards and heroes
+    @staticmethod
+    def _seat_deck(game_state: GameState, side: str, deck, catalog) -> None:
+        """Add ``deck``'s hero and cards to ``side`` of a not-yet-started game."""
+        config = game_state.config
         summonable_slugs = set()
 
-        # Scan all cards in play for summon actions
-        for card in cards_in_play.values():
-            for trait in card.traits:
-                for action in trait.actions:
-                    if isinstance(action, SummonAction):
-                        summonable_slugs.add(action.target)
-
-        # Scan hero powers for summon actions
-        for hero_template in [deck_a.hero, deck_b.hero]:
-            # Convert hero_power dict to HeroPower model
-            hero_power = HeroPower.model_validate(hero_template.hero_power)
-            for action in hero_power.actions:
-                if isinstance(action, SummonAction):
-                    summonable_slugs.add(action.target)
-
-        # Load and store the summonable card templates
-        summonable_cards = {}
-        for slug in summonable_slugs:
-            try:
-                card_template = CardTemplate.objects.get(slug=slug, is_latest=True)
-                card_schema = to_card_schema(card_template)
-                # Create a CardInPlay template (card_id will be assigned when summoned)
-                summonable_cards[slug] = CardInPlay(
-                    card_type=card_schema.card_type,
-                    card_id="",  # Placeholder, will be assigned during summon
-                    template_slug=slug,
-                    name=card_schema.name,
-                    description=card_schema.description,
-                    attack=card_schema.attack,
-                    health=card_schema.health,
-                    cost=card_schema.cost,
-                    traits=card_schema.traits,
-                    faction=card_schema.faction,
-                    spec=card_schema.spec,
-                    tags=card_schema.tags,
-                    art_url=card_schema.art_url,
+        def add_card(card: Card) -> CardInPlay:
+            # Card ids are sequential across both sides of a game.
+            card_in_play = GameService.get_card_in_play(card, len(game_state.cards) + 1)
+            game_state.cards[card_in_play.card_id] = card_in_play
+            targets = catalog.summon_targets_by_card_id.get(card.id)
+            if targets is None:
+                targets = card_summon_targets(card)
+            summonable_slugs.update(targets)
+            return card_in_play
+
+        side_cards, should_shuffle = GameService._deck_cards_in_draw_order(
+            deck, catalog
+        )
+        for card in side_cards:
+            game_state.decks[side].append(add_card(card).card_id)
+        if should_shuffle:
+            game_state.next_rng(f"shuffle_{side}_deck").shuffle(game_state.decks[side])
+
+        # Get the side b compensation card if it exists and side B is human.
+        if side == "side_b" and config.side_b_compensation and not deck.is_ai_deck:
+            comp_card = catalog.card_by_slug(config.side_b_compensation)
+            if comp_card is None:
+                raise CardTemplate.DoesNotExist(
+                    f"Compensation card '{config.side_b_compensation}' not found"
                 )
-            except CardTemplate.DoesNotExist:
-                logger.warning(f"Summonable card with slug '{slug}' not found")
+            game_state.hands["side_b"].append(add_card(comp_card).card_id)
 
-        hero_id_a = f"hero_{deck_a.id}_a"
-        hero_id_b = f"hero_{deck_b.id}_b"
-
-        heroes = {
-            "side_a": HeroInPlay(
-                hero_id=hero_id_a,
-                template_slug=deck_a.hero.slug,
-                health=deck_a.hero.health,
-                health_max=deck_a.hero.health,
-                name=deck_a.hero.name,
-                description=deck_a.hero.description,
-                hero_power=deck_a.hero.hero_power,
-                exhausted=False,
-                art_url=get_hero_art_url(deck_a.title.slug, deck_a.hero.slug),
-                player_name=deck_a.owner_name,
-            ),
-            "side_b": HeroInPlay(
-                hero_id=hero_id_b,
-                template_slug=deck_b.hero.slug,
-                health=deck_b.hero.health,
-                health_max=deck_b.hero.health,
-                name=deck_b.hero.name,
-                description=deck_b.hero.description,
-                hero_power=deck_b.hero.hero_power,
-                exhausted=False,
-                art_url=get_hero_art_url(deck_b.title.slug, deck_b.hero.slug),
-                player_name=deck_b.owner_name,
-            ),
-        }
+        game_state.opening_hand_sizes[side] = GameService._ai_opening_hand_size(
+            deck,
+            config.hand_start_size,
+        )
+        if deck.is_ai_deck:
+            game_state.ai_sides = sorted({*game_state.ai_sides, side})
+
+        # Add summon targets of the hero power
+        targets = catalog.summon_targets_by_hero_id.get(deck.hero.id)
+        if targets is None:
+            targets = hero_summon_targets(deck.hero.hero_power)
+        summonable_slugs.update(targets)
+
+        # Summonable CardInPlay templates (card_id is assigned when summoned)
+        for slug in summonable_slugs - set(game_state.summonable_cards):
+            template = catalog.summonable_templates.get(slug)
+            if template is None:
+                card = catalog.card_by_slug(slug)
+                template = summonable_template(card) if card is not None else None
+            if template is None:
+                logger.warning(f"Summonable card with slug '{slug}' not found")
+                continue
+            game_state.summonable_cards[slug] = template
+
+        game_state.heroes[side] = HeroInPlay(
+            hero_id=f"hero_{deck.id}_{side[-1]}",
+            template_slug=deck.hero.slug,
+            health=deck.hero.health,
+            health_max=deck.hero.health,
+            name=deck.hero.name,
+            description=deck.hero.description,
+            hero_power=deck.hero.hero_power,
+            exhausted=False,
+            art_url=get_hero_art_url(deck.title.slug, deck.hero.slug),
+            player_name=deck.owner_name,
+        )
 
-        ai_sides = []
-        if deck_a.is_ai_deck:
-            ai_sides.append("side_a")
-        if deck_b.is_ai_deck:
-            ai_sides.append("side_b")
+    @staticmethod
+    def _game_loadout(game: Game, side: str, deck, revision) -> GameLoadout:
+        return GameLoadout(
+            game=game,
+            side=side,
+            player=deck.user,
+            source_deck=deck,
+            source_revision=revision,
+            composition=revision.composition,
+            hero_slug=revision.hero_slug,
+            hero_name=revision.hero_name,
+            deck_name=deck.name,
+        )
 
-        hands = {"side_a": [], "side_b": []}
-        if comp_card:
-            hands["side_b"].append(comp_card_in_play.card_id)
+    @staticmethod
+    def _claim_prewarmed_pve_game(deck_a, deck_b, randomize_starting_player: bool):
+        """
+        Seat the player's deck in a pre-warmed game against the AI deck.
 
-        game_state = GameState(
-            turn=0,
-            active="side_a",
-            phase="start",
-            cards=cards_in_play,
-            heroes=heroes,
-            hands=hands,
-            decks=decks,
-            ai_sides=ai_sides,
-            opening_hand_sizes=opening_hand_sizes,
-            config=config,
-            summonable_cards=summonable_cards,
-            rng_seed=rng_seed,
-            rng_counter=rng_counter,
-        )
+        The pooled game already holds the AI side's row, loadout and shuffled
+        cards; the player's side is bound here and the opening step runs in
+        the caller's transaction, so the first frame needs no Celery step.
+        """
+        from apps.gameplay.agents.ruleset import get_ruleset_id
+        from apps.gameplay.prewarm import claim_prewarmed_pve_game, prewarm_pool_size
 
-        from apps.gameplay.agents.ruleset import compute_ruleset_id
+        if not prewarm_pool_size():
+            return None
 
-        game = Game.objects.create(
-            status=Game.GAME_STATUS_INIT,
-            side_a=deck_a,
-            side_b=deck_b,
-            state=game_state.model_dump(),
-            ruleset_id=compute_ruleset_id(deck_a.title),
+        ai_side = "side_a" if deck_a.is_ai_deck else "side_b"
+        player_side = "side_b" if deck_a.is_ai_deck else "side_a"
+        ai_deck, player_deck = (
+            (deck_a, deck_b) if ai_side == "side_a" else (deck_b, deck_a)
+        )
+        # The pooled game's seed is only known after the claim, so the starting
+        # player is drawn from the process RNG.
+        if randomize_starting_player and random.random() < 0.5:
+            ai_side, player_side = player_side, ai_side
+
+        game = claim_prewarmed_pve_game(
+            ai_deck,
+            ai_side,
+            GameService._game_deck_revision(ai_deck),
+            get_ruleset_id(ai_deck.title),
         )
+        if game is None:
+            return None
 
-        GameLoadout.objects.bulk_create(
-            [
-                GameLoadout(
-                    game=game,
-                    side=GameLoadout.SIDE_A,
-                    player=deck_a.user,
-                    source_deck=deck_a,
-                    source_revision=revision_a,
-                    composition=revision_a.composition,
-                    hero_slug=revision_a.hero_slug,
-                    hero_name=revision_a.hero_name,
-                    deck_name=deck_a.name,
-                ),
-                GameLoadout(
-                    game=game,
-                    side=GameLoadout.SIDE_B,
-                    player=deck_b.user,
-                    source_deck=deck_b,
-                    source_revision=revision_b,
-                    composition=revision_b.composition,
-                    hero_slug=revision_b.hero_slug,
-                    hero_name=revision_b.hero_name,
-                    deck_name=deck_b.name,
-                ),
-            ]
+        game_state = GameState.model_validate(game.state)
+        GameService._seat_deck(
+            game_state,
+            player_side,
+            player_deck,
+            get_title_card_catalog(player_deck.title),
         )
+        setattr(game, player_side, player_deck)
+        game.state = game_state.model_dump()
+        game.save(
+            update_fields=[player_side, "player_a_user", "player_b_user", "state"]
+        )
+        GameService._game_loadout(
+            game,
+            player_side,
+            player_deck,
+            GameService._game_deck_revision(player_deck),
+        ).save()
 
-        # Callers still need to set game type / time controls after create_game()
-        # returns. Triggering the first step here can race with those stale-state
-        # saves and wipe out opening draws, so the caller must kick off the first
-        # step after post-create mutations are complete.
         game.enqueue([StartGameEffect(side="side_a")], trigger=False)
-
+        GameService._step_inline(game.id)
+        game.refresh_from_db()
         return game
 
     @staticmethod
     @transaction.atomic
     def step(game_id: int):
+        continuation = GameService._step(game_id)
+        if continuation is not None:
+            from apps.gameplay.tasks import step
 
+            step.apply_async(args=[game_id], countdown=continuation.delay_seconds)
+        instrumentation.maybe_write_textfile()
+
+    @staticmethod
+    def _step(game_id: int) -> StepContinuation | None:
+        """Resolve one batch of queued effects; returns how to continue, if needed."""
+
+        games = Game.objects.select_for_update(nowait=True)
+        if state_cache.has_local_state(game_id):
+            # The hot state is likely current; skip transferring the column.
+            games = games.defer("state")
         try:
-            game = Game.objects.select_for_update(nowait=True).get(id=game_id)
+            game = games.get(id=game_id)
         except DatabaseError:
-            return
+            # Another step or command holds the game. Retry shortly instead of
+            # dropping the trigger; the retry is a no-op if the holder drained
+            # the queue.
+            logger.debug(f"Game {game_id} is locked; retrying its step")
+            return StepContinuation(DEFAULT_STEP_DELAY_SECONDS, False)
 
         logger.debug("==== STEP FUNCTION with queue: ====")
         for queue_item in game.queue or []:
@@ -491,10 +564,23 @@ class GameService:
         logger.debug("===================================")
 
         if game.status == Game.GAME_STATUS_ENDED:
-            return
+            return None
+
+        with instrumentation.span("gameplay_step"):
+            if instrumentation.profiling_requested(game):
+                return instrumentation.profile_step(
+                    game, GameService._resolve_batch, game
+                )
+            return GameService._resolve_batch(game)
+
+    @staticmethod
+    def _resolve_batch(game: Game) -> StepContinuation | None:
+        """Resolve up to one batch of the locked game's queued effects."""
+        game_id = game.id
         game.status = Game.GAME_STATUS_IN_PROGRESS
-        game_state = GameState.model_validate(game.state)
+        game_state = state_cache.load_game_state(game, take=True)
         turn_ready_before = GameService._turn_ready_sides(game_state)
+        turn_expires_before = game.turn_expires
 
         # Check for turn timeout - automatically concede if time expired
         if (
@@ -530,7 +616,7 @@ class GameService:
                         side=game_state.active, reason="first_turn_timeout"
                     )
                     send_game_updates_to_clients(game.id, game_state, [abort_update])
-                    return  # Game is done, exit step
+                    return None  # Game is done, exit step
 
                 # Time expired - automatically concede for the active player
                 from apps.gameplay.schemas.effects import ConcedeEffect
@@ -547,13 +633,15 @@ class GameService:
         all_events = []
         all_errors = []
         next_step_delay_seconds = DEFAULT_STEP_DELAY_SECONDS
+        ai_command_queued = False
 
         while len(game.queue) > 0 and effects_processed < processed_cap:
 
             # Pop one effect
             effect = game.queue.pop(0)
             try:
-                effect = TypeAdapter(Effect).validate_python(effect)
+                with instrumentation.span("gameplay_effect_validate"):
+                    effect = TypeAdapter(Effect).validate_python(effect)
             except ValidationError:
                 logger.warning(f"Invalid effect: {effect}")
                 continue
@@ -596,6 +684,20 @@ class GameService:
                                     f"Failed to update ELO ratings for game {game.id}: {e}"
                                 )
                                 # Continue - game has ended, ELO update is secondary
+                            try:
+                                record_game_result(game)
+                            except Exception as e:
+                                logger.error(
+                                    f"Failed to update ladder records for game "
+                                    f"{game.id}: {e}"
+                                )
+                            try:
+                                record_composition_results(game, event.winner)
+                            except Exception as e:
+                                logger.error(
+                                    f"Failed to update composition records for game "
+                                    f"{game.id}: {e}"
+                                )
                             GameService._schedule_matchmaking_after_ranked_game_finalized(
                                 game
                             )
@@ -717,20 +819,24 @@ class GameService:
                 break
 
         # Convert events to updates and persist them
-        all_updates = GameService._events_to_updates(all_events)
+        with instrumentation.span("gameplay_events_to_updates"):
+            all_updates = GameService._events_to_updates(all_events)
 
         # Persist updates to database
-        for update in all_updates:
-            from apps.gameplay.models import GameUpdate
+        with instrumentation.span("gameplay_update_insert"):
+            for update in all_updates:
+                from apps.gameplay.models import GameUpdate
 
-            GameUpdate.objects.create(
-                game=game,
-                update=update.model_dump(mode="json"),
-            )
+                GameUpdate.objects.create(
+                    game=game,
+                    update=update.model_dump(mode="json"),
+                )
 
         # Single DB save for all processed events
-        game.state = game_state.model_dump()
-        game.save()
+        with instrumentation.span("gameplay_state_save"):
+            state_cache.save_game_state(game, game_state, events=all_events)
+        if game.turn_expires != turn_expires_before:
+            GameService._schedule_turn_expiry_wakeup(game)
         GameService._notify_new_turn_ready_sides(
             game=game,
             before_sides=turn_ready_before,
@@ -745,54 +851,197 @@ class GameService:
         # See if we need to choose an AI move
         if (
             len(game.queue) == 0
-            and game.state["phase"] == "main"
-            and game.state["active"] in game.state["ai_sides"]
+            and game_state.phase == "main"
+            and game_state.active in game_state.ai_sides
         ):
-            deck = getattr(game, game.state["active"])
-            from apps.gameplay.ai import AIMoveChooser
-
-            active_side = game.state["active"]
-            ai_decision = AIMoveChooser.choose_decision(game_state, deck)
-            ai_command = ai_decision.command
-            if ai_command is None:
-                ai_command = EndTurnCommand()
-
-            command_dict = ai_command.model_dump(mode="json")
-            try:
-                ai_effects = GameService.compile_cmd(
-                    game_state,
-                    command_dict,
-                    active_side,
-                )
-            except Exception as exc:
-                GameService._record_action_decision(
-                    game=game,
-                    game_state=game_state,
-                    side=active_side,
-                    command=command_dict,
-                    actor_kind=ai_decision.actor_kind,
-                    outcome="rejected",
-                    error={"reason": str(exc)},
-                )
-                ai_effects = [EndTurnEffect(side=active_side)]
+            if GameService._ai_decisions_in_task():
+                # Search on a snapshot in choose_ai_command, without the lock.
+                GameService._schedule_ai_decision(game)
             else:
-                GameService._record_action_decision(
-                    game=game,
-                    game_state=game_state,
-                    side=active_side,
-                    command=command_dict,
-                    actor_kind=ai_decision.actor_kind,
-                    outcome="accepted",
-                )
+                deck = getattr(game, game_state.active)
+                from apps.gameplay.ai import AIMoveChooser
 
-            game.enqueue(ai_effects, trigger=False)
-            next_step_delay_seconds = GameService._ai_command_delay_seconds()
+                ai_decision = AIMoveChooser.choose_decision(game_state, deck)
+                game.enqueue(
+                    GameService._compile_ai_decision(game, game_state, ai_decision),
+                    trigger=False,
+                )
+                next_step_delay_seconds = GameService._ai_command_delay_seconds()
+                ai_command_queued = True
 
         # Continue processing if there are more effects in queue
         if len(game.queue) > 0:
-            from apps.gameplay.tasks import step
+            return StepContinuation(next_step_delay_seconds, ai_command_queued)
+        return None
 
-            step.apply_async(args=[game_id], countdown=next_step_delay_seconds)
+    @staticmethod
+    def _compile_ai_decision(game, game_state: GameState, ai_decision) -> list:
+        """Compile and record the active AI side's decision."""
+        active_side = game_state.active
+        ai_command = ai_decision.command
+        if ai_command is None:
+            ai_command = EndTurnCommand()
+
+        command_dict = ai_command.model_dump(mode="json")
+        try:
+            ai_effects = GameService.compile_cmd(
+                game_state,
+                command_dict,
+                active_side,
+            )
+        except Exception as exc:
+            GameService._record_action_decision(
+                game=game,
+                game_state=game_state,
+                side=active_side,
+                command=command_dict,
+                actor_kind=ai_decision.actor_kind,
+                outcome="rejected",
+                error={"reason": str(exc)},
+            )
+            return [EndTurnEffect(side=active_side)]
+
+        GameService._record_action_decision(
+            game=game,
+            game_state=game_state,
+            side=active_side,
+            command=command_dict,
+            actor_kind=ai_decision.actor_kind,
+            outcome="accepted",
+        )
+        return ai_effects
+
+    @staticmethod
+    def _ai_decisions_in_task() -> bool:
+        return (
+            getattr(settings, "GAMEPLAY_AI_EXECUTION", DEFAULT_AI_EXECUTION)
+            == AI_EXECUTION_TASK
+        )
+
+    @staticmethod
+    def _schedule_ai_decision(game: Game):
+        from apps.gameplay.tasks import choose_ai_command
+
+        game_id, state_version = game.id, game.state_version
+        transaction.on_commit(lambda: choose_ai_command.delay(game_id, state_version))
+
+    @staticmethod
+    def choose_ai_command(game_id: int, state_version: str):
+        """
+        Decide the AI's move on a snapshot of ``state_version`` and submit it.
+
+        The search runs outside any transaction, so it holds no lock however
+        long its ``GAMEPLAY_AI_TASK_BUDGET_MS`` budget is. The decision is
+        dropped if the game moved on in the meantime; whatever moved it
+        schedules its own decision.
+        """
+        started = time.monotonic()
+        game = Game.objects.filter(id=game_id).first()
+        if (
+            game is None
+            or game.status in (Game.GAME_STATUS_ENDED, Game.GAME_STATUS_ABORTED)
+            or game.state_version != state_version
+            or game.queue
+        ):
+            return False
+
+        game_state = state_cache.load_game_state(game)
+        if game_state.phase != "main" or game_state.active not in game_state.ai_sides:
+            return False
+
+        from apps.gameplay.ai import AIMoveChooser
+
+        ai_decision = AIMoveChooser.choose_decision(
+            game_state,
+            getattr(game, game_state.active),
+            budget_ms=int(
+                getattr(
+                    settings, "GAMEPLAY_AI_TASK_BUDGET_MS", DEFAULT_AI_TASK_BUDGET_MS
+                )
+            ),
+        )
+        return GameService._submit_ai_decision(
+            game_id,
+            state_version,
+            ai_decision,
+            delay_seconds=max(
+                GameService._ai_command_delay_seconds() - (time.monotonic() - started),
+                0,
+            ),
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def _submit_ai_decision(
+        game_id: int, state_version: str, ai_decision, delay_seconds: float
+    ) -> bool:
+        # The row lock is held only to check the version and enqueue.
+        game = Game.objects.select_for_update().get(id=game_id)
+        if game.state_version != state_version or game.queue:
+            logger.info(f"Dropping stale AI decision for game {game_id}")
+            instrumentation.increment("gameplay_ai_decisions_stale_total")
+            return False
+
+        game_state = state_cache.load_game_state(game)
+        game.enqueue(
+            GameService._compile_ai_decision(game, game_state, ai_decision),
+            trigger=False,
+        )
+
+        from apps.gameplay.tasks import step
+
+        transaction.on_commit(
+            lambda: step.apply_async(args=[game_id], countdown=delay_seconds)
+        )
+        return True
+
+    @staticmethod
+    def _inline_command_execution() -> bool:
+        return (
+            getattr(
+                settings,
+                "GAMEPLAY_COMMAND_EXECUTION",
+                DEFAULT_COMMAND_EXECUTION,
+            )
+            == COMMAND_EXECUTION_INLINE
+        )
+
+    @staticmethod
+    def _step_inline(game_id: int):
+        """
+        Resolve a command's effects in the caller's transaction.
+
+        Batches run back to back until the queue drains, the time budget runs
+        out or an AI command is queued; the remainder continues on Celery
+        once the transaction commits.
+        """
+        budget_seconds = (
+            float(
+                getattr(
+                    settings,
+                    "GAMEPLAY_INLINE_STEP_BUDGET_MS",
+                    DEFAULT_INLINE_STEP_BUDGET_MS,
+                )
+            )
+            / 1000
+        )
+        deadline = time.monotonic() + budget_seconds
+        # Back-to-back batches would otherwise each broadcast a full state.
+        with coalesced_broadcasts(game_id):
+            while True:
+                continuation = GameService._step(game_id)
+                if continuation is None:
+                    return
+                if continuation.ai_command or time.monotonic() >= deadline:
+                    break
+
+        from apps.gameplay.tasks import step
+
+        transaction.on_commit(
+            lambda: step.apply_async(
+                args=[game_id], countdown=continuation.delay_seconds
+            )
+        )
 
     @staticmethod
     def _ai_command_delay_seconds() -> float:
@@ -830,8 +1079,10 @@ class GameService:
     @staticmethod
     @transaction.atomic
     def process_command(game_id: int, command: dict, side):
+        inline = GameService._inline_command_execution()
+        games = Game.objects.select_for_update() if inline else Game.objects
         try:
-            game = Game.objects.get(id=game_id)
+            game = games.get(id=game_id)
         except Game.DoesNotExist:
             raise ValueError(f"Game with id {game_id} does not exist")
 
@@ -839,7 +1090,7 @@ class GameService:
         if game.status in (Game.GAME_STATUS_ENDED, Game.GAME_STATUS_ABORTED):
             raise ValueError("The game has already ended.")
 
-        game_state = GameState.model_validate(game.state)
+        game_state = state_cache.load_game_state(game)
 
         if GameService._enqueue_expired_mulligans(game, game_state):
             return
@@ -920,6 +1171,7 @@ class GameService:
             game_state.turn_expires = extended_turn_expires.isoformat()
             game.state = game_state.model_dump()
             game.save(update_fields=["turn_expires", "state"])
+            GameService._schedule_turn_expiry_wakeup(game)
 
             send_game_updates_to_clients(game.id, game_state, [])
             return
@@ -946,7 +1198,11 @@ class GameService:
             actor_kind=GameService._actor_kind_for_side(game, game_state, side),
             outcome="accepted",
         )
-        game.enqueue(effects)
+        if inline:
+            game.enqueue(effects, trigger=False)
+            GameService._step_inline(game.id)
+        else:
+            game.enqueue(effects)
 
     @staticmethod
     def _actor_kind_for_side(game, game_state: GameState, side: str) -> str:
@@ -1759,8 +2015,7 @@ class GameService:
         Only processes games between two human players (not vs AI).
         Updates ratings per-title (each user has a separate rating for each title).
         """
-        from apps.gameplay.elo import ELOCalculator
-        from apps.gameplay.models import ELORatingChange, UserTitleRating
+        from apps.gameplay.ratings import apply_rating_change
 
         # Skip if this is a PvE game (vs AI)
         if game.is_vs_ai:
@@ -1799,54 +2054,18 @@ class GameService:
             logger.warning(f"Game {game.id} has None user")
             return
 
-        # Get or create title ratings for both users
-        winner_rating, _ = UserTitleRating.objects.get_or_create(
-            user=winner_user,
-            title=title,
-            ladder_type=ladder_type,
-            defaults={"elo_rating": 1200},
-        )
-        loser_rating, _ = UserTitleRating.objects.get_or_create(
-            user=loser_user,
-            title=title,
-            ladder_type=ladder_type,
-            defaults={"elo_rating": 1200},
-        )
-
-        # Get current ratings
-        winner_old_rating = winner_rating.elo_rating
-        loser_old_rating = loser_rating.elo_rating
-
-        # Calculate new ratings
-        winner_new_rating, loser_new_rating = ELOCalculator.calculate_new_ratings(
-            winner_old_rating, loser_old_rating
-        )
-
-        # Update title ratings
-        winner_rating.elo_rating = winner_new_rating
-        loser_rating.elo_rating = loser_new_rating
-        winner_rating.save(update_fields=["elo_rating"])
-        loser_rating.save(update_fields=["elo_rating"])
-
-        # Create ELO change record
-        ELORatingChange.objects.create(
-            game=game,
-            title=title,
-            ladder_type=ladder_type,
-            winner=winner_user,
-            winner_old_rating=winner_old_rating,
-            winner_new_rating=winner_new_rating,
-            winner_rating_change=winner_new_rating - winner_old_rating,
-            loser=loser_user,
-            loser_old_rating=loser_old_rating,
-            loser_new_rating=loser_new_rating,
-            loser_rating_change=loser_new_rating - loser_old_rating,
-        )
+        # Ratings are locked in primary-key order by the ledger service so
+        # concurrent endings sharing a player cannot lose an update.
+        change = apply_rating_change(game, winner_user, loser_user, ladder_type)
+        if change is None:
+            return
 
         logger.info(
             f"ELO updated for game {game.id} ({title.name}, {ladder_type}): "
-            f"{winner_user.display_name} {winner_old_rating}->{winner_new_rating}, "
-            f"{loser_user.display_name} {loser_old_rating}->{loser_new_rating}"
+            f"{winner_user.display_name} "
+            f"{change.winner_old_rating}->{change.winner_new_rating}, "
+            f"{loser_user.display_name} "
+            f"{change.loser_old_rating}->{change.loser_new_rating}"
         )
 
     @staticmethod
@@ -2033,7 +2252,9 @@ class GameService:
                 status=MatchmakingQueue.STATUS_QUEUED,
                 ladder_type=ladder_type,
             )
-            .select_related("user", "deck", "deck__hero", "deck__title")
+            .select_related(
+                "user", "deck", "deck__hero", "deck__title", "deck__current_revision"
+            )
             .order_by("elo_rating")
         )
 
@@ -2212,71 +2433,166 @@ class GameService:
         return matches_created
 
     @staticmethod
-    @transaction.atomic
-    def check_expired_turns():
+    def check_expired_turns(batch_size: int = EXPIRED_TURN_BATCH_SIZE):
         """
-        Check all active games for expired turns and automatically concede.
-        This is called periodically to catch timeouts even when no effects are being processed.
+        Sweep in-progress games whose turn timer has run out.
 
-        For ranked games: if side_a times out on turn 1 without making any moves,
-        the game is aborted (no winner, no rating changes).
+        Candidates are read from the turn expiry index in small id-ordered
+        batches. Each game is then claimed and expired in its own transaction
+        (see ``expire_turn``), so a slow or locked game never holds up the rest
+        of the sweep and a backlog never becomes one long-running transaction.
+
+        Per-game wake-ups normally expire turns right on time; this periodic
+        sweep is the safety net for missed wake-ups and long (daily) timers.
         """
         from django.utils import timezone
 
-        from apps.gameplay.schemas.effects import ConcedeEffect
-        from apps.gameplay.schemas.updates import GameAbortedUpdate
-
         now = timezone.now()
+        checked = 0
+        last_id = 0
 
-        # Find all active games in main phase with turn_expires set
-        expired_games = Game.objects.filter(
-            status=Game.GAME_STATUS_IN_PROGRESS,
-            turn_expires__isnull=False,
-            turn_expires__lte=now,
-        ).select_for_update(nowait=False)
+        while True:
+            game_ids = list(
+                Game.objects.filter(
+                    status=Game.GAME_STATUS_IN_PROGRESS,
+                    turn_expires__lte=now,
+                    id__gt=last_id,
+                )
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            for game_id in game_ids:
+                GameService.expire_turn(game_id, now=now)
+            checked += len(game_ids)
 
-        for game in expired_games:
-            try:
-                game_state = GameState.model_validate(game.state)
+            if len(game_ids) < batch_size:
+                break
+            last_id = game_ids[-1]
 
-                if GameService._enqueue_expired_mulligans(game, game_state, now=now):
-                    continue
+        return f"Checked {checked} games for expired turns"
 
-                # Only process if in main phase and has time control
-                if game_state.phase == "main" and game_state.time_per_turn > 0:
-                    # Check for abort condition: ranked game, turn 1, side_a timing out
-                    # This handles the case where someone queued but never came back
-                    if (
-                        game.type == Game.GAME_TYPE_RANKED
-                        and game_state.turn == 1
-                        and game_state.active == "side_a"
-                    ):
-                        logger.info(
-                            f"Ranked game {game.id} aborted: side_a timed out on turn 1 "
-                            f"(no winner, no rating changes)"
-                        )
-                        # Abort the game - no winner, no ConcedeEffect
-                        game.status = Game.GAME_STATUS_ABORTED
-                        game.queue = []
-                        game.turn_expires = None
-                        game.save(update_fields=["status", "queue", "turn_expires"])
-
-                        # Notify clients
-                        abort_update = GameAbortedUpdate(
-                            side=game_state.active, reason="first_turn_timeout"
-                        )
-                        send_game_updates_to_clients(
-                            game.id, game_state, [abort_update]
-                        )
-                        continue  # Don't process as normal timeout
+    @staticmethod
+    def expire_turn(game_id: int, now=None) -> bool:
+        """
+        Apply the turn timeout for a single game if its timer has run out.
 
-                    # Normal timeout - concede for the active player
-                    logger.info(
-                        f"Turn expired for {game_state.active} in game {game.id}, auto-conceding"
+        The game row is claimed with SKIP LOCKED: if a step is currently holding
+        it, that step re-checks the timer itself and the next wake-up or sweep
+        retries. Returns True if a timeout was applied.
+        """
+        from django.utils import timezone
+
+        if now is None:
+            now = timezone.now()
+
+        try:
+            with transaction.atomic():
+                game = (
+                    Game.objects.select_for_update(skip_locked=True)
+                    .filter(
+                        id=game_id,
+                        status=Game.GAME_STATUS_IN_PROGRESS,
+                        turn_expires__lte=now,
                     )
-                    game.enqueue([ConcedeEffect(side=game_state.active)], trigger=True)
-            except Exception as e:
-                logger.error(f"Error checking expired turn for game {game.id}: {e}")
-                continue
+                    .first()
+                )
+                if game is None:
+                    return False
+                return GameService._apply_turn_timeout(game, now)
+        except Exception as e:
+            logger.error(f"Error checking expired turn for game {game_id}: {e}")
+            return False
+
+    @staticmethod
+    def _apply_turn_timeout(game, now) -> bool:
+        """
+        For ranked games: if side_a times out on turn 1 without making any moves,
+        the game is aborted (no winner, no rating changes).
+        """
+        from apps.gameplay.schemas.updates import GameAbortedUpdate
+
+        game_state = state_cache.load_game_state(game)
+
+        if GameService._enqueue_expired_mulligans(game, game_state, now=now):
+            return True
+
+        # Only process if in main phase and has time control
+        if game_state.phase != "main" or game_state.time_per_turn <= 0:
+            return False
+
+        # Check for abort condition: ranked game, turn 1, side_a timing out
+        # This handles the case where someone queued but never came back
+        if (
+            game.type == Game.GAME_TYPE_RANKED
+            and game_state.turn == 1
+            and game_state.active == "side_a"
+        ):
+            logger.info(
+                f"Ranked game {game.id} aborted: side_a timed out on turn 1 "
+                f"(no winner, no rating changes)"
+            )
+            # Abort the game - no winner, no ConcedeEffect
+            game.status = Game.GAME_STATUS_ABORTED
+            game.queue = []
+            game.turn_expires = None
+            game.save(update_fields=["status", "queue", "turn_expires"])
+
+            # Notify clients
+            abort_update = GameAbortedUpdate(
+                side=game_state.active, reason="first_turn_timeout"
+            )
+            send_game_updates_to_clients(game.id, game_state, [abort_update])
+            return True
+
+        # A concede from an earlier wake-up may still be waiting for its step.
+        if any(
+            item.get("type") == "effect_concede"
+            and item.get("side") == game_state.active
+            for item in game.queue
+        ):
+            return False
+
+        # Normal timeout - concede for the active player
+        logger.info(
+            f"Turn expired for {game_state.active} in game {game.id}, auto-conceding"
+        )
+        game.enqueue([ConcedeEffect(side=game_state.active)], trigger=True)
+        return True
+
+    @staticmethod
+    def _turn_expiry_wakeup_horizon_seconds() -> float:
+        return float(
+            getattr(
+                settings,
+                "GAMEPLAY_TURN_EXPIRY_WAKEUP_HORIZON_SECONDS",
+                DEFAULT_TURN_EXPIRY_WAKEUP_HORIZON_SECONDS,
+            )
+        )
+
+    @staticmethod
+    def _schedule_turn_expiry_wakeup(game) -> None:
+        """
+        Schedule ``expire_turn`` to run exactly at the game's turn deadline.
+
+        Deadlines beyond the wake-up horizon are left to the periodic sweep: the
+        Redis broker redelivers ETA tasks held longer than its visibility
+        timeout, so day-long timers would otherwise fan out into duplicates.
+        """
+        from django.utils import timezone
+
+        turn_expires = game.turn_expires
+        if turn_expires is None:
+            return
+
+        horizon_seconds = GameService._turn_expiry_wakeup_horizon_seconds()
+        if (turn_expires - timezone.now()).total_seconds() > horizon_seconds:
+            return
+
+        game_id = game.id
+
+        def enqueue_wakeup():
+            from apps.gameplay.tasks import expire_turn
+
+            expire_turn.apply_async(args=[game_id], eta=turn_expires)
 
-        return f"Checked {len(expired_games)} games for expired turns"
+        transaction.on_commit(enqueue_wakeup)
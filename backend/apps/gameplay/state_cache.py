@@ -0,0 +1,240 @@
+"""
+Hot ``GameState`` cache with optional write-behind persistence.
+
+Every state written to ``Game.state`` gets a fresh ``state_version`` token, and
+``state_flushed_version`` names the token whose state the row actually holds.
+The two only differ while a newer state lives in the hot cache.
+
+- The step that produced a state keeps the validated ``GameState`` in a
+  process-local LRU, keyed by its token. With game-affine routing, the game's
+  next step usually runs in the same worker and skips both the state column
+  transfer and ``GameState.model_validate``.
+- With ``GAMEPLAY_STATE_WRITE_BEHIND`` enabled, steps save the row without
+  the state column and publish the state to the shared cache instead. The
+  state is flushed at phase and turn boundaries, at game end and every
+  ``GAMEPLAY_STATE_FLUSH_EVERY_STEPS`` steps, but only once the effect queue
+  has drained, so a flushed state is always a replay starting point. Flushes
+  only apply if the row still carries the token they were computed from.
+  Cross-process readers need a shared cache backend (e.g. Redis).
+- If the hot copy is lost before a flush, ``recover_game_state`` replays the
+  accepted ``GameAction`` commands recorded since the flushed state.
+
+Code that writes ``Game.state`` directly must read it through
+``load_game_state`` first; ``Game.save`` assigns the new tokens. A full-row
+save that leaves a stale column unchanged, such as an admin edit during a
+write-behind window, keeps the tokens and the hot state.
+"""
+
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from apps.gameplay.models import Game, GameAction
+from apps.gameplay.schemas.events import EndTurnEvent, GameOverEvent, NewPhaseEvent
+from apps.gameplay.schemas.game import GameState
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOT_STATE_CACHE_SIZE = 512
+DEFAULT_STATE_FLUSH_EVERY_STEPS = 20
+HOT_STATE_CACHE_TIMEOUT = 60 * 60 * 6
+FLUSH_EVENTS = (NewPhaseEvent, EndTurnEvent, GameOverEvent)
+
+
+@dataclass
+class HotGameState:
+    version: str
+    state: GameState
+    pending_steps: int = 0
+    # A flush boundary was reached while effects were still queued.
+    flush_due: bool = False
+
+
+# game_id -> HotGameState, least recently stored first
+_local_states: OrderedDict = OrderedDict()
+# game_id -> (version, unflushed steps, flush due) of states handed out with
+# take=True
+_taken_pending_steps: dict = {}
+
+
+def write_behind_enabled() -> bool:
+    return bool(getattr(settings, "GAMEPLAY_STATE_WRITE_BEHIND", False))
+
+
+def _shared_cache():
+    return caches[getattr(settings, "GAMEPLAY_HOT_STATE_CACHE_ALIAS", "default")]
+
+
+def _shared_cache_key(game_id: int) -> str:
+    return f"gameplay_hot_state:{game_id}"
+
+
+def has_local_state(game_id: int) -> bool:
+    return game_id in _local_states
+
+
+def forget_local_state(game_id: int) -> None:
+    _local_states.pop(game_id, None)
+
+
+def clear_local_states() -> None:
+    _local_states.clear()
+    _taken_pending_steps.clear()
+
+
+def _remember_local_state(game_id: int, entry: HotGameState) -> None:
+    _local_states[game_id] = entry
+    _local_states.move_to_end(game_id)
+    size = int(
+        getattr(settings, "GAMEPLAY_HOT_STATE_CACHE_SIZE", DEFAULT_HOT_STATE_CACHE_SIZE)
+    )
+    while len(_local_states) > max(size, 0):
+        _local_states.popitem(last=False)
+
+
+def _pending_flush(game) -> tuple[int, bool]:
+    version, pending_steps, flush_due = _taken_pending_steps.pop(
+        game.id, ("", 0, False)
+    )
+    if version != game.state_version:
+        return 0, False
+    return pending_steps, flush_due
+
+
+def load_game_state(game, *, take: bool = False) -> GameState:
+    """
+    Return the game's current state.
+
+    ``take`` is for the step that holds the game's row lock and will store a
+    successor state: it receives the hot ``GameState`` object itself instead
+    of a private copy, and may persist a recovered state.
+    """
+    version = game.state_version
+    if take:
+        # Popped so a rolled-back step cannot leave a half-mutated state behind.
+        entry = _local_states.pop(game.id, None)
+        if entry is not None and entry.version == version:
+            _taken_pending_steps[game.id] = (
+                version,
+                entry.pending_steps,
+                entry.flush_due,
+            )
+            return entry.state
+
+    if game.state_flushed_version == version:
+        return GameState.model_validate(game.state)
+
+    shared = _shared_cache().get(_shared_cache_key(game.id))
+    if shared is not None and shared.version == version:
+        if take:
+            _taken_pending_steps[game.id] = (
+                version,
+                shared.pending_steps,
+                shared.flush_due,
+            )
+        return shared.state
+
+    return recover_game_state(game, persist=take)
+
+
+def recover_game_state(game, *, persist: bool = False) -> GameState:
+    """
+    Rebuild a lost hot state from the flushed state and the accepted actions.
+
+    Replay starts at the first accepted action whose pre-state hash matches
+    the flushed state and resolves each command to quiescence. The queue is
+    only cleared when something was replayed; otherwise the flushed state is
+    returned with the queue left as it is.
+    """
+    from apps.gameplay.agents.hash import state_hash
+    from apps.gameplay.agents.simulator import apply_command
+
+    state = GameState.model_validate(game.state)
+    flushed_hash = state_hash(state)
+    replayed = 0
+    replaying = False
+    for action in GameAction.objects.filter(
+        game=game, outcome=GameAction.OUTCOME_ACCEPTED
+    ).order_by("created_at", "id"):
+        if not replaying:
+            if action.pre_state_hash != flushed_hash:
+                continue
+            replaying = True
+        state = apply_command(state, action.actor_side, action.command).state
+        replayed += 1
+
+    logger.warning(
+        f"Recovered hot state of game {game.id} by replaying {replayed} action(s)"
+    )
+    if persist:
+        payload = state.model_dump()
+        fields = {"state": payload, "state_flushed_version": game.state_version}
+        if replayed:
+            # The replay resolved the queued effects of the replayed commands.
+            fields["queue"] = []
+        if Game.objects.filter(pk=game.pk, state_version=game.state_version).update(
+            **fields
+        ):
+            game.state = payload
+            game.state_flushed_version = game.state_version
+            if replayed:
+                game.queue = []
+    return state
+
+
+def save_game_state(game, game_state: GameState, *, events=()) -> None:
+    """
+    Save the game row after a step, with ``game_state`` as its new state.
+
+    Must run under the game's row lock. Writes the state column unless
+    write-behind defers it; the hot copies are published once the
+    transaction commits.
+    """
+    pending_steps, flush_due = _pending_flush(game)
+    pending_steps += 1
+    flush_due = (
+        flush_due
+        or any(isinstance(event, FLUSH_EVENTS) for event in events)
+        or pending_steps
+        >= int(
+            getattr(
+                settings,
+                "GAMEPLAY_STATE_FLUSH_EVERY_STEPS",
+                DEFAULT_STATE_FLUSH_EVERY_STEPS,
+            )
+        )
+    )
+    flush = (
+        not write_behind_enabled()
+        or game.status != Game.GAME_STATUS_IN_PROGRESS
+        # Recovery replays commands from the flushed state, so a state with
+        # effects still queued is held back until the queue drains.
+        or (flush_due and not game.queue)
+    )
+
+    fields = [
+        field.name for field in Game._meta.concrete_fields if not field.primary_key
+    ]
+    if flush:
+        game.state = game_state.model_dump()
+        # Named fields, so the state is written even if it matches the column.
+        game.save(update_fields=fields)
+        entry = HotGameState(game.state_version, game_state)
+    else:
+        game.state_version = uuid.uuid4().hex
+        game.save(update_fields=[field for field in fields if field != "state"])
+        entry = HotGameState(game.state_version, game_state, pending_steps, flush_due)
+
+    def publish():
+        _remember_local_state(game.id, entry)
+        if entry.pending_steps:
+            _shared_cache().set(
+                _shared_cache_key(game.id), entry, HOT_STATE_CACHE_TIMEOUT
+            )
+
+    transaction.on_commit(publish)
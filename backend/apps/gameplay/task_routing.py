@@ -0,0 +1,73 @@
+"""
+Game-affine routing for per-game Celery tasks.
+
+With ``GAMEPLAY_STEP_QUEUE_COUNT`` set, ``step`` and ``expire_turn`` tasks are
+routed by game id onto that many ``<prefix>-<n>`` queues instead of the default
+queue. Run one single-process worker per queue
+(``celery -A config worker -Q gameplay-step-0 --concurrency 1``) and each game's
+steps are processed serially by one owner, so they no longer race for the
+game's row lock. Jump consistent hashing keeps most games on their queue when
+the queue count changes.
+
+With ``GAMEPLAY_AI_QUEUE`` set, ``choose_ai_command`` tasks go to that queue,
+so AI search runs on its own worker pool instead of delaying steps.
+"""
+
+from django.conf import settings
+
+DEFAULT_STEP_QUEUE_COUNT = 0
+DEFAULT_STEP_QUEUE_PREFIX = "gameplay-step"
+GAME_AFFINE_TASKS = frozenset(
+    {
+        "apps.gameplay.tasks.step",
+        "apps.gameplay.tasks.expire_turn",
+    }
+)
+AI_DECISION_TASK = "apps.gameplay.tasks.choose_ai_command"
+
+
+def jump_consistent_hash(key: int, buckets: int) -> int:
+    """Lamping & Veach jump consistent hash of ``key`` into ``buckets``."""
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def step_queue_count() -> int:
+    return max(
+        int(getattr(settings, "GAMEPLAY_STEP_QUEUE_COUNT", DEFAULT_STEP_QUEUE_COUNT)),
+        0,
+    )
+
+
+def step_queue_names() -> list[str]:
+    prefix = getattr(settings, "GAMEPLAY_STEP_QUEUE_PREFIX", DEFAULT_STEP_QUEUE_PREFIX)
+    return [f"{prefix}-{index}" for index in range(step_queue_count())]
+
+
+def step_queue_for_game(game_id: int) -> str | None:
+    """The queue that owns ``game_id``, or None when routing is disabled."""
+    queues = step_queue_names()
+    if not queues:
+        return None
+    return queues[jump_consistent_hash(int(game_id), len(queues))]
+
+
+def route_game_task(name, args, kwargs, options, task=None, **kw):
+    """Celery router sending per-game tasks to the game's owning queue."""
+    if name == AI_DECISION_TASK:
+        queue = getattr(settings, "GAMEPLAY_AI_QUEUE", "")
+        return {"queue": queue} if queue else None
+    if name not in GAME_AFFINE_TASKS:
+        return None
+
+    game_id = args[0] if args else (kwargs or {}).get("game_id")
+    if game_id is None:
+        return None
+
+    queue = step_queue_for_game(game_id)
+    return {"queue": queue} if queue else None
@@ -8,6 +8,14 @@ def step(game_id: int):
     return GameService.step(game_id)
 
 
+@shared_task
+def choose_ai_command(game_id: int, state_version: str):
+    """
+    Compute an AI move off the step path (GAMEPLAY_AI_EXECUTION="task").
+    """
+    return GameService.choose_ai_command(game_id, state_version)
+
+
 @shared_task
 def process_matchmaking(title_id: int, ladder_type: str = None):
     """
@@ -26,8 +34,26 @@ def check_expired_turns():
     return GameService.check_expired_turns()
 
 
+@shared_task
+def expire_turn(game_id: int):
+    """
+    Per-game wake-up scheduled with an ETA at the game's turn deadline.
+    """
+    return GameService.expire_turn(game_id)
+
+
 @shared_task
 def send_push_notification_event(event_id: int):
     from apps.gameplay.push import send_push_event
 
     return send_push_event(event_id)
+
+
+@shared_task(ignore_result=True)
+def refill_prewarmed_pools():
+    """
+    Periodic task topping up the pre-warmed PvE and scenario game pools.
+    """
+    from apps.gameplay.prewarm import refill_prewarmed_pools
+
+    return refill_prewarmed_pools()
@@ -13,10 +13,11 @@ from apps.gameplay.services import GameService
 User = get_user_model()
 
 
-class ServiceTestsBase(TestCase):
-    """Base class for tests that need a complete game with decks."""
+class GameFixturesMixin:
+    """A user, a player deck, an AI deck and a game between them."""
 
     def setUp(self):
+        super().setUp()
         self.user = User.objects.create_user(
             email="testuser@example.com",
             username="testuser"
@@ -52,6 +53,10 @@ class ServiceTestsBase(TestCase):
         self.game.refresh_from_db()
 
 
+class ServiceTestsBase(GameFixturesMixin, TestCase):
+    """Base class for tests that need a complete game with decks."""
+
+
 class GamePlayTestBase(TestCase):
     """Base class for tests that need a simple game state."""
 
@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from apps.gameplay.ai import AIMoveChooser
+from apps.gameplay.models import Game, GameAction
+from apps.gameplay.services import GameService
+from apps.gameplay.task_routing import route_game_task
+from apps.gameplay.tests import ServiceTestsBase
+
+
+@override_settings(GAMEPLAY_AI_EXECUTION="task", GAMEPLAY_COMMAND_EXECUTION="inline")
+class AIDecisionTaskTests(ServiceTestsBase):
+    def _end_human_turn(self):
+        GameService.step(self.game.id)
+        GameService.process_command(
+            self.game.id, {"type": "cmd_mulligan", "card_ids": []}, "side_a"
+        )
+        with patch("apps.gameplay.tasks.choose_ai_command.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                GameService.process_command(
+                    self.game.id, {"type": "cmd_end_turn"}, "side_a"
+                )
+        self.game.refresh_from_db()
+        return delay
+
+    def test_step_schedules_the_decision_instead_of_searching(self):
+        with patch("apps.gameplay.ai.AIMoveChooser.choose_decision") as choose:
+            delay = self._end_human_turn()
+
+        choose.assert_not_called()
+        self.assertEqual(self.game.state["active"], "side_b")
+        self.assertEqual(self.game.queue, [])
+        delay.assert_called_once_with(self.game.id, self.game.state_version)
+
+    @override_settings(GAMEPLAY_AI_TASK_BUDGET_MS=250)
+    def test_decision_is_submitted_against_the_snapshot_version(self):
+        self._end_human_turn()
+
+        with patch("apps.gameplay.tasks.step.apply_async") as apply_async:
+            with patch(
+                "apps.gameplay.ai.AIMoveChooser.choose_decision",
+                wraps=AIMoveChooser.choose_decision,
+            ) as choose:
+                with self.captureOnCommitCallbacks(execute=True):
+                    submitted = GameService.choose_ai_command(
+                        self.game.id, self.game.state_version
+                    )
+
+        self.assertTrue(submitted)
+        self.assertEqual(choose.call_args.kwargs["budget_ms"], 250)
+        self.game.refresh_from_db()
+        self.assertTrue(self.game.queue)
+        self.assertTrue(
+            GameAction.objects.filter(
+                game=self.game, actor_side="side_b", outcome="accepted"
+            ).exists()
+        )
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.kwargs["args"], [self.game.id])
+
+    def test_stale_decisions_are_dropped(self):
+        self._end_human_turn()
+        stale_version = self.game.state_version
+        self.game.save()
+
+        with patch("apps.gameplay.ai.AIMoveChooser.choose_decision") as choose:
+            self.assertFalse(GameService.choose_ai_command(self.game.id, stale_version))
+
+        choose.assert_not_called()
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.queue, [])
+
+    def test_decisions_raced_by_another_write_are_dropped(self):
+        self._end_human_turn()
+        choose_decision = AIMoveChooser.choose_decision
+
+        def move_game_on(*args, **kwargs):
+            Game.objects.get(id=self.game.id).save()
+            return choose_decision(*args, **kwargs)
+
+        with patch(
+            "apps.gameplay.ai.AIMoveChooser.choose_decision", side_effect=move_game_on
+        ):
+            with patch("apps.gameplay.tasks.step.apply_async") as apply_async:
+                with self.captureOnCommitCallbacks(execute=True):
+                    submitted = GameService.choose_ai_command(
+                        self.game.id, self.game.state_version
+                    )
+
+        self.assertFalse(submitted)
+        apply_async.assert_not_called()
+        self.assertEqual(Game.objects.get(id=self.game.id).queue, [])
+
+    @override_settings(GAMEPLAY_AI_QUEUE="gameplay-ai")
+    def test_decisions_can_be_routed_to_their_own_queue(self):
+        self.assertEqual(
+            route_game_task(
+                "apps.gameplay.tasks.choose_ai_command", [1, "version"], {}, {}
+            ),
+            {"queue": "gameplay-ai"},
+        )
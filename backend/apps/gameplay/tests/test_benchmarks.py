@@ -0,0 +1,76 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+
+from apps.gameplay.benchmarks.suite import compare_results, load_states, run_suite
+
+
+class EngineBenchmarkTests(SimpleTestCase):
+    def test_recorded_states_cover_each_board_size(self):
+        states = load_states()
+
+        self.assertEqual(
+            {recorded.size for recorded in states}, {"small", "mid", "full"}
+        )
+        full = next(recorded for recorded in states if recorded.size == "full")
+        self.assertEqual(len(full.state.board["side_a"]), 7)
+
+    def test_suite_reports_and_flags_regressions(self):
+        states = [
+            recorded
+            for recorded in load_states()
+            if recorded.name == "intro-archetype-v1-small"
+        ]
+
+        report = run_suite(states, only="resolve:", min_time=0.001, rounds=2)
+
+        names = {result["name"] for result in report["results"]}
+        self.assertIn("resolve:effect_draw", names)
+        faster = {
+            "results": [
+                {**result, "best_us": result["best_us"] / 2}
+                for result in report["results"]
+            ]
+        }
+        self.assertEqual(compare_results(report, report), [])
+        self.assertEqual(
+            len(compare_results(report, faster, tolerance=0.25)),
+            len(report["results"]),
+        )
+
+    def _run_command(self, **options):
+        stdout = StringIO()
+        call_command(
+            "benchmark_engine",
+            only="intro-archetype-v1-small/resolve:effect_draw",
+            min_time=0.001,
+            rounds=2,
+            stdout=stdout,
+            **options,
+        )
+        return stdout.getvalue()
+
+    def test_command_compares_only_against_a_same_machine_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline_path = Path(directory) / "baseline.json"
+            self._run_command(baseline=str(baseline_path), update_baseline=True)
+            baseline = json.loads(baseline_path.read_text())
+            for result in baseline["results"]:
+                result["best_us"] /= 100
+            baseline_path.write_text(json.dumps(baseline))
+
+            # Without --baseline the run only reports timings.
+            self.assertNotIn("regressed", self._run_command())
+
+            with self.assertRaises(CommandError):
+                self._run_command(baseline=str(baseline_path))
+
+            baseline["python"] = "2.7.18"
+            baseline_path.write_text(json.dumps(baseline))
+            output = self._run_command(baseline=str(baseline_path))
+            self.assertIn("not compared strictly", output)
@@ -0,0 +1,63 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.gameplay.notifications import (
+    coalesced_broadcasts,
+    send_game_updates_to_clients,
+)
+
+
+@override_settings(GAMEPLAY_BROADCAST_COALESCE_MS=30)
+@patch("apps.gameplay.notifications._broadcast_game_updates")
+class CoalescedBroadcastTests(SimpleTestCase):
+    def test_sends_immediately_outside_a_coalescing_block(self, broadcast):
+        send_game_updates_to_clients(1, {"turn": 1}, [{"type": "a"}])
+
+        broadcast.assert_called_once_with(1, {"turn": 1}, [{"type": "a"}], [])
+
+    def test_merges_updates_and_sends_the_latest_state_on_exit(self, broadcast):
+        with coalesced_broadcasts(1):
+            send_game_updates_to_clients(1, {"turn": 1}, [{"type": "a"}])
+            send_game_updates_to_clients(
+                1, {"turn": 2}, [{"type": "b"}], [{"reason": "x"}]
+            )
+            send_game_updates_to_clients(2, {"turn": 7}, [])
+            broadcast.assert_called_once_with(2, {"turn": 7}, [], [])
+
+        broadcast.assert_called_with(
+            1, {"turn": 2}, [{"type": "a"}, {"type": "b"}], [{"reason": "x"}]
+        )
+        self.assertEqual(broadcast.call_count, 2)
+
+    def test_flushes_a_pending_broadcast_once_the_window_passes(self, broadcast):
+        with patch(
+            "apps.gameplay.notifications.time.monotonic",
+            side_effect=[0.0, 0.01, 0.05],
+        ):
+            with coalesced_broadcasts(1):
+                send_game_updates_to_clients(1, {"turn": 1}, [{"type": "a"}])
+                send_game_updates_to_clients(1, {"turn": 2}, [{"type": "b"}])
+                broadcast.assert_not_called()
+                send_game_updates_to_clients(1, {"turn": 3}, [{"type": "c"}])
+                broadcast.assert_called_once_with(
+                    1, {"turn": 2}, [{"type": "a"}, {"type": "b"}], []
+                )
+
+        broadcast.assert_called_with(1, {"turn": 3}, [{"type": "c"}], [])
+
+    def test_nested_blocks_for_one_game_flush_at_the_outermost(self, broadcast):
+        with coalesced_broadcasts(1):
+            with coalesced_broadcasts(1):
+                send_game_updates_to_clients(1, {"turn": 1}, [{"type": "a"}])
+            broadcast.assert_not_called()
+
+        broadcast.assert_called_once()
+
+    @override_settings(GAMEPLAY_BROADCAST_COALESCE_MS=0)
+    def test_zero_window_disables_coalescing(self, broadcast):
+        with coalesced_broadcasts(1):
+            send_game_updates_to_clients(1, {"turn": 1}, [])
+            send_game_updates_to_clients(1, {"turn": 2}, [])
+
+        self.assertEqual(broadcast.call_count, 2)
@@ -3,9 +3,10 @@ Tests for command processing - including attack validation and game flow command
 """
 
 from datetime import timedelta
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from apps.builder.models import AIPlayer, CardTemplate, HeroTemplate, Title
@@ -107,6 +108,74 @@ class ProcessCommandTests(ServiceTestsBase):
         self.assertEqual(len(self.game.queue), 1)
         self.assertEqual(self.game.queue[0]["type"], "effect_end_turn")
 
+    def _board_creatures(self):
+        self.game.state["creatures"] = {
+            "1": {
+                "creature_id": "1",
+                "card_id": "card_1",
+                "name": "Test Creature 1",
+                "attack": 1,
+                "health": 10,
+                "exhausted": False,
+                "traits": [],
+            },
+            "5": {
+                "creature_id": "5",
+                "card_id": "card_5",
+                "name": "Test Creature 5",
+                "attack": 1,
+                "health": 10,
+                "exhausted": False,
+                "traits": [],
+            },
+        }
+        self.game.state["board"]["side_a"].append("1")
+        self.game.state["board"]["side_b"].append("5")
+        self.game.save()
+
+    @override_settings(GAMEPLAY_COMMAND_EXECUTION="inline")
+    def test_inline_execution_resolves_the_command_without_a_step_task(self):
+        self._board_creatures()
+        command = {
+            "type": "cmd_attack",
+            "card_id": "1",
+            "target_id": "5",
+            "target_type": "creature",
+        }
+
+        with patch("apps.gameplay.tasks.step.apply_async") as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                GameService.process_command(self.game.id, command, "side_a")
+
+        apply_async.assert_not_called()
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.queue, [])
+        self.assertEqual(self.game.state["creatures"]["5"]["health"], 9)
+        self.assertEqual(self.game.state["creatures"]["1"]["health"], 9)
+
+    @override_settings(GAMEPLAY_COMMAND_EXECUTION="inline")
+    def test_inline_execution_leaves_ai_turns_to_celery(self):
+        GameService.step(self.game.id)
+        GameService.process_command(
+            self.game.id, {"type": "cmd_mulligan", "card_ids": []}, "side_a"
+        )
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.state["phase"], "main")
+
+        with patch("apps.gameplay.tasks.step.apply_async") as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                GameService.process_command(
+                    self.game.id, {"type": "cmd_end_turn"}, "side_a"
+                )
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.state["active"], "side_b")
+        self.assertTrue(self.game.queue)
+        apply_async.assert_called_once_with(
+            args=[self.game.id],
+            countdown=GameService._ai_command_delay_seconds(),
+        )
+
 
 class ExtendTimeCommandTests(TestCase):
     """Tests for ranked time extension command behavior."""
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 
@@ -5,7 +7,11 @@ from apps.authentication.models import User
 from apps.builder.models import CardTemplate, HeroTemplate, Title
 from apps.collection.compositions import ensure_deck_revision
 from apps.collection.models import Deck, DeckCard
-from apps.gameplay.models import Game, GameLoadout
+from apps.gameplay.models import CompositionMatchupRecord, Game, GameLoadout
+from apps.gameplay.records import (
+    rebuild_composition_records,
+    record_composition_results,
+)
 from apps.gameplay.services import GameService
 
 
@@ -115,6 +121,8 @@ class CompositionStatsTests(APITestCase):
         else:
             game.winner = None
         game.save(update_fields=["type", "status", "state", "winner"])
+        # Mirror the game-end hook in GameService.step.
+        record_composition_results(game)
         return game
 
     def _stats_url(self, code):
@@ -362,3 +370,87 @@ class CompositionStatsTests(APITestCase):
         self.assertEqual(response.data["global"]["games"], 0)
         self.assertEqual(response.data["global"]["win_rate"], 0.0)
         self.assertIsNone(response.data["attribution"]["first_captured_at"])
+
+    def test_matchup_rollup_counts_each_captured_side(self):
+        first = self._create_game(self.deck_a, self.opponent_x, winner_side="side_a")
+        self._create_game(self.deck_a, self.opponent_x, winner_side="side_b")
+        self._create_game(self.deck_a, self.opponent_x, winner_side=None)
+        composition = first.loadouts.get(side=GameLoadout.SIDE_A).composition
+
+        record = CompositionMatchupRecord.objects.get(
+            composition=composition,
+            game_type=Game.GAME_TYPE_RANKED,
+            hero_slug="hero-a",
+            opponent_hero_slug="hero-x",
+        )
+        self.assertEqual((record.wins, record.losses, record.draws), (1, 1, 1))
+        self.assertEqual(record.title, self.title)
+
+    def test_breakdown_query_count_does_not_grow_with_history(self):
+        first = self._create_game(self.deck_a, self.opponent_x, winner_side="side_a")
+        code = first.loadouts.get(side=GameLoadout.SIDE_A).composition.code
+        self.client.get(self._stats_url(code), {"breakdown": "hero"})
+
+        with CaptureQueriesContext(connection) as single_game:
+            self.client.get(self._stats_url(code), {"breakdown": "hero"})
+        for _ in range(3):
+            self._create_game(self.deck_a, self.opponent_x, winner_side="side_b")
+        with CaptureQueriesContext(connection) as many_games:
+            response = self.client.get(self._stats_url(code), {"breakdown": "hero"})
+
+        self.assertEqual(len(many_games), len(single_game))
+        self.assertEqual(response.data["hero_matchups"][0]["global"]["games"], 4)
+
+    def test_global_stats_read_only_the_rollup(self):
+        first = self._create_game(self.deck_a, self.opponent_x, winner_side="side_a")
+        self._create_game(self.deck_a, self.opponent_y, winner_side="side_b")
+        loadout = first.loadouts.get(side=GameLoadout.SIDE_A)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self._stats_url(loadout.composition.code))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["attribution"]["captured_games"], 2)
+        self.assertEqual(
+            response.data["attribution"]["first_captured_at"],
+            loadout.created_at.isoformat(),
+        )
+        self.assertFalse(
+            any(
+                "gameplay_game_loadout" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    def test_rebuild_composition_records_matches_incremental_rollup(self):
+        self._create_game(self.deck_a, self.opponent_x, winner_side="side_a")
+        self._create_game(self.deck_b, self.opponent_y, winner_side="side_b")
+        self._create_game(
+            self.deck_a,
+            self.opponent_x,
+            game_type=Game.GAME_TYPE_FRIENDLY,
+            winner_side=None,
+        )
+
+        def snapshot():
+            return set(
+                CompositionMatchupRecord.objects.values_list(
+                    "composition_id",
+                    "game_type",
+                    "hero_slug",
+                    "opponent_hero_slug",
+                    "wins",
+                    "losses",
+                    "draws",
+                    "captured_games",
+                    "first_captured_at",
+                )
+            )
+
+        incremental = snapshot()
+        CompositionMatchupRecord.objects.all().delete()
+
+        written = rebuild_composition_records(self.title)
+
+        self.assertEqual(written, len(incremental))
+        self.assertEqual(snapshot(), incremental)
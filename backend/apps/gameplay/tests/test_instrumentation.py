@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from apps.gameplay import instrumentation
+from apps.gameplay.models import GameStepProfile
+from apps.gameplay.services import GameService
+from apps.gameplay.tests import ServiceTestsBase
+
+
+class InstrumentationRegistryTests(SimpleTestCase):
+    def setUp(self):
+        instrumentation.reset()
+
+    def test_spans_and_counters_render_as_prometheus_text(self):
+        with instrumentation.span("gameplay_test", effect="effect_draw"):
+            pass
+        instrumentation.observe("gameplay_slow_seconds", 10)
+        instrumentation.increment("gameplay_test_total", effect="effect_draw")
+        instrumentation.increment("gameplay_test_total", effect="effect_draw")
+
+        text = instrumentation.render_prometheus()
+
+        self.assertIn("# TYPE gameplay_test_total counter", text)
+        self.assertIn('gameplay_test_total{effect="effect_draw"} 2', text)
+        self.assertIn("# TYPE gameplay_test_seconds histogram", text)
+        self.assertIn('gameplay_test_seconds_count{effect="effect_draw"} 1', text)
+        self.assertIn('gameplay_slow_seconds_bucket{le="2.5"} 0', text)
+        self.assertIn('gameplay_slow_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("gameplay_slow_seconds_sum 10", text)
+
+    def test_suppressed_blocks_record_nothing(self):
+        with instrumentation.suppressed():
+            instrumentation.increment("gameplay_test_total")
+            with instrumentation.span("gameplay_test"):
+                pass
+
+        self.assertEqual(instrumentation.render_prometheus(), "")
+
+    @override_settings(GAMEPLAY_INSTRUMENTATION=False)
+    def test_disabled_instrumentation_records_nothing(self):
+        instrumentation.increment("gameplay_test_total")
+
+        self.assertEqual(instrumentation.render_prometheus(), "")
+
+
+class StepInstrumentationTests(ServiceTestsBase):
+    def setUp(self):
+        super().setUp()
+        instrumentation.reset()
+
+    def test_step_records_spans_and_effect_outcomes(self):
+        GameService.step(self.game.id)
+
+        text = instrumentation.render_prometheus()
+        self.assertIn("gameplay_step_seconds_count 1", text)
+        self.assertIn("gameplay_state_save_seconds_count 1", text)
+        self.assertIn("gameplay_broadcast_seconds_count 1", text)
+        self.assertIn(
+            'gameplay_effects_total{effect="effect_start_game",'
+            'outcome="outcome_success"}',
+            text,
+        )
+        self.assertFalse(GameStepProfile.objects.exists())
+
+    def test_flagged_game_steps_are_profiled(self):
+        self.game.profile_until = timezone.now() + timedelta(minutes=5)
+        self.game.save(update_fields=["profile_until"])
+
+        GameService.step(self.game.id)
+
+        profile = GameStepProfile.objects.get(game=self.game)
+        self.assertIn("_resolve_batch", profile.stats)
+        self.assertGreater(profile.duration_ms, 0)
@@ -0,0 +1,37 @@
+from channels.layers import get_channel_layer
+from django.test import TransactionTestCase, override_settings
+
+from apps.gameplay.loadtest import create_players, run_load_test, start_games
+from apps.gameplay.tests import GameFixturesMixin
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    GAMEPLAY_PRESENCE_REDIS_URL="",
+)
+class LoadTestTests(GameFixturesMixin, TransactionTestCase):
+    """Steps are dispatched on commit, so the run needs real transactions."""
+
+    def test_synthetic_players_play_through_the_websocket(self):
+        layer = get_channel_layer()
+        send, group_send = layer.send, layer.group_send
+        players = create_players(2, self.deck_a)
+        start_games(players)
+        self.assertEqual(players[0].game_id, players[1].game_id)
+        self.assertEqual([player.side for player in players], ["side_a", "side_b"])
+
+        report = run_load_test(players, max_commands=5, seed=1)
+
+        self.assertEqual(report["games"], 1)
+        self.assertEqual(report["connect_latency"]["count"], 2)
+        self.assertGreater(report["commands_sent"], 0)
+        self.assertEqual(report["stalls"], 0)
+        self.assertEqual(report["games_finished"], 1)
+        self.assertEqual(
+            report["command_latency"]["count"] + report["commands_rejected"],
+            report["commands_sent"],
+        )
+        self.assertGreater(report["database"]["queries"], 0)
+        self.assertGreater(report["channel_layer"]["messages"], 0)
+        # The shared channel layer stops counting once the run is over.
+        self.assertEqual((layer.send, layer.group_send), (send, group_send))
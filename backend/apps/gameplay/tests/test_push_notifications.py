@@ -1,6 +1,7 @@
 from types import SimpleNamespace
 from unittest.mock import MagicMock, Mock, patch
 
+from django.conf import settings
 from django.test import TestCase
 from rest_framework.test import APIClient
 
@@ -14,6 +15,12 @@ from apps.gameplay.models import (
     PushDevice,
     PushNotificationEvent,
 )
+from apps.gameplay.presence import (
+    is_user_live_in_game,
+    live_users_in_games,
+    mark_game_connection_active,
+    presence_refresh_due,
+)
 from apps.gameplay.push import (
     APNsClient,
     enqueue_friend_challenge_notification,
@@ -102,6 +109,68 @@ class APNsClientTests(TestCase):
         self.assertEqual(payload["aps"]["badge"], 3)
 
 
+class GamePresenceTests(TestCase):
+    def setUp(self):
+        self.redis = MagicMock()
+        self.pipeline = self.redis.pipeline.return_value
+        patcher = patch(
+            "apps.gameplay.presence._get_redis_client", return_value=self.redis
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_mark_active_writes_in_one_pipelined_round_trip(self):
+        mark_game_connection_active(
+            game_id=7, user_id=3, side="side_a", channel_name="chan"
+        )
+
+        self.redis.pipeline.assert_called_once_with(transaction=False)
+        self.pipeline.zadd.assert_called_once()
+        self.pipeline.expire.assert_called_once()
+        self.pipeline.execute.assert_called_once_with()
+        self.redis.zadd.assert_not_called()
+
+    def test_live_check_is_a_single_command(self):
+        self.redis.zcount.return_value = 1
+
+        self.assertTrue(is_user_live_in_game(game_id=7, user_id=3, side="side_a"))
+        self.redis.zcount.assert_called_once()
+        self.redis.zremrangebyscore.assert_not_called()
+
+    def test_bulk_live_check_pipelines_every_entry(self):
+        self.pipeline.execute.return_value = [1, 0, 2]
+        entries = [(1, 10, "side_a"), (2, 20, "side_b"), (3, 30, "side_a")]
+
+        live = live_users_in_games(entries)
+
+        self.assertEqual(live, {(1, 10, "side_a"), (3, 30, "side_a")})
+        self.assertEqual(self.pipeline.zcount.call_count, 3)
+        self.pipeline.execute.assert_called_once_with()
+
+    def test_heartbeat_refresh_is_coalesced_per_interval(self):
+        with self.settings(GAMEPLAY_PRESENCE_REFRESH_INTERVAL_SECONDS=30):
+            self.assertTrue(presence_refresh_due(None, 100.0))
+            self.assertFalse(presence_refresh_due(100.0, 120.0))
+            self.assertTrue(presence_refresh_due(100.0, 130.0))
+
+    def test_default_refresh_skips_on_time_pings_and_survives_a_late_one(self):
+        # Clients ping every 30s; an on-time ping right after a refresh is
+        # coalesced away.
+        self.assertFalse(presence_refresh_due(0.0, 30.0))
+
+        # The ping at 30s is skipped and the next one arrives 40s late.
+        refreshed_at = None
+        longest_gap = 0.0
+        for now in (0.0, 30.0, 100.0):
+            if presence_refresh_due(refreshed_at, now):
+                if refreshed_at is not None:
+                    longest_gap = max(longest_gap, now - refreshed_at)
+                refreshed_at = now
+
+        self.assertEqual(refreshed_at, 100.0)
+        self.assertLess(longest_gap, settings.GAMEPLAY_PRESENCE_TTL_SECONDS)
+
+
 class PushNotificationTriggerTests(TestCase):
     def setUp(self):
         self.user_a = User.objects.create_user(
@@ -4,7 +4,8 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 
 from apps.builder.models import CardTemplate, CardTrait, HeroTemplate, Title
-from apps.gameplay.models import Game
+from apps.gameplay.models import Game, PrewarmedScenarioGame
+from apps.gameplay.prewarm import refill_scenario_games
 from apps.gameplay.scenarios import ScenarioGameService
 from apps.gameplay.schemas.game import GameState
 from apps.gameplay.services import GameService
@@ -538,3 +539,20 @@ class IntroScenarioTests(TestCase):
         self.assertFalse(buffed_recruit.exhausted)
         self.assertEqual(state.heroes["side_b"].health, 6)
         self.assertEqual(self.slugs_for(state, state.graveyard["side_a"]), ["sharpen"])
+
+    @override_settings(GAMEPLAY_PREWARM_POOL_SIZE=1)
+    def test_start_scenario_claims_a_prewarmed_game(self):
+        self.assertEqual(refill_scenario_games("intro-archetype-v1", size=1), 1)
+        pooled = PrewarmedScenarioGame.objects.get()
+
+        game, token = ScenarioGameService.start_scenario("intro-archetype-v1")
+
+        self.assertEqual(game.pk, pooled.game_id)
+        self.assertTrue(game.allows_guest_access(token))
+        # The claim ran the opening step instead of leaving it to Celery.
+        self.assertEqual(game.status, Game.GAME_STATUS_IN_PROGRESS)
+        self.assertEqual(game.game_state.turn, 1)
+        self.assertFalse(PrewarmedScenarioGame.objects.exists())
+
+        next_game, _ = ScenarioGameService.start_scenario("intro-archetype-v1")
+        self.assertNotEqual(next_game.pk, game.pk)
@@ -3,15 +3,25 @@ Tests for GameService - game initialization and high-level operations.
 """
 
 from copy import deepcopy
+from io import StringIO
+from unittest import skipUnless
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
 
 from apps.authentication.models import User
 from apps.builder.models import CardTemplate, HeroTemplate, Title
 from apps.collection.models import Deck, DeckCard
 from apps.collection.validation import DeckValidationError
-from apps.gameplay.models import Game, GameUpdate, MatchmakingQueue, PlayerNotification
+from apps.gameplay.models import (
+    Game,
+    GameUpdate,
+    MatchmakingQueue,
+    PlayerNotification,
+    PrewarmedPveGame,
+)
+from apps.gameplay.prewarm import refill_prewarmed_pools
 from apps.gameplay.schemas.effects import DamageEffect, DrawEffect
 from apps.gameplay.services import GameService
 from apps.gameplay.tests import ServiceTestsBase
@@ -40,6 +50,47 @@ class ServiceTests(ServiceTestsBase):
         self.assertEqual(len(game.queue), 1)
         self.assertEqual(game.queue[0]["type"], "effect_start_game")
 
+    def test_create_game_reads_ai_decks_without_locking_them(self):
+        from apps.gameplay import services
+
+        revision_b = Deck.objects.get(pk=self.deck_b.pk).current_revision
+        with patch.object(
+            services,
+            "ensure_deck_revision",
+            wraps=services.ensure_deck_revision,
+        ) as ensure:
+            game = GameService.create_game(
+                self.deck_a, self.deck_b, reuse_active_game=False
+            )
+
+        self.assertEqual(
+            [call.args[0].pk for call in ensure.call_args_list], [self.deck_a.pk]
+        )
+        self.assertEqual(game.loadouts.get(side="side_b").source_revision, revision_b)
+
+        # A changed AI deck falls back to the locked revision check.
+        with self.captureOnCommitCallbacks(execute=True):
+            DeckCard.objects.filter(deck=self.deck_b).first().delete()
+        with patch.object(
+            services,
+            "ensure_deck_revision",
+            wraps=services.ensure_deck_revision,
+        ) as ensure:
+            game = GameService.create_game(
+                self.deck_a, self.deck_b, reuse_active_game=False
+            )
+        self.assertEqual(ensure.call_count, 2)
+        loadout = game.loadouts.get(side="side_b")
+        self.assertNotEqual(loadout.source_revision, revision_b)
+        self.assertEqual(
+            loadout.source_revision,
+            Deck.objects.get(pk=self.deck_b.pk).current_revision,
+        )
+        self.assertEqual(
+            loadout.source_revision.composition.total_cards,
+            revision_b.composition.total_cards - 1,
+        )
+
     def test_record_action_decision_includes_training_observation(self):
         game_state = self.game.game_state
 
@@ -115,6 +166,202 @@ class ServiceTests(ServiceTestsBase):
         self.assertIsNone(updates[-1]["reason"])
 
 
+class RulesetIdTests(ServiceTestsBase):
+    def test_create_game_uses_the_stored_ruleset_id(self):
+        from apps.gameplay.agents.ruleset import compute_ruleset_id
+
+        self.title.refresh_from_db()
+        stored_id = self.title.ruleset_id
+        self.assertEqual(stored_id, compute_ruleset_id(self.title))
+        self.assertEqual(self.game.ruleset_id, stored_id)
+
+        # Direct row edits skip the content-version bump, so the stored id is
+        # reused as-is rather than recomputed per game.
+        CardTemplate.objects.filter(title=self.title, slug="card-0").update(cost=3)
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+        self.assertEqual(game.ruleset_id, stored_id)
+
+        self.title.bump_content_version()
+        self.assertNotEqual(self.title.ruleset_id, stored_id)
+        self.assertEqual(self.title.ruleset_id, compute_ruleset_id(self.title))
+
+    def test_check_command_flags_and_fixes_drift(self):
+        from django.core.management import CommandError, call_command
+
+        from apps.gameplay.agents.ruleset import compute_ruleset_id
+
+        CardTemplate.objects.filter(title=self.title, slug="card-0").update(cost=3)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "check_ruleset_ids", "--title", self.title.slug, stdout=StringIO()
+            )
+
+        call_command(
+            "check_ruleset_ids", "--title", self.title.slug, "--fix", stdout=StringIO()
+        )
+        self.title.refresh_from_db()
+        self.assertEqual(self.title.ruleset_id, compute_ruleset_id(self.title))
+
+
+class TitleCardCatalogTests(ServiceTestsBase):
+    def setUp(self):
+        super().setUp()
+        from apps.builder.models import CardTrait
+
+        self.egg = CardTemplate.objects.create(
+            title=self.title, slug="egg", name="Egg", cost=0, attack=0, health=1
+        )
+        summoner = CardTemplate.objects.create(
+            title=self.title, slug="summoner", name="Summoner", cost=1
+        )
+        CardTrait.objects.create(
+            card=summoner,
+            trait_slug="battlecry",
+            data={"actions": [{"action": "summon", "target": "egg"}]},
+        )
+        DeckCard.objects.create(deck=self.deck_a, card=summoner)
+        self.title.bump_content_version()
+
+    def _summonable_queries(self, context):
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if "builder_cardtemplate" in query["sql"] and "'egg'" in query["sql"]
+        ]
+
+    def test_create_game_reads_cards_from_the_title_catalog(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+        self.assertEqual(game.state["summonable_cards"]["egg"]["health"], 1)
+
+        with CaptureQueriesContext(connection) as context:
+            game = GameService.create_game(
+                self.deck_a, self.deck_b, reuse_active_game=False
+            )
+
+        self.assertEqual(self._summonable_queries(context), [])
+        self.assertIn("egg", game.state["summonable_cards"])
+
+    def test_content_version_bump_rebuilds_the_catalog(self):
+        GameService.create_game(self.deck_a, self.deck_b, reuse_active_game=False)
+
+        CardTemplate.objects.filter(pk=self.egg.pk).update(health=4)
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+        self.assertEqual(game.state["summonable_cards"]["egg"]["health"], 1)
+
+        self.title.bump_content_version()
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+        self.assertEqual(game.state["summonable_cards"]["egg"]["health"], 4)
+
+    def test_summon_targets_are_scoped_to_the_title(self):
+        other_title = Title.objects.create(slug="other", author=self.user)
+        CardTemplate.objects.create(
+            title=other_title, slug="egg", name="Other Egg", cost=0, health=9
+        )
+        self.title.bump_content_version()
+
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+        self.assertEqual(game.state["summonable_cards"]["egg"]["name"], "Egg")
+
+
+@override_settings(GAMEPLAY_PREWARM_POOL_SIZE=1)
+class PrewarmedPveGameTests(ServiceTestsBase):
+    def setUp(self):
+        super().setUp()
+        # Only started games count towards an AI deck's popularity.
+        Game.objects.filter(pk=self.game.pk).update(status=Game.GAME_STATUS_IN_PROGRESS)
+
+    def test_refill_seats_only_the_ai_deck_of_recently_played_decks(self):
+        self.assertEqual(refill_prewarmed_pools(), 2)
+
+        entries = PrewarmedPveGame.objects.filter(ai_deck=self.deck_b)
+        self.assertEqual(
+            sorted(entries.values_list("ai_side", flat=True)), ["side_a", "side_b"]
+        )
+        entry = entries.get(ai_side="side_b")
+        self.assertEqual(entry.game.status, Game.GAME_STATUS_INIT)
+        self.assertEqual(
+            list(entry.game.loadouts.values_list("side", "source_deck")),
+            [("side_b", self.deck_b.pk)],
+        )
+        self.assertEqual(list(entry.game.state["heroes"]), ["side_b"])
+        self.assertEqual(len(entry.game.state["decks"]["side_b"]), 4)
+        self.assertEqual(entry.game.state["decks"]["side_a"], [])
+        self.assertEqual(refill_prewarmed_pools(), 0)
+
+    def test_create_game_seats_the_player_and_runs_the_opening(self):
+        refill_prewarmed_pools()
+        entry = PrewarmedPveGame.objects.get(ai_deck=self.deck_b, ai_side="side_b")
+        ai_deck_order = entry.game.state["decks"]["side_b"]
+
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False, prewarmed=True
+        )
+
+        self.assertEqual(game.pk, entry.game_id)
+        self.assertFalse(PrewarmedPveGame.objects.filter(pk=entry.pk).exists())
+        self.assertEqual((game.side_a, game.side_b), (self.deck_a, self.deck_b))
+        self.assertEqual(game.player_a_user, self.user)
+        self.assertEqual(
+            sorted(game.loadouts.values_list("side", "source_deck")),
+            [("side_a", self.deck_a.pk), ("side_b", self.deck_b.pk)],
+        )
+        # The opening step ran in the claim: both sides drew from their decks.
+        self.assertEqual(game.status, Game.GAME_STATUS_IN_PROGRESS)
+        self.assertEqual(game.queue, [])
+        state = game.game_state
+        self.assertEqual(state.phase, "mulligan")
+        self.assertEqual(state.heroes["side_a"].name, "Hero A")
+        self.assertEqual(len(state.mulligan_options["side_a"]), 3)
+        self.assertEqual(
+            state.mulligan_options["side_b"] + state.decks["side_b"], ai_deck_order
+        )
+        card_ids = (
+            state.mulligan_options["side_a"]
+            + state.decks["side_a"]
+            + state.mulligan_options["side_b"]
+            + state.decks["side_b"]
+        )
+        self.assertEqual(len(set(card_ids)), 8)
+
+    def test_create_game_only_claims_when_asked(self):
+        refill_prewarmed_pools()
+
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False
+        )
+
+        self.assertEqual(game.status, Game.GAME_STATUS_INIT)
+        self.assertEqual(PrewarmedPveGame.objects.count(), 2)
+
+    def test_stale_entries_are_not_claimed_and_are_pruned(self):
+        refill_prewarmed_pools()
+        stale_game_ids = set(PrewarmedPveGame.objects.values_list("game_id", flat=True))
+        self.title.bump_content_version()
+
+        game = GameService.create_game(
+            self.deck_a, self.deck_b, reuse_active_game=False, prewarmed=True
+        )
+        self.assertNotIn(game.pk, stale_game_ids)
+
+        refill_prewarmed_pools()
+        self.assertFalse(Game.objects.filter(pk__in=stale_game_ids).exists())
+        self.assertEqual(PrewarmedPveGame.objects.count(), 2)
+
+
 class MatchmakingTests(TestCase):
     """Tests for matchmaking functionality."""
 
@@ -173,6 +420,52 @@ class MatchmakingTests(TestCase):
             DeckCard.objects.create(deck=self.deck_a2, card=card)
             DeckCard.objects.create(deck=self.deck_b2, card=card)
 
+    def test_matchmaking_reuses_validation_verdicts_from_deck_revisions(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from apps.collection.compositions import ensure_deck_revision
+
+        revision, _ = ensure_deck_revision(self.deck_a)
+        MatchmakingQueue.objects.create(
+            user=self.user_a,
+            deck=self.deck_a,
+            elo_rating=1500,
+            status=MatchmakingQueue.STATUS_QUEUED,
+            ladder_type=Game.LADDER_TYPE_DAILY,
+        )
+
+        GameService.process_matchmaking(self.title.id, Game.LADDER_TYPE_DAILY)
+        revision.refresh_from_db()
+        self.assertEqual(revision.validated_content_version, 1)
+        self.assertEqual(revision.validation_error, "")
+
+        with CaptureQueriesContext(connection) as context:
+            GameService.process_matchmaking(self.title.id, Game.LADDER_TYPE_DAILY)
+        self.assertFalse(
+            any(
+                "collection_deckcard" in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    def test_content_version_bump_revalidates_deck_revisions(self):
+        from apps.collection.compositions import ensure_deck_revision
+        from apps.collection.validation import validate_deck_for_play
+
+        ensure_deck_revision(self.deck_a)
+        self.assertIsNone(validate_deck_for_play(self.deck_a))
+
+        self.title.config = {"min_cards_in_deck": 5}
+        self.title.save(update_fields=["config"])
+        self.assertIsNone(validate_deck_for_play(self.deck_a))
+
+        self.title.bump_content_version()
+        self.assertEqual(
+            validate_deck_for_play(self.deck_a),
+            "Deck must have at least 5 cards (4 currently)",
+        )
+
     def test_prevent_duplicate_daily_ranked_games(self):
         """Test that two players cannot have multiple active daily ranked games."""
         # Create an existing active daily ranked game between user_a and user_b
@@ -829,3 +1122,165 @@ class RankedGameAbortTests(TestCase):
 
         # Verify no ELO change for friendly games regardless
         self.assertFalse(ELORatingChange.objects.filter(game=game).exists())
+
+
+class RatingLedgerTests(TestCase):
+    """Tests for the ELO rating ledger service."""
+
+    setUp = RankedGameAbortTests.setUp
+
+    def _ended_ranked_game(self, winner_side="side_a"):
+        game = GameService.create_game(
+            self.deck_a,
+            self.deck_b,
+            randomize_starting_player=False,
+            reuse_active_game=False,
+        )
+        game.type = Game.GAME_TYPE_RANKED
+        game.ladder_type = Game.LADDER_TYPE_DAILY
+        game.status = Game.GAME_STATUS_ENDED
+        game.winner = getattr(game, winner_side)
+        game.save()
+        return game
+
+    def test_rating_changes_fold_into_current_ratings(self):
+        from apps.gameplay.models import ELORatingChange, UserTitleRating
+
+        first = self._ended_ranked_game("side_a")
+        second = self._ended_ranked_game("side_a")
+        GameService._update_elo_ratings(first)
+        GameService._update_elo_ratings(second)
+        GameService._update_elo_ratings(second)
+
+        ledger = ELORatingChange.objects.order_by("id")
+        self.assertEqual(ledger.count(), 2)
+        self.assertEqual(ledger[1].winner_old_rating, ledger[0].winner_new_rating)
+        rating_a = UserTitleRating.objects.get(
+            user=self.user_a, title=self.title, ladder_type=Game.LADDER_TYPE_DAILY
+        )
+        self.assertEqual(rating_a.elo_rating, ledger[1].winner_new_rating)
+
+    @skipUnless(connection.vendor == "postgresql", "checks Postgres row locks")
+    def test_ratings_are_locked_in_primary_key_order(self):
+        from django.test.utils import CaptureQueriesContext
+
+        game = self._ended_ranked_game("side_b")
+
+        with CaptureQueriesContext(connection) as queries:
+            GameService._update_elo_ratings(game)
+
+        locks = [q["sql"] for q in queries if "FOR UPDATE" in q["sql"]]
+        self.assertEqual(len(locks), 1)
+        self.assertIn('ORDER BY "gameplay_user_title_rating"."id" ASC', locks[0])
+
+    def test_replay_rebuilds_ratings_after_removing_disputed_entry(self):
+        from apps.gameplay.models import ELORatingChange, UserTitleRating
+        from apps.gameplay.ratings import DEFAULT_ELO_RATING, replay_ratings
+
+        disputed = self._ended_ranked_game("side_b")
+        kept = self._ended_ranked_game("side_a")
+        GameService._update_elo_ratings(disputed)
+        GameService._update_elo_ratings(kept)
+
+        ELORatingChange.objects.filter(game=disputed).delete()
+        replayed = replay_ratings(self.title, Game.LADDER_TYPE_DAILY)
+
+        self.assertEqual(replayed, 1)
+        change = ELORatingChange.objects.get(game=kept)
+        self.assertEqual(change.winner_old_rating, DEFAULT_ELO_RATING)
+        self.assertEqual(change.loser_old_rating, DEFAULT_ELO_RATING)
+        ratings = dict(
+            UserTitleRating.objects.filter(
+                title=self.title, ladder_type=Game.LADDER_TYPE_DAILY
+            ).values_list("user_id", "elo_rating")
+        )
+        self.assertEqual(
+            ratings,
+            {
+                self.user_a.id: change.winner_new_rating,
+                self.user_b.id: change.loser_new_rating,
+            },
+        )
+
+
+class TurnExpiryTests(TestCase):
+    """Tests for the batched expiry sweep and per-game turn expiry wake-ups."""
+
+    setUp = RankedGameAbortTests.setUp
+
+    def _main_phase_game(self, expires_in):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        game = GameService.create_game(
+            self.deck_a,
+            self.deck_b,
+            randomize_starting_player=False,
+            reuse_active_game=False,
+        )
+        game.type = Game.GAME_TYPE_FRIENDLY
+        game.status = Game.GAME_STATUS_IN_PROGRESS
+        game_state = game.game_state
+        game_state.turn = 2
+        game_state.active = "side_a"
+        game_state.phase = "main"
+        game_state.time_per_turn = 60
+        game.state = game_state.model_dump()
+        game.queue = []
+        game.turn_expires = timezone.now() + timedelta(seconds=expires_in)
+        game.save()
+        return game
+
+    def test_sweep_does_not_queue_duplicate_concedes(self):
+        game = self._main_phase_game(expires_in=-10)
+
+        GameService.check_expired_turns()
+        GameService.check_expired_turns()
+
+        game.refresh_from_db()
+        self.assertEqual(
+            [item["type"] for item in game.queue],
+            ["effect_concede"],
+        )
+
+    def test_sweep_walks_all_batches(self):
+        games = [self._main_phase_game(expires_in=-10) for _ in range(3)]
+        pending = self._main_phase_game(expires_in=60)
+
+        result = GameService.check_expired_turns(batch_size=2)
+
+        self.assertEqual(result, "Checked 3 games for expired turns")
+        for game in games:
+            game.refresh_from_db()
+            self.assertEqual(game.queue[0]["type"], "effect_concede")
+        pending.refresh_from_db()
+        self.assertEqual(pending.queue, [])
+
+    def test_expire_turn_ignores_unexpired_game(self):
+        game = self._main_phase_game(expires_in=60)
+
+        self.assertFalse(GameService.expire_turn(game.id))
+
+        game.refresh_from_db()
+        self.assertEqual(game.queue, [])
+
+    def test_wakeup_scheduled_at_turn_deadline(self):
+        game = self._main_phase_game(expires_in=60)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            GameService._schedule_turn_expiry_wakeup(game)
+
+        with patch("apps.gameplay.tasks.expire_turn.apply_async") as apply_async:
+            for callback in callbacks:
+                callback()
+
+        apply_async.assert_called_once_with(args=[game.id], eta=game.turn_expires)
+
+    def test_wakeup_skipped_beyond_horizon(self):
+        game = self._main_phase_game(expires_in=60 * 60 * 24)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            GameService._schedule_turn_expiry_wakeup(game)
+
+        self.assertEqual(callbacks, [])
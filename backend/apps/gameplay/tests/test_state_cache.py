@@ -0,0 +1,184 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.gameplay import state_cache
+from apps.gameplay.models import Game
+from apps.gameplay.schemas.effects import EndTurnEffect
+from apps.gameplay.schemas.events import EndTurnEvent
+from apps.gameplay.services import GameService
+from apps.gameplay.tests import ServiceTestsBase
+
+
+class HotGameStateTests(ServiceTestsBase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        state_cache.forget_local_state(self.game.id)
+
+    def _step(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            GameService.step(self.game.id)
+        self.game.refresh_from_db()
+
+    def _start_main_phase(self):
+        self._step()
+        GameService.process_command(
+            self.game.id, {"type": "cmd_mulligan", "card_ids": []}, "side_a"
+        )
+        self._step()
+        self.assertEqual(self.game.state["phase"], "main")
+
+    def _attack(self):
+        self.game.state["creatures"] = {
+            creature_id: {
+                "creature_id": creature_id,
+                "card_id": f"card_{creature_id}",
+                "name": f"Test Creature {creature_id}",
+                "attack": 1,
+                "health": 10,
+                "exhausted": False,
+                "traits": [],
+            }
+            for creature_id in ("1", "5")
+        }
+        self.game.state["board"]["side_a"].append("1")
+        self.game.state["board"]["side_b"].append("5")
+        self.game.save()
+        GameService.process_command(
+            self.game.id,
+            {
+                "type": "cmd_attack",
+                "card_id": "1",
+                "target_id": "5",
+                "target_type": "creature",
+            },
+            "side_a",
+        )
+        self._step()
+
+    def _save_hot_state(self, queue, events=()):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                game = Game.objects.select_for_update().get(id=self.game.id)
+                game_state = state_cache.load_game_state(game, take=True)
+                game.queue = queue
+                state_cache.save_game_state(game, game_state, events=events)
+        self.game.refresh_from_db()
+
+    @skipUnless(connection.vendor == "postgresql", "checks Postgres row locks")
+    def test_next_step_reuses_the_hot_state(self):
+        self._step()
+        self.assertTrue(state_cache.has_local_state(self.game.id))
+        self.assertEqual(self.game.state_version, self.game.state_flushed_version)
+
+        with CaptureQueriesContext(connection) as context:
+            self._step()
+
+        lock_query = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "FOR UPDATE" in query["sql"]
+        )
+        self.assertNotIn('"gameplay_game"."state",', lock_query)
+        self.assertEqual(self.game.state["phase"], "mulligan")
+
+    def test_direct_state_writes_invalidate_the_hot_state(self):
+        self._step()
+        self.game.state["heroes"]["side_a"]["health"] = 3
+        self.game.save()
+
+        self._step()
+
+        self.assertEqual(self.game.state["heroes"]["side_a"]["health"], 3)
+
+    @override_settings(GAMEPLAY_STATE_WRITE_BEHIND=True)
+    def test_write_behind_defers_the_state_until_a_boundary(self):
+        self._start_main_phase()
+        self._attack()
+
+        self.assertNotEqual(self.game.state_version, self.game.state_flushed_version)
+        self.assertEqual(self.game.state["creatures"]["5"]["health"], 10)
+        self.assertEqual(self.game.game_state.creatures["5"].health, 9)
+
+        GameService.process_command(self.game.id, {"type": "cmd_end_turn"}, "side_a")
+        # Stop before the AI's reply so the end-of-turn step is the last one.
+        with patch("apps.gameplay.tasks.step.apply_async"):
+            self._step()
+
+        self.assertEqual(self.game.state_version, self.game.state_flushed_version)
+        self.assertEqual(self.game.state["creatures"]["5"]["health"], 9)
+
+    @override_settings(GAMEPLAY_STATE_WRITE_BEHIND=True)
+    def test_lost_hot_state_is_recovered_from_recorded_actions(self):
+        self._start_main_phase()
+        self._attack()
+        version = self.game.state_version
+
+        cache.clear()
+        state_cache.forget_local_state(self.game.id)
+
+        self.assertEqual(self.game.game_state.creatures["5"].health, 9)
+        self.game.refresh_from_db()
+        self.assertNotEqual(self.game.state_flushed_version, version)
+
+        self._step()
+        self.assertEqual(self.game.state["creatures"]["5"]["health"], 9)
+        self.assertEqual(self.game.state["creatures"]["1"]["health"], 9)
+
+    @override_settings(GAMEPLAY_STATE_WRITE_BEHIND=True)
+    def test_boundaries_reached_mid_queue_flush_once_it_drains(self):
+        self._start_main_phase()
+        queued = [EndTurnEffect(side="side_a").model_dump(mode="json")]
+
+        self._save_hot_state(queued, events=[EndTurnEvent(side="side_a")])
+        self.assertNotEqual(self.game.state_version, self.game.state_flushed_version)
+
+        self._save_hot_state([])
+        self.assertEqual(self.game.state_version, self.game.state_flushed_version)
+
+    @override_settings(GAMEPLAY_STATE_WRITE_BEHIND=True)
+    def test_recovery_without_replayed_actions_keeps_the_queue(self):
+        self._start_main_phase()
+        queued = [EndTurnEffect(side="side_a").model_dump(mode="json")]
+        self._save_hot_state(queued)
+
+        cache.clear()
+        state_cache.forget_local_state(self.game.id)
+        with transaction.atomic():
+            game = Game.objects.select_for_update().get(id=self.game.id)
+            state_cache.load_game_state(game, take=True)
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.state_version, self.game.state_flushed_version)
+        self.assertEqual(self.game.queue, queued)
+
+    @override_settings(GAMEPLAY_STATE_WRITE_BEHIND=True)
+    def test_full_saves_during_a_write_behind_window_keep_the_hot_state(self):
+        self._start_main_phase()
+        self._attack()
+        version = self.game.state_version
+        self.assertNotEqual(version, self.game.state_flushed_version)
+
+        # Like an admin edit: the whole row, stale state column included.
+        game = Game.objects.get(id=self.game.id)
+        game.guest_access_side = "side_b"
+        game.save()
+
+        game = Game.objects.get(id=self.game.id)
+        self.assertEqual(game.guest_access_side, "side_b")
+        self.assertEqual(game.state_version, version)
+        self.assertEqual(game.game_state.creatures["5"].health, 9)
+
+        # A changed state is still a state write.
+        game.state["heroes"]["side_a"]["health"] = 3
+        game.save()
+
+        game.refresh_from_db()
+        self.assertNotEqual(game.state_version, version)
+        self.assertEqual(game.state_version, game.state_flushed_version)
+        self.assertEqual(game.game_state.heroes["side_a"].health, 3)
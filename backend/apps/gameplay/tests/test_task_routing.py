@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from django.db import DatabaseError
+from django.test import SimpleTestCase, override_settings
+
+from apps.gameplay.services import DEFAULT_STEP_DELAY_SECONDS, GameService
+from apps.gameplay.task_routing import (
+    jump_consistent_hash,
+    route_game_task,
+    step_queue_for_game,
+)
+from apps.gameplay.tests import ServiceTestsBase
+
+
+class StepRoutingTests(SimpleTestCase):
+    def test_routing_is_disabled_without_queues(self):
+        self.assertIsNone(step_queue_for_game(42))
+        self.assertIsNone(route_game_task("apps.gameplay.tasks.step", [42], {}, {}))
+
+    @override_settings(GAMEPLAY_STEP_QUEUE_COUNT=4)
+    def test_game_tasks_are_routed_to_the_game_queue(self):
+        queue = step_queue_for_game(42)
+        self.assertIn(queue, {f"gameplay-step-{index}" for index in range(4)})
+
+        self.assertEqual(
+            route_game_task("apps.gameplay.tasks.step", [42], {}, {}),
+            {"queue": queue},
+        )
+        self.assertEqual(
+            route_game_task("apps.gameplay.tasks.expire_turn", [], {"game_id": 42}, {}),
+            {"queue": queue},
+        )
+        self.assertIsNone(
+            route_game_task("apps.gameplay.tasks.process_matchmaking", [42], {}, {})
+        )
+
+    def test_adding_a_queue_moves_few_games(self):
+        moved = sum(
+            jump_consistent_hash(game_id, 8) != jump_consistent_hash(game_id, 9)
+            for game_id in range(9000)
+        )
+        # Ideal is 1/9 of the games; modulo hashing would move about 8/9.
+        self.assertLess(moved, 1500)
+
+
+class LockedStepTests(ServiceTestsBase):
+    def test_locked_game_step_is_retried_instead_of_dropped(self):
+        with (
+            patch(
+                "apps.gameplay.services.Game.objects.select_for_update"
+            ) as select_for_update,
+            patch("apps.gameplay.tasks.step.apply_async") as apply_async,
+        ):
+            select_for_update.return_value.get.side_effect = DatabaseError
+            GameService.step(self.game.id)
+
+        apply_async.assert_called_once_with(
+            args=[self.game.id], countdown=DEFAULT_STEP_DELAY_SECONDS
+        )
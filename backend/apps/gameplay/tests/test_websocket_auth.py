@@ -0,0 +1,91 @@
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.gameplay.consumers import clear_access_cache
+from apps.gameplay.loadtest import websocket_application
+from apps.gameplay.middleware import TokenUser, get_user_from_token
+from apps.gameplay.tests import GameFixturesMixin, User
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    GAMEPLAY_PRESENCE_REDIS_URL="",
+)
+class WebSocketAuthTests(GameFixturesMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_access_cache()
+        self.application = websocket_application()
+
+    def _connect(self, user, path=None):
+        url = f"{path or f'/ws/game/{self.game.id}/'}?token="
+
+        async def connect():
+            communicator = WebsocketCommunicator(
+                self.application, f"{url}{AccessToken.for_user(user)}"
+            )
+            connected, _ = await communicator.connect()
+            # The user channel sends nothing until there is news.
+            message = None
+            if connected and path is None:
+                message = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return connected, message
+
+        with CaptureQueriesContext(connection) as context:
+            connected, message = async_to_sync(connect)()
+        return connected, message, [query["sql"] for query in context]
+
+    def test_token_user_comes_from_claims(self):
+        token = str(AccessToken.for_user(self.user))
+        with self.assertNumQueries(0):
+            user = get_user_from_token(token)
+            self.assertIsInstance(user, TokenUser)
+            self.assertTrue(user.is_authenticated)
+            self.assertEqual(user.id, self.user.id)
+
+        self.assertEqual(user.email, self.user.email)
+
+    def test_invalid_token_is_anonymous(self):
+        self.assertFalse(get_user_from_token("not-a-token").is_authenticated)
+
+    def test_participant_connects_without_loading_users(self):
+        connected, message, queries = self._connect(self.user)
+
+        self.assertTrue(connected)
+        self.assertEqual(message["type"], "game_updates")
+        self.assertFalse(any('FROM "auth_user"' in sql for sql in queries), queries)
+        self.assertEqual(
+            sum('FROM "gameplay_game"' in sql for sql in queries), 1, queries
+        )
+
+    def test_denials_are_cached(self):
+        stranger = User.objects.create_user(
+            email="stranger@example.com", username="stranger"
+        )
+        connected, _, queries = self._connect(stranger)
+        self.assertFalse(connected)
+        self.assertTrue(queries)
+
+        connected, _, queries = self._connect(stranger)
+        self.assertFalse(connected)
+        self.assertEqual(queries, [])
+
+    def test_staff_connect_as_spectators(self):
+        staff = User.objects.create_user(
+            email="staff@example.com", username="staff", is_staff=True
+        )
+        connected, message, _ = self._connect(staff)
+
+        self.assertTrue(connected)
+        self.assertIsNotNone(message["state"])
+
+    def test_user_channel_needs_no_queries(self):
+        connected, _, queries = self._connect(self.user, path="/ws/user/")
+
+        self.assertTrue(connected)
+        self.assertEqual(queries, [])
@@ -0,0 +1,99 @@
+from asgiref.sync import async_to_sync
+from autobahn.websocket.compress import (
+    PerMessageDeflateOffer,
+    PerMessageDeflateOfferAccept,
+)
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.gameplay.consumers import clear_access_cache
+from apps.gameplay.loadtest import websocket_application
+from apps.gameplay.tests import GameFixturesMixin
+from apps.gameplay.wire import CardCatalogEncoder
+from config.websocket_server import accept_permessage_deflate
+
+
+def _expand(state: dict, catalog: dict) -> dict:
+    cards = {}
+    for card_id, card in state["cards"].items():
+        fields = {key: value for key, value in card.items() if key != "ref"}
+        cards[card_id] = {**catalog[card["ref"]], **fields}
+    return {**state, "cards": cards}
+
+
+class CardCatalogEncoderTests(SimpleTestCase):
+    def setUp(self):
+        card = {
+            "card_type": "creature",
+            "template_slug": "wolf",
+            "name": "Wolf",
+            "description": "A wolf.",
+            "attack": 2,
+            "health": 2,
+            "traits": [{"type": "charge"}],
+            "exhausted": True,
+        }
+        self.state = {
+            "turn": 1,
+            "cards": {
+                "1": {**card, "card_id": "1"},
+                "2": {**card, "card_id": "2", "exhausted": False},
+                "3": {**card, "card_id": "3", "attack": 3},
+            },
+        }
+
+    def test_static_card_data_is_sent_once(self):
+        encoder = CardCatalogEncoder()
+
+        state, catalog = encoder.encode_state(self.state)
+
+        self.assertEqual(len(catalog), 2)
+        self.assertEqual(state["cards"]["1"]["ref"], state["cards"]["2"]["ref"])
+        self.assertNotEqual(state["cards"]["1"]["ref"], state["cards"]["3"]["ref"])
+        self.assertEqual(set(state["cards"]["2"]), {"card_id", "exhausted", "ref"})
+        self.assertEqual(_expand(state, catalog), self.state)
+
+        state, catalog = encoder.encode_state(self.state)
+        self.assertEqual(catalog, {})
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    GAMEPLAY_PRESENCE_REDIS_URL="",
+)
+class CompactWireConsumerTests(GameFixturesMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        clear_access_cache()
+
+    def _initial_message(self, query=""):
+        async def connect():
+            communicator = WebsocketCommunicator(
+                websocket_application(),
+                f"/ws/game/{self.game.id}/?token={AccessToken.for_user(self.user)}"
+                f"{query}",
+            )
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            message = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return message
+
+        return async_to_sync(connect)()
+
+    def test_compact_connections_get_a_catalog_and_card_references(self):
+        full = self._initial_message()
+        compact = self._initial_message("&wire=compact")
+
+        self.assertNotIn("catalog", full)
+        self.assertTrue(compact["catalog"])
+        self.assertEqual(_expand(compact["state"], compact["catalog"]), full["state"])
+
+
+class PerMessageDeflateTests(SimpleTestCase):
+    def test_accepts_a_permessage_deflate_offer(self):
+        accept = accept_permessage_deflate([PerMessageDeflateOffer()])
+
+        self.assertIsInstance(accept, PerMessageDeflateOfferAccept)
+        self.assertIsNone(accept_permessage_deflate([]))
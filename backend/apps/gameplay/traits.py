@@ -11,6 +11,7 @@ from typing import Callable
 from pydantic import TypeAdapter, ValidationError
 
 from apps.builder.schemas import Action, Trait
+from apps.gameplay import instrumentation
 from apps.gameplay.schemas.engine import Rejected, Result, Success
 from apps.gameplay.schemas.events import (
     ActionableEvent,
@@ -52,33 +53,36 @@ def apply(state: GameState, event: Event) -> Result:
     are then evaluated against creatures currently on board, plus a damaged
     creature snapshot when lethal damage removed that creature from the board.
     """
-    child_effects = []
-    events = []
-
-    legacy_result = _apply_source_traits(state, event)
-    state = legacy_result.new_state
-    events.extend(legacy_result.events)
-    child_effects.extend(legacy_result.child_effects)
-
-    for observer_side, observer_id, creature in _iter_trigger_observers(state, event):
-        for trait in creature.traits:
-            if trait.type != "triggered":
-                continue
-            if not _trigger_matches(
-                state, event, observer_side, observer_id, creature, trait
-            ):
-                continue
-
-            result = handle_triggered_trait(
-                state=state,
-                event=event,
-                observer_side=observer_side,
-                creature=creature,
-                trait=trait,
-            )
-            state = result.new_state
-            events.extend(result.events)
-            child_effects.extend(result.child_effects)
+    with instrumentation.span("gameplay_traits_apply", event=event.type):
+        child_effects = []
+        events = []
+
+        legacy_result = _apply_source_traits(state, event)
+        state = legacy_result.new_state
+        events.extend(legacy_result.events)
+        child_effects.extend(legacy_result.child_effects)
+
+        for observer_side, observer_id, creature in _iter_trigger_observers(
+            state, event
+        ):
+            for trait in creature.traits:
+                if trait.type != "triggered":
+                    continue
+                if not _trigger_matches(
+                    state, event, observer_side, observer_id, creature, trait
+                ):
+                    continue
+
+                result = handle_triggered_trait(
+                    state=state,
+                    event=event,
+                    observer_side=observer_side,
+                    creature=creature,
+                    trait=trait,
+                )
+                state = result.new_state
+                events.extend(result.events)
+                child_effects.extend(result.child_effects)
 
     return Success(new_state=state, events=events, child_effects=child_effects)
 
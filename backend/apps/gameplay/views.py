@@ -1,4 +1,4 @@
-from django.db.models import Count, F, Min, Q
+from django.db.models import Count, F, Q
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -14,6 +14,7 @@ from apps.collection.models import (
 )
 from apps.collection.validation import DeckValidationError, validate_deck_for_play
 from apps.gameplay.models import (
+    CompositionMatchupRecord,
     FriendlyChallenge,
     Game,
     GameLoadout,
@@ -22,10 +23,12 @@ from apps.gameplay.models import (
     PushDevice,
     UserTitleRating,
 )
+from apps.gameplay.records import composition_result_for_side
 from apps.gameplay.scenarios import ScenarioConfigurationError, ScenarioGameService
 from apps.gameplay.schemas import GameList, GameSummary
 from apps.gameplay.schemas.game import GameState
 from apps.gameplay.services import GameService
+from apps.gameplay.state_cache import load_game_state
 from apps.gameplay.tasks import step
 
 FRIENDLY_GAME_ACTIVITY_LIMIT = 5
@@ -50,24 +53,18 @@ def _record_composition_result(record: dict, result: str) -> None:
 def _result_for_loadout(loadout: GameLoadout) -> str:
     """Return wins/losses/draws from this loadout's point of view."""
 
-    game = loadout.game
-    winner_side = (game.state or {}).get("winner")
+    return composition_result_for_side(loadout.game, loadout.side)
 
-    # Every normally completed captured game has winner side in state. Keep the
-    # FK fallback for tests and manually finalized games, while avoiding a guess
-    # if both sides somehow point to the same source deck.
-    if winner_side not in {GameLoadout.SIDE_A, GameLoadout.SIDE_B} and game.winner_id:
-        if game.side_a_id != game.side_b_id:
-            if game.winner_id == game.side_a_id:
-                winner_side = GameLoadout.SIDE_A
-            elif game.winner_id == game.side_b_id:
-                winner_side = GameLoadout.SIDE_B
 
-    if winner_side == loadout.side:
-        return "wins"
-    if winner_side in {GameLoadout.SIDE_A, GameLoadout.SIDE_B}:
-        return "losses"
-    return "draws"
+def _record_from_counters(wins: int, losses: int, draws: int) -> dict:
+    games = wins + losses + draws
+    return {
+        "wins": wins,
+        "losses": losses,
+        "draws": draws,
+        "games": games,
+        "win_rate": round(wins / games, 4) if games else 0.0,
+    }
 
 
 def _aggregate_composition_record(loadouts) -> dict:
@@ -138,7 +135,7 @@ def _aggregate_composition_record(loadouts) -> dict:
 
 def _update_game_time_per_turn(game: Game):
     """Update time_per_turn in game state based on game type and title config."""
-    game_state = GameState.model_validate(game.state)
+    game_state = load_game_state(game)
 
     if game.type == Game.GAME_TYPE_RANKED:
         if game.ladder_type == Game.LADDER_TYPE_DAILY:
@@ -341,82 +338,90 @@ def composition_stats(request, title_slug, code):
         ).exists()
     )
     if composition is not None:
-        all_captures = GameLoadout.objects.filter(composition=composition)
-        first_captured_at = all_captures.aggregate(first=Min("created_at"))["first"]
-
         loadouts = GameLoadout.objects.filter(
             composition=composition,
             game__title=title,
             game__type=game_type,
             game__status=Game.GAME_STATUS_ENDED,
         )
-        captured_games = loadouts.values("game_id").distinct().count()
 
-        if include_hero_matchups:
-            loadouts = loadouts.select_related("game").prefetch_related(
-                "game__loadouts"
-            )
-        else:
-            global_record = _aggregate_composition_record(loadouts)
-            if request.user.is_authenticated:
-                player_record = _aggregate_composition_record(
-                    loadouts.filter(player=request.user)
-                )
-
-        if include_hero_matchups:
-            for loadout in loadouts:
-                result = _result_for_loadout(loadout)
-                _record_composition_result(global_record, result)
-
-                is_player_loadout = (
-                    request.user.is_authenticated
-                    and loadout.player_id == request.user.id
-                )
-                if is_player_loadout:
-                    _record_composition_result(player_record, result)
-
-                opposing_side = (
-                    GameLoadout.SIDE_B
-                    if loadout.side == GameLoadout.SIDE_A
-                    else GameLoadout.SIDE_A
-                )
-                opposing_loadout = next(
-                    (
-                        item
-                        for item in loadout.game.loadouts.all()
-                        if item.side == opposing_side
+        # Global results and capture counts come from the matchup rollup
+        # maintained at game end: one indexed read of a few counter rows,
+        # whatever the history size.
+        rollup = CompositionMatchupRecord.objects.filter(
+            composition=composition,
+            title=title,
+            game_type=game_type,
+        )
+        totals = {"wins": 0, "losses": 0, "draws": 0}
+        for record in rollup:
+            for result in totals:
+                totals[result] += getattr(record, result)
+            captured_games += record.captured_games
+            if record.first_captured_at and (
+                first_captured_at is None
+                or record.first_captured_at < first_captured_at
+            ):
+                first_captured_at = record.first_captured_at
+            if include_hero_matchups and record.opponent_hero_slug:
+                matchup_records[(record.hero_slug, record.opponent_hero_slug)] = {
+                    "hero": {
+                        "slug": record.hero_slug,
+                        "name": record.hero_name,
+                    },
+                    "opponent_hero": {
+                        "slug": record.opponent_hero_slug,
+                        "name": record.opponent_hero_name,
+                    },
+                    "global": _record_from_counters(
+                        record.wins, record.losses, record.draws
                     ),
-                    None,
-                )
-                if opposing_loadout is None:
-                    continue
+                    "player": (
+                        _empty_composition_record()
+                        if request.user.is_authenticated
+                        else None
+                    ),
+                }
+        global_record = _record_from_counters(**totals)
+
+        if request.user.is_authenticated:
+            player_loadouts = loadouts.filter(player=request.user)
+            if include_hero_matchups:
+                player_record = _empty_composition_record()
+                for loadout in player_loadouts.select_related("game").prefetch_related(
+                    "game__loadouts"
+                ):
+                    result = _result_for_loadout(loadout)
+                    _record_composition_result(player_record, result)
 
-                key = (
-                    loadout.hero_slug,
-                    opposing_loadout.hero_slug,
-                )
-                matchup = matchup_records.setdefault(
-                    key,
-                    {
-                        "hero": {
-                            "slug": loadout.hero_slug,
-                            "name": loadout.hero_name,
-                        },
-                        "opponent_hero": {
-                            "slug": opposing_loadout.hero_slug,
-                            "name": opposing_loadout.hero_name,
-                        },
-                        "global": _empty_composition_record(),
-                        "player": (
-                            _empty_composition_record()
-                            if request.user.is_authenticated
-                            else None
+                    opposing_loadout = next(
+                        (
+                            item
+                            for item in loadout.game.loadouts.all()
+                            if item.side != loadout.side
                         ),
-                    },
-                )
-                _record_composition_result(matchup["global"], result)
-                if is_player_loadout:
+                        None,
+                    )
+                    if opposing_loadout is None:
+                        continue
+                    matchup = matchup_records.setdefault(
+                        (loadout.hero_slug, opposing_loadout.hero_slug),
+                        {
+                            "hero": {
+                                "slug": loadout.hero_slug,
+                                "name": loadout.hero_name,
+                            },
+                            "opponent_hero": {
+                                "slug": opposing_loadout.hero_slug,
+                                "name": opposing_loadout.hero_name,
+                            },
+                            "global": _empty_composition_record(),
+                            "player": _empty_composition_record(),
+                        },
+                    )
                     _record_composition_result(matchup["player"], result)
+            else:
+                player_record = _aggregate_composition_record(player_loadouts)
 
     if matchup_records:
         hero_slugs = {
@@ -487,7 +492,7 @@ def game_detail(request, game_id):
         id=game_id,
     )
 
-    game_state = GameState.model_validate(game.state)
+    game_state = load_game_state(game)
 
     viewer = _viewer_for_request(request, game)
     if not viewer:
@@ -554,7 +559,9 @@ def start_scenario(request, scenario_slug):
     except ScenarioConfigurationError as exc:
         return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-    step.delay(game.id)
+    # Claimed pre-warmed games have already run their opening step.
+    if game.status == Game.GAME_STATUS_INIT:
+        step.delay(game.id)
 
     return Response(
         {
@@ -809,6 +816,7 @@ def create_game(request):
             # Human-vs-human games can coexist across modes, so reusing one here
             # could relabel an active friendly game as ranked.
             reuse_active_game=bool(ai_deck_id),
+            prewarmed=bool(ai_deck_id),
         )
 
         # Set game type based on whether it's PvE or PvP
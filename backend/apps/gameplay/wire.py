@@ -0,0 +1,59 @@
+"""
+Compact WebSocket wire format for game state.
+
+Clients opt in with ``?wire=compact`` on the game socket. Card records are
+then split into a catalog entry, sent once per connection under the
+message's ``catalog`` key, and a per-card reference that only carries the
+card's id and ``exhausted`` flag:
+
+    "catalog": {"fireball:1a2b3c4d": {"template_slug": "fireball", ...}}
+    "cards": {"12": {"card_id": "12", "ref": "fireball:1a2b3c4d", "exhausted": true}}
+
+Catalog keys are the template slug plus a digest of the record, so a card
+whose stats change in play gets a new entry rather than a stale one. A
+client rebuilds the full card as ``{...catalog[ref], card_id, exhausted}``.
+"""
+
+import hashlib
+import json
+
+COMPACT_WIRE_FORMAT = "compact"
+# Fields kept on every card reference; everything else lives in the catalog.
+CARD_REFERENCE_FIELDS = ("card_id", "exhausted")
+
+
+def card_catalog_entry(card: dict) -> tuple[str, dict]:
+    entry = {
+        key: value for key, value in card.items() if key not in CARD_REFERENCE_FIELDS
+    }
+    digest = hashlib.blake2b(
+        json.dumps(entry, sort_keys=True, separators=(",", ":")).encode(),
+        digest_size=4,
+    ).hexdigest()
+    return f"{card.get('template_slug', '')}:{digest}", entry
+
+
+class CardCatalogEncoder:
+    """Encodes one connection's outgoing states, remembering what it sent."""
+
+    def __init__(self):
+        self.sent_keys: set[str] = set()
+
+    def encode_state(self, state: dict) -> tuple[dict, dict]:
+        """Return the compact state and the catalog entries new to the client."""
+        catalog = {}
+        cards = {}
+        for card_id, card in (state.get("cards") or {}).items():
+            key, entry = card_catalog_entry(card)
+            if key not in self.sent_keys:
+                catalog[key] = entry
+            cards[card_id] = {
+                **{
+                    field: card[field]
+                    for field in CARD_REFERENCE_FIELDS
+                    if field in card
+                },
+                "ref": key,
+            }
+        self.sent_keys.update(catalog)
+        return {**state, "cards": cards}, catalog
@@ -95,6 +95,17 @@ ASGI_APPLICATION = "config.asgi.application"
 
 REDIS_HOST = os.environ.get("REDIS_HOST", "localhost")
 
+# Shared cache. Deck card-count digests, the PvE deck picker payload and
+# write-behind game states are invalidated by whichever process edits them, so
+# every web, ASGI and Celery process must read the same cache.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_REDIS_URL", f"redis://{REDIS_HOST}:6379/1"),
+        "KEY_PREFIX": "drawtwo",
+    },
+}
+
 # Django Channels configuration
 # Includes connection pool limits and socket timeout to prevent deadlocks
 CHANNEL_LAYERS = {
@@ -126,7 +137,17 @@ GAMEPLAY_PRESENCE_KEY_PREFIX = os.environ.get(
     "drawtwo:presence",
 )
 GAMEPLAY_PRESENCE_TTL_SECONDS = int(
-    os.environ.get("GAMEPLAY_PRESENCE_TTL_SECONDS", "75")
+    os.environ.get("GAMEPLAY_PRESENCE_TTL_SECONDS", "120")
+)
+# Heartbeats rewrite a connection's presence at most once per interval. Clients
+# ping every 30s, so a 55s interval skips every other ping, and an entry is
+# rewritten at most 60s plus one late ping apart, well inside the TTL.
+GAMEPLAY_PRESENCE_REFRESH_INTERVAL_SECONDS = int(
+    os.environ.get("GAMEPLAY_PRESENCE_REFRESH_INTERVAL_SECONDS", "55")
+)
+# Game WebSocket connects reuse each process's access decision for this long.
+GAMEPLAY_WS_ACCESS_CACHE_SECONDS = float(
+    os.environ.get("GAMEPLAY_WS_ACCESS_CACHE_SECONDS", "30")
 )
 
 # Database
@@ -321,6 +342,82 @@ GAMEPLAY_AI_COMMAND_DELAY_SECONDS = float(
     os.environ.get("GAMEPLAY_AI_COMMAND_DELAY_SECONDS", "1.0")
 )
 
+# "step" chooses AI moves inside the step that holds the game's row lock;
+# "task" searches a state snapshot in a choose_ai_command task, with the
+# budget below, and only locks the row to submit the move. GAMEPLAY_AI_QUEUE
+# sends those tasks to their own worker pool ("" keeps the default queue).
+GAMEPLAY_AI_EXECUTION = os.environ.get("GAMEPLAY_AI_EXECUTION", "step")
+GAMEPLAY_AI_TASK_BUDGET_MS = int(os.environ.get("GAMEPLAY_AI_TASK_BUDGET_MS", "1000"))
+GAMEPLAY_AI_QUEUE = os.environ.get("GAMEPLAY_AI_QUEUE", "")
+
+# "celery" hands every command to a step task; "inline" resolves a human
+# command's effects in the request's own transaction for up to the budget
+# below, leaving continuations and AI turns to Celery.
+GAMEPLAY_COMMAND_EXECUTION = os.environ.get("GAMEPLAY_COMMAND_EXECUTION", "celery")
+GAMEPLAY_INLINE_STEP_BUDGET_MS = int(
+    os.environ.get("GAMEPLAY_INLINE_STEP_BUDGET_MS", "50")
+)
+# Broadcasts from batches resolved back to back are merged for up to this
+# long (0 sends every batch's broadcast on its own).
+GAMEPLAY_BROADCAST_COALESCE_MS = int(
+    os.environ.get("GAMEPLAY_BROADCAST_COALESCE_MS", "30")
+)
+
+# Turn deadlines closer than this get a per-game wake-up task scheduled at the
+# exact expiry time. Longer timers (e.g. daily ladder) rely on the periodic
+# check_expired_turns sweep.
+GAMEPLAY_TURN_EXPIRY_WAKEUP_HORIZON_SECONDS = int(
+    os.environ.get("GAMEPLAY_TURN_EXPIRY_WAKEUP_HORIZON_SECONDS", "900")
+)
+
+# Game-affine step routing. With a non-zero count, step and turn-expiry tasks
+# are hashed by game id onto <prefix>-0 .. <prefix>-(count - 1); run one
+# single-process worker per queue. 0 keeps them on the default queue.
+GAMEPLAY_STEP_QUEUE_COUNT = int(os.environ.get("GAMEPLAY_STEP_QUEUE_COUNT", "0"))
+GAMEPLAY_STEP_QUEUE_PREFIX = os.environ.get(
+    "GAMEPLAY_STEP_QUEUE_PREFIX", "gameplay-step"
+)
+
+# Hot GameState cache. Steps keep the latest validated state per game in
+# process memory. With write-behind enabled, the state column is only written
+# at phase/turn boundaries, at game end and every N steps, and readers in
+# other processes use the default cache, which must then be shared (Redis).
+GAMEPLAY_HOT_STATE_CACHE_SIZE = int(
+    os.environ.get("GAMEPLAY_HOT_STATE_CACHE_SIZE", "512")
+)
+GAMEPLAY_STATE_WRITE_BEHIND = os.environ.get(
+    "GAMEPLAY_STATE_WRITE_BEHIND", "0"
+).lower() in {"1", "true", "yes"}
+GAMEPLAY_STATE_FLUSH_EVERY_STEPS = int(
+    os.environ.get("GAMEPLAY_STATE_FLUSH_EVERY_STEPS", "20")
+)
+
+# Engine instrumentation. Step spans, per-effect and per-policy counters are
+# kept in process memory and served at /api/control/metrics/. With a textfile
+# directory set, each process also rewrites its own gameplay-<host>-<pid>.prom
+# there for node_exporter's textfile collector.
+GAMEPLAY_INSTRUMENTATION = os.environ.get("GAMEPLAY_INSTRUMENTATION", "1").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+GAMEPLAY_METRICS_TEXTFILE_DIR = os.environ.get("GAMEPLAY_METRICS_TEXTFILE_DIR", "")
+GAMEPLAY_METRICS_TEXTFILE_INTERVAL_SECONDS = int(
+    os.environ.get("GAMEPLAY_METRICS_TEXTFILE_INTERVAL_SECONDS", "15")
+)
+
+# Pre-warmed game pools. Games kept ready per side of each popular PvE AI
+# deck and per listed scenario; 0 disables pre-warming.
+GAMEPLAY_PREWARM_POOL_SIZE = int(os.environ.get("GAMEPLAY_PREWARM_POOL_SIZE", "0"))
+GAMEPLAY_PREWARM_POPULAR_DECKS = int(
+    os.environ.get("GAMEPLAY_PREWARM_POPULAR_DECKS", "20")
+)
+GAMEPLAY_PREWARM_SCENARIOS = [
+    slug.strip()
+    for slug in os.environ.get("GAMEPLAY_PREWARM_SCENARIOS", "").split(",")
+    if slug.strip()
+]
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.environ.get(
@@ -340,10 +437,11 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_ENABLE_UTC = True
 
 # Task routing
-CELERY_TASK_ROUTES = {
-    # Example: route specific tasks to specific queues
-    # 'apps.core.tasks.*': {'queue': 'default'},
-}
+CELERY_TASK_ROUTES = [
+    # Per-game tasks go to the game's owning queue when
+    # GAMEPLAY_STEP_QUEUE_COUNT is set, AI decisions to GAMEPLAY_AI_QUEUE.
+    "apps.gameplay.task_routing.route_game_task",
+]
 
 # Task result expiry
 CELERY_RESULT_EXPIRES = 3600  # 1 hour
@@ -359,6 +457,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.collection.tasks.reconcile_starter_deck_provisionings",
         "schedule": 60.0,
     },
+    "refill-prewarmed-game-pools": {
+        "task": "apps.gameplay.tasks.refill_prewarmed_pools",
+        "schedule": 30.0,
+    },
 }
 
 # Store task results in Django database
@@ -55,6 +55,13 @@ GAMEPLAY_PRESENCE_REDIS_URL = os.environ.get(
     "GAMEPLAY_PRESENCE_REDIS_URL",
     f"redis://{REDIS_HOST}:6379/0",
 )
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_REDIS_URL", f"redis://{REDIS_HOST}:6379/1"),
+        "KEY_PREFIX": "drawtwo",
+    },
+}
 
 # Update CHANNEL_LAYERS for development
 CHANNEL_LAYERS = {
@@ -11,6 +11,9 @@ DEBUG = True
 
 ALLOWED_HOSTS = ["*"]
 
+# Clears process-local caches keyed by database ids before every test
+TEST_RUNNER = "config.test_runner.TestRunner"
+
 # Use in-memory channel layer for tests
 CHANNEL_LAYERS = {
     "default": {
@@ -20,6 +23,13 @@ CHANNEL_LAYERS = {
 
 GAMEPLAY_PRESENCE_REDIS_URL = ""
 
+# Keep the cache in process so tests don't need Redis
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
 # Celery settings for tests - run tasks synchronously
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
@@ -0,0 +1,59 @@
+"""
+Test runner that resets process-local caches before every test.
+
+Card catalogs, hot game states, resolved composition codes and WebSocket
+access are memoised in process memory, keyed by database ids. Test databases
+roll back and hand the same ids out again, so an entry left by one test
+would be served to the next.
+"""
+
+import unittest
+
+from django.core.cache import cache
+from django.test.runner import (
+    DiscoverRunner,
+    ParallelTestSuite,
+    RemoteTestResult,
+    RemoteTestRunner,
+)
+
+from apps.collection.compositions import _resolve_code
+from apps.gameplay.card_cache import clear_local_catalogs
+from apps.gameplay.consumers import clear_access_cache
+from apps.gameplay.state_cache import clear_local_states
+
+
+def reset_process_caches():
+    cache.clear()
+    _resolve_code.cache_clear()
+    clear_local_catalogs()
+    clear_local_states()
+    clear_access_cache()
+
+
+class ResetCachesMixin:
+    def startTest(self, test):
+        reset_process_caches()
+        super().startTest(test)
+
+
+class ResetCachesRemoteTestResult(ResetCachesMixin, RemoteTestResult):
+    pass
+
+
+class ResetCachesRemoteTestRunner(RemoteTestRunner):
+    resultclass = ResetCachesRemoteTestResult
+
+
+class ResetCachesParallelTestSuite(ParallelTestSuite):
+    runner_class = ResetCachesRemoteTestRunner
+
+
+class TestRunner(DiscoverRunner):
+    parallel_test_suite = ResetCachesParallelTestSuite
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass() or unittest.TextTestResult
+        return type(
+            f"ResetCaches{resultclass.__name__}", (ResetCachesMixin, resultclass), {}
+        )
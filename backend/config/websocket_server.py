@@ -0,0 +1,52 @@
+"""
+Daphne entry point with WebSocket permessage-deflate enabled.
+
+Daphne never offers compression to clients, though autobahn (which it runs
+WebSockets on) supports it. This accepts a client's permessage-deflate offer
+so repeated game states compress against each other on the wire. Use it in
+place of the ``daphne`` command, with the same arguments:
+
+    python -m config.websocket_server -b 0.0.0.0 -p 8000 config.asgi:application
+
+Set ``WEBSOCKET_PERMESSAGE_DEFLATE=0`` to turn compression off.
+"""
+
+import os
+
+from autobahn.websocket.compress import (
+    PerMessageDeflateOffer,
+    PerMessageDeflateOfferAccept,
+)
+from daphne.cli import CommandLineInterface
+from daphne.server import Server
+
+
+def accept_permessage_deflate(offers):
+    for offer in offers:
+        if isinstance(offer, PerMessageDeflateOffer):
+            return PerMessageDeflateOfferAccept(offer)
+    return None
+
+
+class CompressingServer(Server):
+    # Server.run() builds its WebSocket factory inline; configure it on
+    # assignment, before the reactor starts accepting connections.
+    @property
+    def ws_factory(self):
+        return self._ws_factory
+
+    @ws_factory.setter
+    def ws_factory(self, factory):
+        if os.environ.get("WEBSOCKET_PERMESSAGE_DEFLATE", "1") == "1":
+            factory.setProtocolOptions(
+                perMessageCompressionAccept=accept_permessage_deflate
+            )
+        self._ws_factory = factory
+
+
+class CompressingCommandLineInterface(CommandLineInterface):
+    server_class = CompressingServer
+
+
+if __name__ == "__main__":
+    CompressingCommandLineInterface.entrypoint()
@@ -0,0 +1,26 @@
+// Compact game socket wire format (backend: apps/gameplay/wire.py).
+// Static card data arrives once per connection in `catalog`; state cards then
+// only carry `card_id`, `exhausted` and a `ref` into that catalog.
+export const COMPACT_WIRE_FORMAT = 'compact'
+
+export type CardCatalog = Record<string, Record<string, unknown>>
+
+export const expandCompactMessage = (data: any, catalog: CardCatalog): any => {
+  if (data?.catalog) {
+    Object.assign(catalog, data.catalog)
+  }
+
+  const cards = data?.state?.cards
+  if (!cards) return data
+
+  const expanded: Record<string, unknown> = {}
+  for (const [cardId, card] of Object.entries<any>(cards)) {
+    if (!card?.ref) {
+      expanded[cardId] = card
+      continue
+    }
+    const { ref, ...fields } = card
+    expanded[cardId] = { ...catalog[ref], ...fields }
+  }
+  return { ...data, state: { ...data.state, cards: expanded } }
+}
@@ -16,6 +16,7 @@ import type {
 import { useNotificationStore } from './notifications'
 import { useAuthStore } from './auth'
 import { fetchIntroGame, getIntroGameAccessToken } from '@/services/introScenario'
+import { COMPACT_WIRE_FORMAT, expandCompactMessage, type CardCatalog } from '@/services/gameWire'
 
 // WebSocket status type
 type WebSocketStatus = 'disconnected' | 'connecting' | 'connected' | 'reconnecting'
@@ -45,6 +46,7 @@ interface GameStoreState {
   pongTimeoutId: number | null
   visibilityHandler: (() => void) | null
   messageQueue: WebSocketMessage[]
+  cardCatalog: CardCatalog
   currentGameId: string | null
   currentGameType: GameType | null
   currentLadderType: LadderType | null
@@ -148,6 +150,7 @@ export const useGameStore = defineStore('game', {
     pongTimeoutId: null,
     visibilityHandler: null,
     messageQueue: [],
+    cardCatalog: {},
     currentGameId: null,
     currentGameType: null,
     currentLadderType: null,
@@ -453,7 +456,9 @@ export const useGameStore = defineStore('game', {
       const authStore = useAuthStore()
       const token = authStore.accessToken
       const introAccessToken = getIntroGameAccessToken(gameId)
-      const params = new URLSearchParams()
+      const params = new URLSearchParams({ wire: COMPACT_WIRE_FORMAT })
+      // Each connection gets its own card catalog from the server.
+      this.cardCatalog = {}
       if (token) {
         params.set('token', token)
       }
@@ -505,7 +510,7 @@ export const useGameStore = defineStore('game', {
       }
 
       this.socket.onmessage = (event: MessageEvent) => {
-        const data = JSON.parse(event.data)
+        const data = expandCompactMessage(JSON.parse(event.data), this.cardCatalog)
         this.handleWebSocketMessage(data)
       }
 